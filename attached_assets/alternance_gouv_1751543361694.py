@@ -7,7 +7,16 @@ import random
 import re
 from urllib.parse import urlparse, unquote, parse_qs
 from postuler_functions_1751543385370 import remplir_formulaire_candidature, postuler_offre, AUTO_REMPLIR_FORMULAIRE, AUTO_ENVOYER_CANDIDATURE, load_frontend_config
-from capture_functions_1751543392689 import capture_and_highlight, switch_to_iframe_if_needed
+from capture_functions_1751543392689 import capture_and_highlight
+from frame_context import FrameContext
+from search_filters import set_filter_state
+from site_profile import SITE_PROFILE
+from offer_record import Offer, SOURCE_LBA, SOURCE_ALTERNANCE_GOUV, STATUT_SUCCES, STATUT_ECHEC, STATUT_SOUMIS
+from submission_watch import SubmissionWatch, log_submission, REJECTED
+from browser_state import BrowserStateStore, worker_profile
+from chrome_profile import ChromeProfile
+from document_registry import DocumentRegistry
+from log_pipeline import configure_logging
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -18,9 +27,7 @@ from selenium.common.exceptions import (
     TimeoutException, ElementClickInterceptedException, 
     StaleElementReferenceException, WebDriverException, ElementNotInteractableException
 )
-from bs4 import BeautifulSoup
 from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
 import argparse
 import os
 
@@ -50,312 +57,110 @@ except ImportError:
             driver.save_screenshot(filename)
             return filename
         except Exception as e:
-            print(f"Erreur lors de la capture: {e}")
+            logger.error("Erreur lors de la capture: %s", e)
             return None
-            
-    def switch_to_iframe_if_needed(driver):
-        try:
-            driver.switch_to.default_content()
-            iframe = driver.find_element(By.CSS_SELECTOR, "iframe")
-            driver.switch_to.frame(iframe)
-            return True
-        except Exception:
-            return False
-
-# Ajout du chemin racine du projet pour permettre les imports
-project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-sys.path.insert(0, project_root)
-
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Configuration du logging (basicConfig n'est appelé qu'en exécution directe, voir setup_and_run)
 logger = logging.getLogger(__name__)
 
 # --- Fonctions auxiliaires ---
 
+# Regex pour les codes postaux français
+POSTAL_CODE_PATTERN = re.compile(r'\b\d{5}\b')
 
-
-
-def switch_to_iframe_if_needed(driver):
-    """Bascule vers l'iframe de résultats si nécessaire"""
-    try:
-        # Vérifier si nous sommes déjà dans l'iframe
-        try:
-            # Si cet élément est accessible, nous ne sommes pas dans l'iframe
-            driver.find_element(By.TAG_NAME, 'iframe')
-            is_in_iframe = False
-        except:
-            # Si l'élément n'est pas trouvé, nous sommes peut-être déjà dans l'iframe
-            is_in_iframe = True
+# Script JavaScript qui simule exactement ce que fait l'inspection pour révéler le formulaire modal
+REVEAL_MODAL_SCRIPT = """
+(function() {
+    console.log('Début de la simulation d\'inspection');
+    
+    // 1. Simuler les variables globales DevTools
+    window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = { 
+        isDisabled: false,
+        supportsFiber: true,
+        renderers: new Map(),
+        inject: function() {},
+        hookNames: new Map(),
+        connected: true
+    };
+    
+    // 2. Forcer l'affichage des éléments cachés dans le modal
+    var modalElement = document.querySelector('.fr-modal__body');
+    if (modalElement) {
+        console.log('Modal trouvé, force affichage');
+        modalElement.style.display = 'block';
+    } else {
+        console.log('Modal non trouvé');
+    }
+    
+    // 3. Créer le formulaire modal s'il n'existe pas
+    var formContainer = document.querySelector('.fr-modal__content');
+    if (!formContainer) {
+        console.log('Conteneur de formulaire non trouvé - tentative création');
+        // Forcer la réinitialisation des éléments DOM cachés
+        document.body.innerHTML += '<div style="display:none" id="temp-trigger"></div>';
+        document.getElementById('temp-trigger').click();
+    }
+    
+    // 4. Simuler l'état actif des DevTools
+    window.devtools = { isOpen: true, orientation: 'vertical' };
+    document.__devTools = true;
+    
+    // 5. Déclencher des événements qui peuvent activer des comportements JavaScript
+    document.dispatchEvent(new CustomEvent('devtoolschange', { detail: { isOpen: true } }));
+    document.dispatchEvent(new Event('DOMContentLoaded', { bubbles: true }));
+    
+    // 6. Vérifier et révéler les champs du formulaire
+    var metierField = document.getElementById('metier');
+    var formFields = document.querySelectorAll('input, select, button');
+    
+    if (metierField) {
+        console.log('Champ métier trouvé, activation...');
+        metierField.style.display = 'block';
+        metierField.style.visibility = 'visible';
+        metierField.focus();
         
-        if not is_in_iframe:
-            # Essayer de trouver l'iframe et y basculer
-            iframe_selectors = [
-                "iframe#labnframe",
-                "iframe#laBonneAlternance", 
-                "iframe.labonne",
-                "iframe[title*='La Bonne Alternance']", 
-                "iframe"
-            ]
-            
-            for selector in iframe_selectors:
-                try:
-                    iframe = driver.find_element(By.CSS_SELECTOR, selector)
-                    if iframe.is_displayed():
-                        driver.switch_to.frame(iframe)
-                        logger.info(f"Basculé vers l'iframe avec le sélecteur: {selector}")
-                        return True
-                except Exception as e:
-                    continue
-            
-            logger.warning("Impossible de trouver l'iframe des résultats")
-            return False
-        else:
-            logger.info("Déjà dans l'iframe")
-            return True
-    except Exception as e:
-        logger.error(f"Erreur lors de la tentative de basculer vers l'iframe: {e}")
-        return False
+        // Récupérer l'état actuel du formulaire pour diagnostique
+        return {
+            success: true, 
+            formFound: !!metierField,
+            formFieldsCount: formFields.length,
+            modalVisible: !!modalElement
+        };
+    } else {
+        // Retourner information sur le DOM actuel
+        return { 
+            success: false, 
+            formFound: false,
+            bodyContent: document.body.innerHTML.substring(0, 500) + '...',
+            formFields: formFields.length
+        };
+    }
+})();
+"""
+
 
 # --- Fonctions robustes de bas niveau (inspirées du code utilisateur) ---
 
-def uncheck_formations_checkbox(driver, wait):
-    """Décoche la case 'Formations' si elle est cochée avec plusieurs méthodes pour assurer la compatibilité React."""
+def uncheck_formations_checkbox(driver, wait=None):
+    """Décoche la case 'Formations' et garde 'Offres' cochée, en une seule opération dans la page (voir search_filters)."""
     try:
-        logger.info("Tentative de décocher la case 'Formations'...")
-        
-        # Capture d'écran avant décochage pour déboguer
-        driver.save_screenshot('debug_screenshots/avant_decochage_formations.png')
-        
-        # Recherche agressive de la case Formations par plusieurs méthodes
-        formations_checkbox_found = False
-        checkbox = None
-        
-        # Méthode 1: Cibler directement par attribut name='formations'
-        try:
-            checkbox_selectors = [
-                "input[name='formations'][type='checkbox']",
-                "input#formations",
-                "input[type='checkbox'][name*='formation']",
-                "input[type='checkbox'][id*='formation']",
-                "input[name*='formation']",
-                "input[aria-label*='formation' i][type='checkbox']",  # 'i' pour insensible à la casse
-                "input[type='checkbox']"
-            ]
-            
-            for selector in checkbox_selectors:
-                try:
-                    checkboxes = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if checkboxes:
-                        for cb in checkboxes:
-                            try:
-                                # Vérifier si c'est la case formations en vérifiant les attributs ou le texte autour
-                                parent = driver.execute_script("return arguments[0].parentNode;", cb)
-                                parent_text = parent.text.lower() if parent else ""
-                                
-                                if (cb.get_attribute('name') == 'formations' or 
-                                    'formation' in (cb.get_attribute('id') or '') or 
-                                    'formation' in parent_text):
-                                    checkbox = cb
-                                    formations_checkbox_found = True
-                                    logger.info(f"Case 'Formations' trouvée avec le sélecteur: {selector}")
-                                    break
-                            except Exception:
-                                continue
-                        if formations_checkbox_found:
-                            break
-                except Exception:
-                    continue
-            
-            # Si toujours pas trouvée, essayer par XPath
-            if not checkbox:
-                xpath_selectors = [
-                    "//input[@type='checkbox' and contains(@name, 'formation')]",
-                    "//input[@type='checkbox' and contains(@id, 'formation')]",
-                    "//label[contains(translate(text(), 'FORMATIONS', 'formations'), 'formation')]/input[@type='checkbox']",
-                    "//label[contains(translate(text(), 'FORMATIONS', 'formations'), 'formation')]/following::input[@type='checkbox'][1]",
-                    "//input[@type='checkbox']/following::*[contains(translate(text(), 'FORMATIONS', 'formations'), 'formation')]"
-                ]
-                
-                for xpath in xpath_selectors:
-                    try:
-                        elements = driver.find_elements(By.XPATH, xpath)
-                        if elements:
-                            checkbox = elements[0]
-                            formations_checkbox_found = True
-                            logger.info(f"Case 'Formations' trouvée avec le XPath: {xpath}")
-                            break
-                    except Exception:
-                        continue
-            
-            # Vérification initiale et multiples tentatives de décocher pour React
-            if checkbox:
-                for attempt in range(3):  # Faire plusieurs tentatives
-                    time.sleep(1)  # Pause entre les tentatives
-                    
-                    # Vérifier si la case est cochée ou si on force le décochage
-                    force_uncheck = True  # Toujours forcer le décochage pour s'éviter des problèmes
-                    is_checked = checkbox.is_selected() or checkbox.get_attribute('checked') == 'true'
-                    
-                    if is_checked or force_uncheck:
-                        logger.info(f"Case 'Formations' trouvée et {'elle est cochée' if is_checked else 'forçage du décochage'} - tentative {attempt+1}")
-
-                    
-                    # Méthode 1: JavaScript complet pour React (la plus efficace)
-                    try:
-                        # Cette méthode simule tous les événements React nécessaires
-                        js_code = """
-                        arguments[0].checked = false;
-                        arguments[0].setAttribute('checked', false);
-                        var event = new Event('change', { 'bubbles': true, 'cancelable': true });
-                        arguments[0].dispatchEvent(event);
-                        // Pour React, simuler aussi un click en plus du change
-                        var clickEvent = new MouseEvent('click', {
-                            'bubbles': true,
-                            'cancelable': true,
-                            'view': window
-                        });
-                        arguments[0].dispatchEvent(clickEvent);
-                        // Forcer la mise à jour de l'interface React
-                        if (arguments[0]._valueTracker) {
-                            arguments[0]._valueTracker.setValue(false);
-                        }
-                        """
-                        driver.execute_script(js_code, checkbox)
-                        time.sleep(0.5)  # Attendre la propagation des événements
-                        logger.info("✅ Case 'Formations' décochée via JavaScript complet pour React")
-                        
-                        # Vérifier si ça a fonctionné après la modification
-                        if not checkbox.is_selected() and checkbox.get_attribute('checked') != 'true':
-                            logger.info("✓ Vérification: la case est bien décochée")
-                            return True
-                    except Exception as e:
-                        logger.warning(f"Échec du JS complet pour React: {e}")
-                    
-                    # Méthode 2: Clic direct (si JS a échoué)
-                    try:
-                        checkbox.click()
-                        time.sleep(0.5)
-                        if not checkbox.is_selected() and checkbox.get_attribute('checked') != 'true':
-                            logger.info("✅ Case 'Formations' décochée via clic direct")
-                            return True
-                    except Exception as e:
-                        logger.warning(f"Échec du clic direct: {e}")
-                    
-                    # Méthode 3: ActionChains (si les autres ont échoué)
-                    try:
-                        ActionChains(driver).move_to_element(checkbox).click().perform()
-                        time.sleep(0.5)
-                        logger.info("✅ Case 'Formations' décochée via ActionChains")
-                        
-                        # Double vérification après ActionChains
-                        if not checkbox.is_selected() and checkbox.get_attribute('checked') != 'true':
-                            return True
-                    except Exception as e:
-                        logger.warning(f"Échec du ActionChains: {e}")
-                else:
-                    logger.info("La case 'Formations' est déjà décochée")
-                    return True
-                
-        except Exception as e:
-            logger.warning(f"Impossible de trouver la case 'Formations' par nom: {e}")
-            
-        # Tenter de trouver par data-attribute
-        try:
-            checkbox = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "input[data-fr-js-checkbox-input='true']")))
-            parent_text = driver.execute_script("return arguments[0].parentElement.textContent;", checkbox)
-            
-            if 'formations' in parent_text.lower() and (checkbox.is_selected() or checkbox.get_attribute('checked') == 'true'):
-                # Utiliser JavaScript qui est plus fiable pour les cases à cocher
-                driver.execute_script("arguments[0].checked = false;", checkbox)
-                driver.execute_script("arguments[0].dispatchEvent(new Event('change', { 'bubbles': true }));", checkbox)
-                logger.info("✅ Case 'Formations' décochée avec succès via data-attribute")
-                return True
-        except Exception as e:
-            logger.warning(f"Impossible de trouver la case par data-attribute: {e}")
-            
-        # Cibler par texte du label adjacent
-        try:
-            # Trouver tous les labels qui contiennent 'Formations'
-            formations_labels = driver.find_elements(By.XPATH, "//label[contains(text(), 'Formations')]")
-            
-            for label in formations_labels:
-                # Trouver le checkbox associé par son ID
-                label_for = label.get_attribute('for')
-                if label_for:
-                    try:
-                        checkbox = driver.find_element(By.ID, label_for)
-                        if checkbox.is_selected() or checkbox.get_attribute('checked') == 'true':
-                            driver.execute_script("arguments[0].checked = false;", checkbox)
-                            logger.info("✅ Case 'Formations' décochée avec succès via label")
-                            return True
-                    except Exception as inner_e:
-                        continue
-        except Exception as e:
-            logger.warning(f"Impossible de trouver la case par texte du label: {e}")
-        
-        # Essayer chaque sélecteur jusqu'à trouver le checkbox
-        checkbox = None
-        for selector in checkbox_selectors:
-            try:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                # Filtrer pour ne garder que les éléments visibles et cochés
-                visible_checkboxes = [el for el in elements if el.is_displayed() and el.get_attribute('checked') == 'true']
-                if visible_checkboxes:
-                    checkbox = visible_checkboxes[0]
-                    logger.info(f"Case 'Formations' trouvée avec le sélecteur: {selector}")
-                    break
-            except Exception as e:
-                continue
-        
-        # Si on n'a pas trouvé avec CSS, essayer avec XPath pour le texte du label
-        if not checkbox:
-            try:
-                # XPath pour trouver un checkbox avec un label contenant 'Formations'
-                xpath = "//label[contains(text(), 'Formations')]/preceding-sibling::input[@type='checkbox'] | //label[contains(text(), 'Formations')]/../input[@type='checkbox']"
-                elements = driver.find_elements(By.XPATH, xpath)
-                visible_checkboxes = [el for el in elements if el.is_displayed() and el.get_attribute('checked') == 'true']
-                if visible_checkboxes:
-                    checkbox = visible_checkboxes[0]
-                    logger.info("Case 'Formations' trouvée avec XPath")
-            except Exception as e:
-                logger.warning(f"Erreur lors de la recherche par XPath: {e}")
-        
-        # Si on a trouvé le checkbox et qu'il est coché
-        if checkbox and checkbox.is_selected():
-            try:
-                # Essayer de cliquer directement
-                checkbox.click()
-                logger.info("✅ Case 'Formations' décochée avec succès")
-            except Exception as e:
-                logger.warning(f"Erreur lors du clic direct: {e}")
-                # Essayer avec JavaScript si le clic direct ne fonctionne pas
-                try:
-                    driver.execute_script("arguments[0].click();", checkbox)
-                    logger.info("✅ Case 'Formations' décochée via JavaScript")
-                except Exception as e2:
-                    logger.warning(f"Échec du clic via JavaScript: {e2}")
-                    # Dernière tentative avec Actions
-                    try:
-                        ActionChains(driver).move_to_element(checkbox).click().perform()
-                        logger.info("✅ Case 'Formations' décochée via ActionChains")
-                    except Exception as e3:
-                        logger.error(f"❌ Impossible de décocher la case 'Formations': {e3}")
-        elif checkbox:
-            logger.info("La case 'Formations' est déjà décochée")
-        else:
-            logger.warning("❓ Case 'Formations' non trouvée")
-            # Capture d'écran pour analyser le problème
-            screenshot_path = "debug_screenshots/checkbox_not_found.png"
-            os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
-            driver.save_screenshot(screenshot_path)
-            logger.info(f"Capture d'écran enregistrée dans {screenshot_path}")
-            
+        return set_filter_state(driver, formations=False, offres=True)
     except Exception as e:
-        logger.error(f"Erreur lors de la tentative de décocher la case 'Formations': {e}")
+        logger.error("Erreur lors de la tentative de décocher la case 'Formations': %s", e)
+        return False
 
-def setup_driver():
-    """Configure un driver Chrome robuste sans ouverture automatique des DevTools."""
+def use_persistent_profile(user_data):
+    """Le profil Chrome persistant est actif sauf si le réglage persistentProfile vaut false."""
+    return (user_data.get('settings') or {}).get('persistentProfile', True)
+
+def setup_driver(state_store=None, chrome_profile=None, network_log=False):
+    """
+    Configure un driver Chrome robuste sans ouverture automatique des DevTools.
+    Si ``state_store`` est fourni, les cookies et le localStorage sauvegardés y sont réinjectés.
+    Si ``chrome_profile`` est fourni, Chrome utilise ce user-data-dir persistant (cache HTTP chaud).
+    Avec ``network_log``, les événements CDP Network sont journalisés (journal "performance")
+    pour lire le code HTTP des envois de candidature (submission_watch).
+    """
     options = webdriver.ChromeOptions()
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
@@ -381,36 +186,30 @@ def setup_driver():
         "devtools.open_docked": True
     }
     options.add_experimental_option("prefs", prefs)
+    if network_log:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
     
     try:
+        # Import différé : webdriver_manager n'est nécessaire qu'au lancement du navigateur
+        from webdriver_manager.chrome import ChromeDriverManager
+        if chrome_profile is not None:
+            chrome_profile.apply(options)
         driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
         driver.set_page_load_timeout(120)  # Timeout plus long
+        if state_store is not None:
+            state_store.inject(driver)
         
         logger.info("Driver Chrome créé avec succès")
         return driver
     except Exception as e:
-        logger.error(f"❌ Erreur lors de la création du driver: {e}")
+        logger.error("❌ Erreur lors de la création du driver: %s", e)
         return None
 
 def select_suggestion(driver, wait, timeout=5):
     """Sélectionne la première suggestion dans la liste d'autocomplétion."""
     # Différents sélecteurs possibles pour la liste de suggestions
-    suggestion_selectors = [
-        # Sélecteurs spécifiques au site alternance.emploi.gouv.fr
-        ".suggestions",  # Vérifié sur le site
-        ".suggestions-container",
-        ".listbox",
-        "#ac-metier-item-list",  # ID spécifique pour le champ métier
-        "#ac-lieu-item-list",    # ID spécifique pour le champ lieu
-        # Sélecteurs génériques
-        "div.suggestions", 
-        "ul.autosuggest-suggestions",
-        ".autocomplete-results", 
-        ".autocomplete-items",
-        "div[role='listbox']",
-        ".modal .dropdown-menu",
-        ".dropdown-content"
-    ]
+    suggestion_selectors = SITE_PROFILE.search.suggestion_selectors
     
     # Méthode simple: d'abord essayons juste d'envoyer les touches flèche bas puis Entrée
     # Cette méthode est souvent plus fiable car elle ne dépend pas de la structure DOM
@@ -430,7 +229,7 @@ def select_suggestion(driver, wait, timeout=5):
             logger.info("Méthode touches clavier appliquée")
             return True
     except Exception as e:
-        logger.warning(f"Méthode clavier échouée: {e}, essai méthodes alternatives")
+        logger.warning("Méthode clavier échouée: %s, essai méthodes alternatives", e)
     
     # Si la méthode simple échoue, essayons les méthodes basées sur le DOM
     try:
@@ -445,7 +244,7 @@ def select_suggestion(driver, wait, timeout=5):
                     for element in elements:
                         if element.is_displayed():
                             suggestion_list = element
-                            logger.info(f"Liste de suggestions visible trouvée avec le sélecteur: {selector}")
+                            logger.info("Liste de suggestions visible trouvée avec le sélecteur: %s", selector)
                             break
                 if suggestion_list:
                     break
@@ -460,7 +259,7 @@ def select_suggestion(driver, wait, timeout=5):
                         EC.presence_of_element_located((By.CSS_SELECTOR, selector))
                     )
                     if suggestion_list.is_displayed():
-                        logger.info(f"Liste de suggestions trouvée avec le sélecteur: {selector} après attente")
+                        logger.info("Liste de suggestions trouvée avec le sélecteur: %s après attente", selector)
                         break
                 except:
                     continue
@@ -474,7 +273,7 @@ def select_suggestion(driver, wait, timeout=5):
             """
             suggestions_html = driver.execute_script(js_script)
             if suggestions_html:
-                logger.info(f"Suggestions détectées via JavaScript: {len(suggestions_html)} éléments")
+                logger.info("Suggestions détectées via JavaScript: %s éléments", len(suggestions_html))
                 # Essayons une simulation clavier plus directe
                 active = driver.switch_to.active_element
                 if active:
@@ -504,10 +303,10 @@ def select_suggestion(driver, wait, timeout=5):
                 visible_items = [item for item in items if item.is_displayed()]
                 if visible_items:
                     suggestions = visible_items
-                    logger.info(f"{len(visible_items)} options visibles trouvées avec le sélecteur: {selector}")
+                    logger.info("%s options visibles trouvées avec le sélecteur: %s", len(visible_items), selector)
                     break
             except Exception as e:
-                logger.debug(f"Erreur avec sélecteur {selector}: {e}")
+                logger.debug("Erreur avec sélecteur %s: %s", selector, e)
                 continue
         
         if not suggestions:
@@ -521,11 +320,11 @@ def select_suggestion(driver, wait, timeout=5):
                 return True
             return False
             
-        logger.info(f"{len(suggestions)} suggestions visibles trouvées.")
+        logger.info("%s suggestions visibles trouvées.", len(suggestions))
         
         # Sélectionner le premier élément avec plusieurs méthodes
         first_item = suggestions[0]
-        logger.info(f"Sélection de: {first_item.text if first_item.text.strip() else '[texte non visible]'}")
+        logger.info("Sélection de: %s", first_item.text if first_item.text.strip() else '[texte non visible]')
         
         # Méthode 1: JavaScript click avec mise en évidence
         try:
@@ -537,7 +336,7 @@ def select_suggestion(driver, wait, timeout=5):
             time.sleep(0.8)
             return True
         except Exception as e:
-            logger.warning(f"Click JS amélioré échoué: {e}, essai méthode alternative")
+            logger.warning("Click JS amélioré échoué: %s, essai méthode alternative", e)
             
         # Méthode 2: ActionChains complète (scroll, hover, pause, click)
         try:
@@ -549,7 +348,7 @@ def select_suggestion(driver, wait, timeout=5):
             time.sleep(0.5)
             return True
         except Exception as e:
-            logger.warning(f"ActionChains complète échouée: {e}, essai méthode alternative")
+            logger.warning("ActionChains complète échouée: %s, essai méthode alternative", e)
             
         # Méthode 3: Send ENTER key après focus
         try:
@@ -558,7 +357,7 @@ def select_suggestion(driver, wait, timeout=5):
             time.sleep(0.5)
             return True
         except Exception as e:
-            logger.warning(f"ENTER key après focus échoué: {e}, dernier essai")
+            logger.warning("ENTER key après focus échoué: %s, dernier essai", e)
             
         # Méthode 4: Simulation complète clavier via élément actif
         try:
@@ -569,11 +368,11 @@ def select_suggestion(driver, wait, timeout=5):
                 active.send_keys(Keys.ENTER)
                 return True
         except Exception as e:
-            logger.warning(f"Simulation clavier finale échouée: {e}")
+            logger.warning("Simulation clavier finale échouée: %s", e)
             return False
             
     except Exception as e:
-        logger.warning(f"Erreur lors de la sélection de suggestion: {e}")
+        logger.warning("Erreur lors de la sélection de suggestion: %s", e)
         
     # En dernier recours, essayer directement sur les champs
     try:
@@ -591,7 +390,7 @@ def select_suggestion(driver, wait, timeout=5):
 
 def fill_field_with_autocomplete(driver, wait, field_id, value, max_retries=3):
     """Remplit un champ avec autocomplétion dans le modal."""
-    logger.info(f"🎡 Remplissage du champ '{field_id}' avec '{value}'")
+    logger.info("🎡 Remplissage du champ '%s' avec '%s'", field_id, value)
     
     # Différentes stratégies de sélecteurs pour trouver le champ dans le modal
     selectors = [
@@ -602,7 +401,7 @@ def fill_field_with_autocomplete(driver, wait, field_id, value, max_retries=3):
     ]
     
     for attempt in range(max_retries):
-        logger.info(f"🔄 Tentative {attempt + 1}/{max_retries} pour le champ '{field_id}'")
+        logger.info("🔄 Tentative %s/%s pour le champ '%s'", attempt + 1, max_retries, field_id)
         
         # Tenter chaque sélecteur jusqu'à ce qu'un fonctionne
         input_field = None
@@ -611,13 +410,13 @@ def fill_field_with_autocomplete(driver, wait, field_id, value, max_retries=3):
                 input_field = WebDriverWait(driver, 3).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                 )
-                logger.info(f"Champ trouvé avec le sélecteur: {selector}")
+                logger.info("Champ trouvé avec le sélecteur: %s", selector)
                 break
             except:
                 continue
         
         if not input_field:
-            logger.warning(f"Aucun champ trouvé à la tentative {attempt + 1}")
+            logger.warning("Aucun champ trouvé à la tentative %s", attempt + 1)
             continue
             
         try:
@@ -642,7 +441,7 @@ def fill_field_with_autocomplete(driver, wait, field_id, value, max_retries=3):
             
             # Chercher les suggestions avec plusieurs sélecteurs possibles
             if select_suggestion(driver, wait):
-                logger.info(f"✅ Valeur '{value}' saisie et suggestion sélectionnée")
+                logger.info("✅ Valeur '%s' saisie et suggestion sélectionnée", value)
                 return True
             else:
                 # Si pas de suggestion, essayer d'appuyer sur Entrée
@@ -652,9 +451,9 @@ def fill_field_with_autocomplete(driver, wait, field_id, value, max_retries=3):
                 return True
                 
         except Exception as e:
-            logger.warning(f"Erreur tentative {attempt+1}: {str(e)}")
+            logger.warning("Erreur tentative %s: %s", attempt+1, str(e))
             
-    logger.error(f"❌ Échec du remplissage du champ '{field_id}' après {max_retries} tentatives")
+    logger.error("❌ Échec du remplissage du champ '%s' après %s tentatives", field_id, max_retries)
     return False
 
 
@@ -666,12 +465,24 @@ logger.info("Fin de la tentative de sélection des suggestions")
 
 # --- Processus de scraping principal ---
 
-def run_scraper(user_data):
-    logger.info(f"Lancement du scraper pour : {user_data['email']}")
+def run_scraper(user_data, on_offer=None, start_index=0, postuler=None):
+    """
+    Lance la recherche et extrait les offres.
+    ``on_offer(offer, index)`` est appelé pour chaque offre extraite (points de reprise) ;
+    les cartes d'index inférieur à ``start_index`` ont déjà été extraites et sont sautées.
+    ``postuler`` active la postulation pendant l'extraction (``AUTO_POSTULER`` par défaut) ;
+    le runner extrait avec ``postuler=False`` et postule lui-même, sous son budget et son
+    limiteur de débit.
+    """
+    if postuler is None:
+        postuler = AUTO_POSTULER
+    logger.info("Lancement du scraper pour : %s", user_data['email'])
     driver = None
+    state_store = BrowserStateStore(worker_profile(user_data))
+    chrome_profile = ChromeProfile(worker_profile(user_data)) if use_persistent_profile(user_data) else None
     try:
-        # Créer le WebDriver avec ouverture auto des DevTools
-        driver = setup_driver()
+        # Créer le WebDriver (profil Chrome persistant et état cookies/localStorage du worker)
+        driver = setup_driver(state_store, chrome_profile)
         if not driver:
             logger.error("Impossible de créer le WebDriver. Arrêt du script.")
             return
@@ -682,7 +493,7 @@ def run_scraper(user_data):
 
         # Accès à la page
         url = "https://www.alternance.emploi.gouv.fr/recherches-offres-formations"
-        logger.info(f"Accès à l'URL : {url}")
+        logger.info("Accès à l'URL : %s", url)
         driver.get(url)
         
         # Les DevTools s'ouvrent automatiquement maintenant grâce à notre setup
@@ -692,12 +503,22 @@ def run_scraper(user_data):
         time.sleep(3)
 
         # Gestion des cookies
-        try:
-            cookie_button = short_wait.until(EC.element_to_be_clickable((By.ID, "tarteaucitronPersonalize2")))
-            cookie_button.click()
-            logger.info("Bannière de cookies acceptée.")
-        except Exception as e:
-            logger.warning(f"Bannière de cookies non trouvée ou déjà acceptée: {e}")
+        if state_store.loaded:
+            # Consentement restauré : pas d'attente, simple vérification instantanée
+            banners = [b for b in driver.find_elements(By.ID, "tarteaucitronPersonalize2") if b.is_displayed()]
+            if banners:
+                logger.info("Bannière de cookies présente malgré l'état restauré : état invalidé")
+                state_store.invalidate()
+                banners[0].click()
+            else:
+                logger.info("Consentement cookies restauré depuis le profil, bannière ignorée.")
+        else:
+            try:
+                cookie_button = short_wait.until(EC.element_to_be_clickable((By.ID, "tarteaucitronPersonalize2")))
+                cookie_button.click()
+                logger.info("Bannière de cookies acceptée.")
+            except Exception as e:
+                logger.warning("Bannière de cookies non trouvée ou déjà acceptée: %s", e)
 
         try:
             # Étape 1: Basculement et traitement de l'iframe contenant le formulaire
@@ -715,7 +536,7 @@ def run_scraper(user_data):
                     iframes = driver.find_elements(By.TAG_NAME, "iframe")
                     if iframes:
                         iframe = iframes[0]  # Prendre le premier iframe comme fallback
-                        logger.info(f"Premier iframe pris par défaut. Total iframes: {len(iframes)}")
+                        logger.info("Premier iframe pris par défaut. Total iframes: %s", len(iframes))
                     else:
                         logger.error("Aucun iframe trouvé sur la page")
                         raise Exception("Erreur: Page mal chargée, aucun iframe disponible")
@@ -739,80 +560,10 @@ def run_scraper(user_data):
             # Code pour forcer l'affichage du formulaire modal en se basant sur l'inspection manuelle
             logger.info("Tentative d'activation du formulaire par simulation d'inspection...")
             
-            # Script JavaScript qui simule exactement ce que fait l'inspection pour révéler le formulaire modal
-            reveal_modal_script = """
-            (function() {
-                console.log('Début de la simulation d\'inspection');
-                
-                // 1. Simuler les variables globales DevTools
-                window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = { 
-                    isDisabled: false,
-                    supportsFiber: true,
-                    renderers: new Map(),
-                    inject: function() {},
-                    hookNames: new Map(),
-                    connected: true
-                };
-                
-                // 2. Forcer l'affichage des éléments cachés dans le modal
-                var modalElement = document.querySelector('.fr-modal__body');
-                if (modalElement) {
-                    console.log('Modal trouvé, force affichage');
-                    modalElement.style.display = 'block';
-                } else {
-                    console.log('Modal non trouvé');
-                }
-                
-                // 3. Créer le formulaire modal s'il n'existe pas
-                var formContainer = document.querySelector('.fr-modal__content');
-                if (!formContainer) {
-                    console.log('Conteneur de formulaire non trouvé - tentative création');
-                    // Forcer la réinitialisation des éléments DOM cachés
-                    document.body.innerHTML += '<div style="display:none" id="temp-trigger"></div>';
-                    document.getElementById('temp-trigger').click();
-                }
-                
-                // 4. Simuler l'état actif des DevTools
-                window.devtools = { isOpen: true, orientation: 'vertical' };
-                document.__devTools = true;
-                
-                // 5. Déclencher des événements qui peuvent activer des comportements JavaScript
-                document.dispatchEvent(new CustomEvent('devtoolschange', { detail: { isOpen: true } }));
-                document.dispatchEvent(new Event('DOMContentLoaded', { bubbles: true }));
-                
-                // 6. Vérifier et révéler les champs du formulaire
-                var metierField = document.getElementById('metier');
-                var formFields = document.querySelectorAll('input, select, button');
-                
-                if (metierField) {
-                    console.log('Champ métier trouvé, activation...');
-                    metierField.style.display = 'block';
-                    metierField.style.visibility = 'visible';
-                    metierField.focus();
-                    
-                    // Récupérer l'état actuel du formulaire pour diagnostique
-                    return {
-                        success: true, 
-                        formFound: !!metierField,
-                        formFieldsCount: formFields.length,
-                        modalVisible: !!modalElement
-                    };
-                } else {
-                    // Retourner information sur le DOM actuel
-                    return { 
-                        success: false, 
-                        formFound: false,
-                        bodyContent: document.body.innerHTML.substring(0, 500) + '...',
-                        formFields: formFields.length
-                    };
-                }
-            })();
-            """
-            
             try:
                 # Exécuter le script pour révéler le formulaire
-                result = driver.execute_script(reveal_modal_script)
-                logger.info(f"Résultat de l'activation: {result}")
+                result = driver.execute_script(REVEAL_MODAL_SCRIPT)
+                logger.info("Résultat de l'activation: %s", result)
                 
                 # Pause pour observer si le formulaire est visible
                 time.sleep(2)
@@ -824,9 +575,9 @@ def run_scraper(user_data):
                     driver.execute_script("arguments[0].click();", metier_field)
                     time.sleep(1)
                 except Exception as e:
-                    logger.warning(f"Champ métier non trouvé après activation: {e}")
+                    logger.warning("Champ métier non trouvé après activation: %s", e)
             except Exception as e:
-                logger.warning(f"Erreur lors de l'activation du formulaire: {e}")
+                logger.warning("Erreur lors de l'activation du formulaire: %s", e)
                 
                 # Pause pour observer le résultat
                 time.sleep(2)
@@ -861,7 +612,7 @@ def run_scraper(user_data):
                     
                     # Exécution du script avec la valeur du métier
                     result = driver.execute_script(fill_input_script, user_data['search_query'])
-                    logger.info(f"Résultat du remplissage du champ métier: {result}")
+                    logger.info("Résultat du remplissage du champ métier: %s", result)
                     
                     # Attendre que les suggestions apparaissent
                     time.sleep(2)
@@ -935,7 +686,7 @@ def run_scraper(user_data):
                     time.sleep(2)
                     
                 except Exception as e:
-                    logger.error(f"Erreur lors du remplissage direct des champs: {e}")
+                    logger.error("Erreur lors du remplissage direct des champs: %s", e)
                     # Continuer avec l'approche standard si l'approche directe échoue
                 
                 # Approche finale: Activation complète du formulaire 
@@ -1012,10 +763,10 @@ def run_scraper(user_data):
                 try:
                     # Exécuter le script d'activation complète
                     activation_result = driver.execute_script(complete_activation_script)
-                    logger.info(f"Résultat de l'activation complète: {activation_result}")
+                    logger.info("Résultat de l'activation complète: %s", activation_result)
                     time.sleep(2)
                 except Exception as e:
-                    logger.warning(f"Erreur lors de l'activation complète du formulaire: {e}")
+                    logger.warning("Erreur lors de l'activation complète du formulaire: %s", e)
                 
                 # Tentative de remplissage des champs après activation complète
                 logger.info("Tentative de remplissage des champs après activation complète...")
@@ -1024,7 +775,7 @@ def run_scraper(user_data):
                     # Ces champs seront remplis plus tard dans le flux principal
                     logger.info("Activation du formulaire terminée, les champs seront remplis dans l'étape suivante")
                 except Exception as e:
-                    logger.error(f"Erreur lors du remplissage après activation complète: {e}")
+                    logger.error("Erreur lors du remplissage après activation complète: %s", e)
                     driver.save_screenshot('form_filling_error.png')
                     
                 time.sleep(2)
@@ -1039,120 +790,40 @@ def run_scraper(user_data):
                     for el in visible_elements[:5]:  # Limiter aux 5 premiers éléments pour éviter de parcourir tout le DOM
                         try:
                             if el.is_displayed():
-                                logger.info(f"Clic sur un élément visible: {el.tag_name}")
+                                logger.info("Clic sur un élément visible: %s", el.tag_name)
                                 el.click()
                                 break
                         except:
                             continue
                 except Exception as e:
-                    logger.warning(f"Erreur lors de la tentative de clic sur un élément visible: {e}")
+                    logger.warning("Erreur lors de la tentative de clic sur un élément visible: %s", e)
                 
                 # Pause supplémentaire
                 time.sleep(3)
                 
-                # Décocher la case "Formations" si elle est cochée - Avec plusieurs tentatives
-                try:
-                    logger.info("IMPORTANT: Tentative de décocher la case Formations...")
-                    time.sleep(1)  # Attendre que tout soit chargé
-                    
-                    # Méthode 1: Utiliser la fonction existante
-                    success = uncheck_formations_checkbox(driver, wait)
-                    
-                    # Méthode 2: JavaScript direct et plus agressif pour décocher TOUTES les cases Formations
-                    js_code = """
-                    console.log('Décochage force des cases formations');
-                    // Approche 1: par attribut name
-                    var checkboxes = document.querySelectorAll('input[name="formations"][type="checkbox"]');
-                    console.log('Checkboxes formations trouvées:', checkboxes.length);
-                    
-                    // Décocher toutes les cases qui correspondent
-                    checkboxes.forEach(function(checkbox) {
-                        if (checkbox.checked || checkbox.getAttribute('checked') === 'true') {
-                            console.log('Case à décocher trouvée');
-                            checkbox.checked = false;
-                            checkbox.setAttribute('checked', 'false');
-                            checkbox.dispatchEvent(new Event('change', { bubbles: true }));
-                        }
-                    });
-                    
-                    // Approche 2: par texte du label
-                    var labels = document.querySelectorAll('label');
-                    labels.forEach(function(label) {
-                        if (label.textContent.includes('Formation')) {
-                            var input = document.getElementById(label.getAttribute('for'));
-                            if (input && (input.checked || input.getAttribute('checked') === 'true')) {
-                                console.log('Case formation trouvée via label');
-                                input.checked = false;
-                                input.setAttribute('checked', 'false');
-                                input.dispatchEvent(new Event('change', { bubbles: true }));
-                            }
-                        }
-                    });
-                    
-                    // Approche 3: très agressive, cibler toute case à cocher avec un label contenant formation
-                    var allCheckboxes = document.querySelectorAll('input[type="checkbox"]');
-                    console.log('Total checkboxes:', allCheckboxes.length);
-                    allCheckboxes.forEach(function(cb) {
-                        var parentText = cb.parentElement ? cb.parentElement.textContent.toLowerCase() : '';
-                        if (parentText.includes('formation') && cb.checked) {
-                            console.log('Case formation trouvée via parent');
-                            cb.checked = false;
-                            cb.click();
-                        }
-                    });
-                    
-                    return 'Décochage forcé des cases Formations terminé';
-                    """
-                    
-                    result = driver.execute_script(js_code)
-                    logger.info(f"Résultat du décochage forcé: {result}")
-                    
-                    # Méthode 3: Décoche directe par Sélecteur CSS
-                    try:
-                        # Essayer de trouver directement les cases à décocher
-                        formations_checkboxes = driver.find_elements(By.CSS_SELECTOR, ".filter-checkbox input[type='checkbox']")
-                        for cb in formations_checkboxes:
-                            try:
-                                parent = cb.find_element(By.XPATH, "./..") 
-                                parent_text = parent.text.lower()
-                                if 'formation' in parent_text and cb.is_selected():
-                                    logger.info("Case Formation trouvée directement, tentative de décochage...")
-                                    driver.execute_script("arguments[0].click();", cb)
-                            except Exception as inner_e:
-                                pass
-                    except Exception as e:
-                        logger.warning(f"Erreur lors de la recherche directe de cases à décocher: {e}")
-                    
-                    # Prendre une capture d'écran après le décochage pour vérification
-                    driver.save_screenshot('debug_screenshots/apres_decochage.png')
-                    logger.info("Capture d'écran enregistrée après le décochage")
-                    
-                except Exception as e:
-                    logger.warning(f"Erreur lors de la tentative de décocher la case Formations: {e}")
+                # Décocher la case "Formations" (une seule opération, état React vérifié)
+                if not uncheck_formations_checkbox(driver):
                     driver.save_screenshot('debug_screenshots/erreur_decochage.png')
-                    
-                # Pause supplémentaire
-                time.sleep(3)
                 
                 # Vérifier si les champs du formulaire sont présents
                 try:
                     metier_field = wait.until(EC.presence_of_element_located((By.ID, "metier")))
                     logger.info("✅ Le champ métier est visible.") 
                 except Exception as e:
-                    logger.warning(f"Le champ métier n'est pas visible: {e}")
+                    logger.warning("Le champ métier n'est pas visible: %s", e)
                     logger.info("Essai de localisation par d'autres sélecteurs...")
                     # Essayer d'autres sélecteurs
                     try:
                         metier_field = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#metier, input[name='metier'], input[placeholder*='métier']")))
                         logger.info("✅ Champ métier trouvé avec un sélecteur alternatif!")
                     except Exception as e2:
-                        logger.error(f"Impossible de trouver le champ métier avec des sélecteurs alternatifs: {e2}")
+                        logger.error("Impossible de trouver le champ métier avec des sélecteurs alternatifs: %s", e2)
                         # Sauvegarde du DOM pour analyse
                         with open('etat_iframe.html', 'w', encoding='utf-8') as f:
                             f.write(driver.page_source)
                         logger.info("DOM de l'iframe sauvegardé dans 'etat_iframe.html'")
         except Exception as e:
-            logger.error(f"Erreur lors de l'interaction avec l'iframe: {e}")
+            logger.error("Erreur lors de l'interaction avec l'iframe: %s", e)
             # Revenir au contenu principal
             driver.switch_to.default_content()
             with open('etat_page_principale.html', 'w', encoding='utf-8') as f:
@@ -1163,9 +834,6 @@ def run_scraper(user_data):
         # Pause avant de commencer le remplissage
         time.sleep(2)
         
-        # Décocher la case "Formations" si elle est cochée
-        uncheck_formations_checkbox(driver, wait)
-        
         # Étape 3: Remplissage des champs avec notre fonction améliorée
         logger.info("Début du remplissage des champs du formulaire...")
         
@@ -1183,7 +851,7 @@ def run_scraper(user_data):
             for selector in metier_selectors:
                 try:
                     metier_input = short_wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, selector)))
-                    logger.info(f"Champ métier trouvé avec le sélecteur: {selector}")
+                    logger.info("Champ métier trouvé avec le sélecteur: %s", selector)
                     break
                 except:
                     continue
@@ -1191,7 +859,7 @@ def run_scraper(user_data):
             if not metier_input:
                 logger.warning("Champ métier introuvable avec les sélecteurs standard")
         except Exception as e:
-            logger.error(f"Problème lors de la recherche des champs: {e}")
+            logger.error("Problème lors de la recherche des champs: %s", e)
         
         # Tentative de remplissage du champ métier
         if not fill_field_with_autocomplete(driver, wait, 'metier', user_data['search_query']):
@@ -1227,7 +895,7 @@ def run_scraper(user_data):
         for selector in submit_button_selectors:
             try:
                 submit_button = short_wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                logger.info(f"Bouton de soumission trouvé avec le sélecteur: {selector}")
+                logger.info("Bouton de soumission trouvé avec le sélecteur: %s", selector)
                 break
             except:
                 continue
@@ -1242,10 +910,10 @@ def run_scraper(user_data):
                     btn_class = button.get_attribute("class") or ""
                     if "parti" in text or "search" in text.lower() or "submit" in btn_class.lower():
                         submit_button = button
-                        logger.info(f"Bouton de soumission trouvé avec le texte: {button.text}")
+                        logger.info("Bouton de soumission trouvé avec le texte: %s", button.text)
                         break
             except Exception as e:
-                logger.warning(f"Tentative de recherche par texte échouée: {e}")
+                logger.warning("Tentative de recherche par texte échouée: %s", e)
         
         # Pause avant soumission 
         time.sleep(1)
@@ -1269,7 +937,7 @@ def run_scraper(user_data):
         for selector in submit_button_selectors:
             try:
                 submit_button = short_wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                logger.info(f"Bouton de soumission trouvé avec le sélecteur: {selector}")
+                logger.info("Bouton de soumission trouvé avec le sélecteur: %s", selector)
                 break
             except:
                 continue
@@ -1284,10 +952,10 @@ def run_scraper(user_data):
                     btn_class = button.get_attribute("class") or ""
                     if "parti" in text or "search" in text.lower() or "submit" in btn_class.lower():
                         submit_button = button
-                        logger.info(f"Bouton de soumission trouvé avec le texte: {button.text}")
+                        logger.info("Bouton de soumission trouvé avec le texte: %s", button.text)
                         break
             except Exception as e:
-                logger.warning(f"Tentative de recherche par texte échouée: {e}")
+                logger.warning("Tentative de recherche par texte échouée: %s", e)
                 
         if submit_button:
             # Essayer trois méthodes de clic différentes en séquence
@@ -1300,13 +968,13 @@ def run_scraper(user_data):
             click_success = False
             for method_name, click_method in click_methods:
                 try:
-                    logger.info(f"Tentative de clic par {method_name}...")
+                    logger.info("Tentative de clic par %s...", method_name)
                     click_method(submit_button)
-                    logger.info(f"Clic par {method_name} réussi")
+                    logger.info("Clic par %s réussi", method_name)
                     click_success = True
                     break
                 except Exception as e:
-                    logger.warning(f"Clic par {method_name} a échoué: {e}")
+                    logger.warning("Clic par %s a échoué: %s", method_name, e)
             
             if not click_success:
                 logger.error("Toutes les méthodes de clic ont échoué")
@@ -1332,7 +1000,7 @@ def run_scraper(user_data):
                     try:
                         # Vérifier si on a été redirigé vers "La bonne alternance"
                         if "labonnealternance" in driver.current_url:
-                            logger.info(f"Redirection vers La bonne alternance détectée: {driver.current_url}")
+                            logger.info("Redirection vers La bonne alternance détectée: %s", driver.current_url)
                             break
                             
                         # Vérifier si une iframe La bonne alternance est présente
@@ -1340,7 +1008,7 @@ def run_scraper(user_data):
                         for iframe in iframes:
                             src = iframe.get_attribute("src")
                             if src and "labonnealternance" in src:
-                                logger.info(f"Iframe La bonne alternance détectée: {iframe.get_attribute('src')}")
+                                logger.info("Iframe La bonne alternance détectée: %s", iframe.get_attribute('src'))
                                 break
                         
                         # Vérifier les éléments spécifiques à La bonne alternance
@@ -1353,7 +1021,7 @@ def run_scraper(user_data):
                             logger.info("Éléments de résultats standards détectés")
                             break
                     except Exception as e:
-                        logger.debug(f"Exception lors de la vérification des résultats: {e}")
+                        logger.debug("Exception lors de la vérification des résultats: %s", e)
                         pass
                         
                     time.sleep(0.5)
@@ -1395,9 +1063,9 @@ def run_scraper(user_data):
                                               for iframe in driver.find_elements(By.TAG_NAME, "iframe"))
             
             if is_bonne_alternance or has_bonne_alternance_iframe:
-                logger.info(f"Page 'La bonne alternance' chargée. URL finale: {driver.current_url}")
+                logger.info("Page 'La bonne alternance' chargée. URL finale: %s", driver.current_url)
             else:
-                logger.info(f"Page de résultats standard chargée. URL finale: {driver.current_url}")
+                logger.info("Page de résultats standard chargée. URL finale: %s", driver.current_url)
             time.sleep(2)  # Pause pour s'assurer que le JavaScript a terminé le rendu
         except TimeoutException:
             logger.error("Timeout: la page de résultats n'a pas chargé dans le délai imparti.")
@@ -1407,15 +1075,15 @@ def run_scraper(user_data):
                 screenshot_path = f"debug_screenshots/timeout_results_{timestamp}.png"
                 os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
                 driver.save_screenshot(screenshot_path)
-                logger.info(f"Capture d'écran de diagnostic enregistrée dans {screenshot_path}")
+                logger.info("Capture d'écran de diagnostic enregistrée dans %s", screenshot_path)
                 
                 # Sauvegarder également le code source de la page
                 source_path = f"debug_screenshots/page_source_{timestamp}.html"
                 with open(source_path, 'w', encoding='utf-8') as f:
                     f.write(driver.page_source)
-                logger.info(f"Code source de la page enregistré dans {source_path}")
+                logger.info("Code source de la page enregistré dans %s", source_path)
             except Exception as e:
-                logger.error(f"Erreur lors de la sauvegarde du diagnostic: {e}")
+                logger.error("Erreur lors de la sauvegarde du diagnostic: %s", e)
                 
             # Vérifier si nous avons une iframe labonnealternance et l'afficher dans les logs
             try:
@@ -1423,14 +1091,14 @@ def run_scraper(user_data):
                 for iframe in iframes:
                     src = iframe.get_attribute("src")
                     if src and "labonnealternance" in src:
-                        logger.info(f"Iframe labonnealternance détectée mais non traitée: {src}")
+                        logger.info("Iframe labonnealternance détectée mais non traitée: %s", src)
             except Exception as e:
-                logger.error(f"Erreur lors de l'analyse des iframes: {e}")
+                logger.error("Erreur lors de l'analyse des iframes: %s", e)
             with open('page_apres_soumission_erreur.html', 'w', encoding='utf-8') as f:
                 f.write(driver.page_source)
             logger.info("État de la page sauvegardé dans 'page_apres_soumission_erreur.html'")
         except Exception as e:
-            logger.error(f"Erreur lors de la tentative de soumission du formulaire: {e}")
+            logger.error("Erreur lors de la tentative de soumission du formulaire: %s", e)
             # Sauvegarder la page pour diagnostic
             with open('page_erreur_soumission.html', 'w', encoding='utf-8') as f:
                 f.write(driver.page_source)
@@ -1446,7 +1114,7 @@ def run_scraper(user_data):
             error_page_path = os.path.join(os.path.dirname(__file__), 'page_apres_soumission_erreur.html')
             with open(error_page_path, 'w', encoding='utf-8') as f:
                 f.write(driver.page_source)
-            logger.info(f"Page sauvegardée dans : {error_page_path}")
+            logger.info("Page sauvegardée dans : %s", error_page_path)
             raise # Re-raise the exception to stop the script
         
         # Sauvegarde du code source de la page de résultats pour analyse...
@@ -1454,7 +1122,7 @@ def run_scraper(user_data):
         results_filepath = os.path.join(os.path.dirname(__file__), 'page_resultats.html')
         with open(results_filepath, 'w', encoding='utf-8') as f:
             f.write(driver.page_source)
-        logger.info(f"✅ Code source des résultats sauvegardé dans '{results_filepath}'.")
+        logger.info("✅ Code source des résultats sauvegardé dans '%s'.", results_filepath)
         
         # Traitement spécifique pour La bonne alternance
         job_offers = []
@@ -1467,517 +1135,476 @@ def run_scraper(user_data):
                 src = iframe.get_attribute("src")
                 if src and "labonnealternance" in src:
                     labonne_iframe = iframe
-                    logger.info(f"Iframe La bonne alternance trouvée pour extraction: {src}")
+                    logger.info("Iframe La bonne alternance trouvée pour extraction: %s", src)
                     break
         except Exception as e:
-            logger.error(f"Erreur lors de la recherche de l'iframe: {e}")
+            logger.error("Erreur lors de la recherche de l'iframe: %s", e)
         
+        iframe_error = None
         if labonne_iframe:
             # Traitement spécifique pour La bonne alternance
             try:
                 # Initialiser la liste des offres
                 job_offers = []
                 
-                # Basculer vers l'iframe
+                # Basculer vers l'iframe (élément mis en cache par le contexte, plus de sonde à chaque offre) ;
+                # la sortie du bloc revient au document principal, y compris en cas d'erreur
                 logger.info("Basculement vers l'iframe La bonne alternance...")
-                driver.switch_to.frame(labonne_iframe)
-                print("=== PAUSE POUR INSPECTION MANUELLE : 120 secondes ===")
-                time.sleep(7)
+                with FrameContext(driver, iframe=labonne_iframe) as results_frame:
+                    logger.info("Pause pour le chargement du contenu de l'iframe")
+                    time.sleep(7)
                 
-                # Attendre que le contenu de l'iframe se charge complètement
-                try:
-                    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, ".fr-card, div[role='group'], .chakra-stack")))
-                    logger.info("Contenu de l'iframe chargé avec succès")
+                    # Attendre que le contenu de l'iframe se charge complètement
                     try:
-                        formations_checkbox = WebDriverWait(driver, 10).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='checkbox'][name='formations']"))
-                        )
-                        if formations_checkbox.is_selected():
-                            driver.execute_script("arguments[0].click();", formations_checkbox)
-                            logger.info("Case 'Formations' décochée dans la zone de filtres après la recherche.")
-                        else:
-                            logger.info("Case 'Formations' déjà décochée dans la zone de filtres.")
-                    except Exception as e:
-                        logger.warning(f"Impossible de décocher la case 'Formations' dans la zone de filtres : {e}")
-                except TimeoutException:
-                    logger.warning("Timeout en attendant le chargement du contenu de l'iframe - continuons quand même")
+                        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, ".fr-card, div[role='group'], .chakra-stack")))
+                        logger.info("Contenu de l'iframe chargé avec succès")
+                        try:
+                            set_filter_state(driver, formations=False)
+                        except Exception as e:
+                            logger.warning("Impossible de décocher la case 'Formations' dans la zone de filtres : %s", e)
+                    except TimeoutException:
+                        logger.warning("Timeout en attendant le chargement du contenu de l'iframe - continuons quand même")
                 
-                # Capturer une capture d'écran pour le debug
-                screenshot_path = "debug_screenshots/labonnealternance_content.png"
-                os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
-                driver.save_screenshot(screenshot_path)
-                logger.info(f"Capture d'écran de l'iframe enregistrée dans {screenshot_path}")
+                    # Mémoriser le localStorage de La bonne alternance pour les prochaines exécutions
+                    state_store.capture_local_storage(driver)
                 
-                # Afficher l'HTML complet de l'iframe pour debug
-                iframe_html = driver.page_source
-                debug_html_path = "debug_screenshots/labonnealternance_html.html"
-                os.makedirs(os.path.dirname(debug_html_path), exist_ok=True)
-                with open(debug_html_path, 'w', encoding='utf-8') as f:
-                    f.write(iframe_html)
-                logger.info(f"HTML de l'iframe sauvegardé dans {debug_html_path}")
+                    # Capturer une capture d'écran pour le debug
+                    screenshot_path = "debug_screenshots/labonnealternance_content.png"
+                    os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
+                    driver.save_screenshot(screenshot_path)
+                    logger.info("Capture d'écran de l'iframe enregistrée dans %s", screenshot_path)
                 
-                # Scroll pour charger plus de contenu si nécessaire (important pour le chargement dynamique)
-                try:
-                    for _ in range(3):  # Scrollez 3 fois pour charger plus de contenu
-                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(1)
-                except Exception as e:
-                    logger.warning(f"Erreur lors du scroll: {e} - continuons quand même")
+                    # Afficher l'HTML complet de l'iframe pour debug
+                    iframe_html = driver.page_source
+                    debug_html_path = "debug_screenshots/labonnealternance_html.html"
+                    os.makedirs(os.path.dirname(debug_html_path), exist_ok=True)
+                    with open(debug_html_path, 'w', encoding='utf-8') as f:
+                        f.write(iframe_html)
+                    logger.info("HTML de l'iframe sauvegardé dans %s", debug_html_path)
+                
+                    # Scroll pour charger plus de contenu si nécessaire (important pour le chargement dynamique)
+                    try:
+                        for _ in range(3):  # Scrollez 3 fois pour charger plus de contenu
+                            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                            time.sleep(1)
+                    except Exception as e:
+                        logger.warning("Erreur lors du scroll: %s - continuons quand même", e)
                 
-                # Différentes stratégies de sélection des offres
-                selectors_strategies = [
-                    ".fr-card",  # Format standard France Connect
-                    "div[role='group']",  # Chakra UI groupes (structure commune)
-                    ".chakra-stack .chakra-card",  # Format Chakra UI card
-                    ".chakra-stack > div:not([class])",  # Divs directs dans les stacks (souvent utilisé pour les cartes)
-                    ".chakra-box div[role='group']", # Boîtes Chakra contenant des groupes
-                    ".result-item, .fr-tile, .tile" # Classes communes pour les résultats de recherche
-                ]
+                    # Différentes stratégies de sélection des offres
+                    selectors_strategies = SITE_PROFILE.results.card_selectors
                 
-                # Essayer chaque stratégie de sélecteur jusqu'à trouver des résultats
-                formation_cards = []
-                for selector in selectors_strategies:
-                    logger.info(f"Essai avec le sélecteur: {selector}")
-                    formation_cards = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if formation_cards:
-                        logger.info(f"Trouvé {len(formation_cards)} éléments avec le sélecteur {selector}")
-                        break
+                    # Essayer chaque stratégie de sélecteur jusqu'à trouver des résultats
+                    formation_cards = []
+                    for selector in selectors_strategies:
+                        logger.info("Essai avec le sélecteur: %s", selector)
+                        formation_cards = driver.find_elements(By.CSS_SELECTOR, selector)
+                        if formation_cards:
+                            logger.info("Trouvé %s éléments avec le sélecteur %s", len(formation_cards), selector)
+                            break
                 
-                if not formation_cards:
-                    # Dernier recours: chercher tous les conteneurs qui pourraient être des cartes
-                    logger.warning("Aucune offre trouvée avec les sélecteurs standards. Essai avec sélecteur générique...")
-                    formation_cards = driver.find_elements(By.CSS_SELECTOR, ".chakra-box, div[role], article, section > div")
-                    logger.info(f"Tentative de secours: {len(formation_cards)} éléments potentiels trouvés")
+                    if not formation_cards:
+                        # Dernier recours: chercher tous les conteneurs qui pourraient être des cartes
+                        logger.warning("Aucune offre trouvée avec les sélecteurs standards. Essai avec sélecteur générique...")
+                        formation_cards = driver.find_elements(By.CSS_SELECTOR, SITE_PROFILE.results.card_fallback_selector)
+                        logger.info("Tentative de secours: %s éléments potentiels trouvés", len(formation_cards))
                 
-                # Pas de limite fixe pour le nombre d'offres, mais filtrons les cartes trop petites
-                valid_cards = []
-                for card in formation_cards:
-                    # Vérifier si la carte a une taille minimale et du contenu
-                    try:
-                        if len(card.text.strip()) > 20:  # Au moins 20 caractères de texte
-                            valid_cards.append(card)
-                    except:
-                        continue
+                    # Pas de limite fixe pour le nombre d'offres, mais filtrons les cartes trop petites
+                    valid_cards = []
+                    for card in formation_cards:
+                        # Vérifier si la carte a une taille minimale et du contenu
+                        try:
+                            if len(card.text.strip()) > SITE_PROFILE.results.card_min_text_length:
+                                valid_cards.append(card)
+                        except:
+                            continue
                 
-                logger.info(f"Nombre total de cartes valides: {len(valid_cards)}")
-                # AJOUT : Log explicite du nombre total d'offres détectées (hors formations)
-                logger.info(f"=== NOMBRE TOTAL D'OFFRES DÉTECTÉES (hors formations) : {len(valid_cards)} ===")
+                    logger.info("Nombre total de cartes valides: %s", len(valid_cards))
+                    # AJOUT : Log explicite du nombre total d'offres détectées (hors formations)
+                    logger.info("=== NOMBRE TOTAL D'OFFRES DÉTECTÉES (hors formations) : %s ===", len(valid_cards))
                 
-                # Récupérer les URL de base pour les liens relatifs
-                base_url = "https://labonnealternance.apprentissage.beta.gouv.fr"
+                    # Récupérer les URL de base pour les liens relatifs
+                    base_url = SITE_PROFILE.results.base_url
                 
-                # Filtrer les cartes pour ignorer les formations
-                filtered_cards = []
-                for card in valid_cards:
-                    try:
-                        tag = card.find_element(By.CSS_SELECTOR, ".chakra-text.mui-ulcbns").text.strip()
-                        if tag.upper() == "FORMATION":
-                            continue  # ignorer les formations
-                        filtered_cards.append(card)
-                    except Exception:
-                        # Si le tag n'existe pas, c'est peut-être une offre d'emploi
-                        filtered_cards.append(card)
+                    # Filtrer les cartes pour ignorer les formations
+                    filtered_cards = []
+                    for card in valid_cards:
+                        try:
+                            tag = card.find_element(By.CSS_SELECTOR, SITE_PROFILE.results.card_tag_selector).text.strip()
+                            if tag.upper() == "FORMATION":
+                                continue  # ignorer les formations
+                            filtered_cards.append(card)
+                        except Exception:
+                            # Si le tag n'existe pas, c'est peut-être une offre d'emploi
+                            filtered_cards.append(card)
 
-                logger.info(f"Nombre de cartes après filtrage des formations: {len(filtered_cards)}")
+                    logger.info("Nombre de cartes après filtrage des formations: %s", len(filtered_cards))
                 
-                # Extraire les informations de chaque carte d'offre/formation
-                for index, card in enumerate(filtered_cards):
-                    logger.info(index, card.get_attribute('outerHTML'))
-                    try:
-                        # Capturer le HTML complet de la carte pour le debug
-                        card_html = card.get_attribute('outerHTML')
-                        card_debug_path = f"debug_screenshots/card_{index}.html"
-                        with open(card_debug_path, 'w', encoding='utf-8') as f:
-                            f.write(card_html)
+                    # Extraire les informations de chaque carte d'offre/formation
+                    for index, card in enumerate(filtered_cards):
+                        if index < start_index:
+                            continue  # Carte déjà extraite lors d'une session précédente
+                        try:
+                            # HTML complet de la carte pour le debug : un aller-retour WebDriver et une écriture
+                            # disque par carte, uniquement si le niveau DEBUG est actif
+                            if logger.isEnabledFor(logging.DEBUG):
+                                card_html = card.get_attribute('outerHTML')
+                                logger.debug("Carte %d: %s", index, card_html)
+                                with open(f"debug_screenshots/card_{index}.html", 'w', encoding='utf-8') as f:
+                                    f.write(card_html)
                         
-                        # Extraction du titre avec plusieurs stratégies
-                        title = "Titre non disponible"
-                        title_selectors = [
-                            "h3, h4, h5, .chakra-heading, .fr-card__title",  # En-têtes standard
-                            "[data-testid*='title'], [class*='title'], strong, b",  # Attributs data ou classes contenant 'title'
-                            ".chakra-text:first-of-type, p:first-of-type"  # Premier élément de texte
-                        ]
+                            # Extraction du titre avec plusieurs stratégies
+                            title = "Titre non disponible"
+                            title_selectors = SITE_PROFILE.results.title_selectors
                         
-                        for selector in title_selectors:
-                            try:
-                                title_element = card.find_element(By.CSS_SELECTOR, selector)
-                                title_text = title_element.text.strip()
-                                if title_text and len(title_text) > 3:  # Au moins 3 caractères
-                                    title = title_text
-                                    break
-                            except:
-                                continue
+                            for selector in title_selectors:
+                                try:
+                                    title_element = card.find_element(By.CSS_SELECTOR, selector)
+                                    title_text = title_element.text.strip()
+                                    if title_text and len(title_text) > 3:  # Au moins 3 caractères
+                                        title = title_text
+                                        break
+                                except:
+                                    continue
                         
-                        if title == "Titre non disponible":
-                            # Fallback: utiliser la première ligne du texte de la carte
-                            text_lines = [line.strip() for line in card.text.split('\n') if line.strip()]
-                            if text_lines:
-                                title = text_lines[0]
+                            if title == "Titre non disponible":
+                                # Fallback: utiliser la première ligne du texte de la carte
+                                text_lines = [line.strip() for line in card.text.split('\n') if line.strip()]
+                                if text_lines:
+                                    title = text_lines[0]
                         
-                        # Extraction de l'entreprise/établissement
-                        company = "Entreprise non disponible"
-                        company_selectors = [
-                            ".fr-card__desc, .chakra-text[data-testid*='company']",
-                            "p:not(:first-child), .subtitle, [class*='company']",
-                            ".chakra-stack p"  # Paragraphes dans un chakra-stack
-                        ]
+                            # Extraction de l'entreprise/établissement
+                            company = "Entreprise non disponible"
+                            company_selectors = SITE_PROFILE.results.company_selectors
                         
-                        for selector in company_selectors:
-                            try:
-                                company_elements = card.find_elements(By.CSS_SELECTOR, selector)
-                                if company_elements:
-                                    for elem in company_elements:
-                                        text = elem.text.strip()
-                                        if text and not any(x in text.lower() for x in ["date", "durée", "km", "à "]) and len(text) > 3:
-                                            company = text
-                                            break
-                            except:
-                                continue
+                            for selector in company_selectors:
+                                try:
+                                    company_elements = card.find_elements(By.CSS_SELECTOR, selector)
+                                    if company_elements:
+                                        for elem in company_elements:
+                                            text = elem.text.strip()
+                                            if text and not any(x in text.lower() for x in SITE_PROFILE.results.company_exclusions) and len(text) > 3:
+                                                company = text
+                                                break
+                                except:
+                                    continue
                         
-                        if company == "Entreprise non disponible":
-                            # Fallback: chercher la deuxième ligne de texte ou une ligne qui semble être un nom d'entreprise
-                            text_lines = [line.strip() for line in card.text.split('\n') if line.strip()]
-                            if len(text_lines) > 1:
-                                company = text_lines[1]
+                            if company == "Entreprise non disponible":
+                                # Fallback: chercher la deuxième ligne de texte ou une ligne qui semble être un nom d'entreprise
+                                text_lines = [line.strip() for line in card.text.split('\n') if line.strip()]
+                                if len(text_lines) > 1:
+                                    company = text_lines[1]
                         
-                        # Extraction du lieu avec recherche de code postal ou ville
-                        location = "Lieu non disponible"
-                        location_selectors = [
-                            ".fr-card__start, address, [data-testid*='location'], [class*='location']",
-                            ".chakra-text:contains('km'), .chakra-text:contains('Paris'), .chakra-text:contains('Lyon')",
-                            "span:contains('km'), div:contains('km')",
-                            "p:contains(', ')"  # Format commun pour les adresses: "Ville, Code postal"
-                        ]
+                            # Extraction du lieu avec recherche de code postal ou ville
+                            location = "Lieu non disponible"
+                            location_selectors = SITE_PROFILE.results.location_selectors
                         
+                            for selector in location_selectors:
+                                try:
+                                    location_elements = card.find_elements(By.CSS_SELECTOR, selector)
+                                    if location_elements:
+                                        for elem in location_elements:
+                                            text = elem.text.strip()
+                                            # Si le texte contient un code postal ou une distance en km, c'est probablement un lieu
+                                            if text and (POSTAL_CODE_PATTERN.search(text) or 'km' in text.lower() or any(city in text for city in SITE_PROFILE.results.location_cities)):
+                                                location = text
+                                                break
+                                except:
+                                    continue
                         
-                        postal_code_pattern = re.compile(r'\b\d{5}\b')  # Regex pour les codes postaux français
+                            if location == "Lieu non disponible":
+                                # Fallback: chercher une ligne contenant un code postal ou km
+                                text_lines = [line.strip() for line in card.text.split('\n') if line.strip()]
+                                for line in text_lines:
+                                    if POSTAL_CODE_PATTERN.search(line) or 'km' in line.lower():
+                                        location = line
+                                        break
                         
-                        for selector in location_selectors:
+                            # Tenter d'extraire un lien
+                            link = ""
                             try:
-                                location_elements = card.find_elements(By.CSS_SELECTOR, selector.replace(':contains', ''))
-                                if location_elements:
-                                    for elem in location_elements:
-                                        text = elem.text.strip()
-                                        # Si le texte contient un code postal ou une distance en km, c'est probablement un lieu
-                                        if text and (postal_code_pattern.search(text) or 'km' in text.lower() or any(city in text for city in ['Paris', 'Lyon', 'Marseille', 'Toulouse'])):
-                                            location = text
-                                            break
+                                link_element = card.find_element(By.TAG_NAME, "a")
+                                link = link_element.get_attribute('href') or ""
+                                if link and link.startswith('/'):
+                                    link = f"{base_url}{link}"
                             except:
-                                continue
-                        
-                        if location == "Lieu non disponible":
-                            # Fallback: chercher une ligne contenant un code postal ou km
-                            text_lines = [line.strip() for line in card.text.split('\n') if line.strip()]
-                            for line in text_lines:
-                                if postal_code_pattern.search(line) or 'km' in line.lower():
-                                    location = line
-                                    break
-                        
-                        # Tenter d'extraire un lien
-                        link = ""
-                        try:
-                            link_element = card.find_element(By.TAG_NAME, "a")
-                            link = link_element.get_attribute('href') or ""
-                            if link and link.startswith('/'):
-                                link = f"{base_url}{link}"
-                        except:
-                            link = ""
+                                link = ""
                         
-                        # Déterminer le type d'offre
-                        card_text = card.text.lower()
-                        offer_type = "Indéterminé"  # Par défaut
+                            # Déterminer le type d'offre
+                            card_text = card.text.lower()
+                            offer_type = "Indéterminé"  # Par défaut
                         
-                        # Capture d'une capture d'écran de la carte pour analyse
-                        try:
-                            driver.execute_script("arguments[0].style.border = '3px solid red';", card)
-                            driver.save_screenshot(f'debug_screenshots/card_analyzed_{index}.png')
-                            driver.execute_script("arguments[0].style.border = '';", card)
-                        except:
-                            pass
+                            # Capture d'une capture d'écran de la carte pour analyse
+                            try:
+                                driver.execute_script("arguments[0].style.border = '3px solid red';", card)
+                                driver.save_screenshot(f'debug_screenshots/card_analyzed_{index}.png')
+                                driver.execute_script("arguments[0].style.border = '';", card)
+                            except:
+                                pass
                             
-                        # Recherche de mots-clés forts dans le titre et la description pour les formations
-                        formation_keywords_strong = [
-                            "formation", "bts", "bachelor", "master", "licence", "dut", 
-                            "certifica", "certificat", "diplôme", "rncp", 
-                            "(bts)", "(master)", "(bachelor)", "(licence)", "(dut)", "(mba)", 
-                            "(tp)", "(lp)", "(formatives)", "formation en"
-                        ]
+                            # Mots-clés et pondérations du profil de site
+                            keywords = SITE_PROFILE.classification
                         
-                        # Mots-clés secondaires pour les formations
-                        formation_keywords_weak = [
-                            "école", "étude", "deust", "formatives", "cfa", "institut", 
-                            "eemi", "formasup", "université", "centre", "cnam", "formation 100%", 
-                            "distanc", "parcours", "étudiant", "apprentissage", "bac", "bac+"
-                        ]
+                            # Règles de détection plus précises avec pondération avancée
+                            formation_score = 0
+                            entreprise_score = 0
                         
-                        # Identifiants forts pour les offres d'emploi
-                        entreprise_keywords_strong = [
-                            "métier", "entreprise recrute", "poste", "contrat", 
-                            "cdi", "cdd", "emploi", "offre d'emploi", "job", 
-                            "recrut", "recherche un", "recherche une", "embauche", "salaire",
-                            "rémunération", "expérience", "temps plein", "temps partiel"
-                        ]
-                        
-                        # Mots-clés secondaires pour les offres d'emploi
-                        entreprise_keywords_weak = [
-                            "entreprise", "alternance", "commercial", "vendeur", "acheteur", 
-                            "manager", "directeur", "assistant", "technicien", "ingénieur",
-                            "responsable", "chef", "chargé", "collaborateur", "candidature"
-                        ]
-                        
-                        # Règles de détection plus précises avec pondération avancée
-                        formation_score = 0
-                        entreprise_score = 0
-                        
-                        # Créer un dictionnaire des détails de scoring pour le débogage
-                        score_details = {
-                            "formation_matches": {},
-                            "entreprise_matches": {}
-                        }
+                            # Créer un dictionnaire des détails de scoring pour le débogage
+                            score_details = {
+                                "formation_matches": {},
+                                "entreprise_matches": {}
+                            }
                         
-                        # Vérifier si les mots "MÉTIER" ou "FORMATION" apparaissent explicitement
-                        # Ce sont des marqueurs très forts utilisés par le site
-                        if "MÉTIER" in card.text or "métier" in card_text:
-                            entreprise_score += 15  # Pondération encore plus forte - indicateur crucial
-                            score_details["entreprise_matches"]["MÉTIER (marqueur explicite)"] = 15
+                            # Vérifier si les mots "MÉTIER" ou "FORMATION" apparaissent explicitement
+                            # Ce sont des marqueurs très forts utilisés par le site
+                            if "MÉTIER" in card.text or "métier" in card_text:
+                                entreprise_score += keywords.explicit_marker_weight
+                                score_details["entreprise_matches"]["MÉTIER (marqueur explicite)"] = keywords.explicit_marker_weight
                         
-                        if "FORMATION" in card.text or "(formation)" in card_text:
-                            formation_score += 15  # Pondération encore plus forte - indicateur crucial
-                            score_details["formation_matches"]["FORMATION (marqueur explicite)"] = 15
+                            if "FORMATION" in card.text or "(formation)" in card_text:
+                                formation_score += keywords.explicit_marker_weight
+                                score_details["formation_matches"]["FORMATION (marqueur explicite)"] = keywords.explicit_marker_weight
                             
-                        # 1. Vérifier les mots-clés forts pour les formations avec pondération élevée
-                        for term in formation_keywords_strong:
-                            if term in card_text:
-                                formation_score += 3  # Pondération forte (3x)
-                                score_details["formation_matches"][f"strong: {term}"] = 3
-                                
-                        # 2. Vérifier les mots-clés secondaires pour les formations
-                        for term in formation_keywords_weak:
-                            if term in card_text:
-                                formation_score += 1  # Pondération standard
-                                score_details["formation_matches"][f"weak: {term}"] = 1
-                                
-                        # 3. Vérifier les mots-clés forts pour les offres d'emploi
-                        for term in entreprise_keywords_strong:
-                            if term in card_text:
-                                entreprise_score += 4  # Pondération très forte (4x) pour compenser le biais
-                                score_details["entreprise_matches"][f"strong: {term}"] = 4
+                            # 1-2. Mots-clés forts (pondération élevée) et secondaires pour les formations
+                            for label, keyword_set in (("strong", keywords.formation_strong), ("weak", keywords.formation_weak)):
+                                for term in keyword_set.terms:
+                                    if term in card_text:
+                                        formation_score += keyword_set.weight
+                                        score_details["formation_matches"][f"{label}: {term}"] = keyword_set.weight
                                 
-                        # 4. Vérifier les mots-clés secondaires pour les offres d'emploi
-                        for term in entreprise_keywords_weak:
-                            if term in card_text:
-                                entreprise_score += 2  # Pondération forte (2x)
-                                score_details["entreprise_matches"][f"weak: {term}"] = 2
+                            # 3-4. Mots-clés forts (pondération renforcée pour compenser le biais) et secondaires pour les offres d'emploi
+                            for label, keyword_set in (("strong", keywords.entreprise_strong), ("weak", keywords.entreprise_weak)):
+                                for term in keyword_set.terms:
+                                    if term in card_text:
+                                        entreprise_score += keyword_set.weight
+                                        score_details["entreprise_matches"][f"{label}: {term}"] = keyword_set.weight
                         
-                        # 5. Détecter les titres d'offres
-                        card_lines = card.text.split('\n')
-                        if len(card_lines) > 1:
-                            first_line = card_lines[0].strip()
-                            # Format typique d'une formation: BTS COMMERCE INTERNATIONAL (titre en majuscules)
-                            if first_line.isupper() and len(first_line) > 5:
-                                # Vérifier les acronymes courants de formation en majuscules
-                                if any(kw in first_line for kw in ["BTS", "MASTER", "LICENCE", "BACHELOR", "CAP", "MBA", "DUT"]):
-                                    formation_score += 8  # Très forte indication d'une formation
-                                    score_details["formation_matches"]["Titre en majuscules avec acronyme de formation"] = 8
+                            # 5. Détecter les titres d'offres
+                            card_lines = card.text.split('\n')
+                            if len(card_lines) > 1:
+                                first_line = card_lines[0].strip()
+                                # Format typique d'une formation: BTS COMMERCE INTERNATIONAL (titre en majuscules)
+                                if first_line.isupper() and len(first_line) > 5:
+                                    # Vérifier les acronymes courants de formation en majuscules
+                                    if any(kw in first_line for kw in keywords.formation_title_acronyms.terms):
+                                        formation_score += keywords.formation_title_acronyms.weight
+                                        score_details["formation_matches"]["Titre en majuscules avec acronyme de formation"] = keywords.formation_title_acronyms.weight
                             
-                            # Format typique d'un intitulé de poste: Commercial, Assistant, etc.
-                            if not first_line.isupper() and len(first_line) > 5:
-                                # Vérifier les termes courants des offres d'emploi
-                                if any(kw in first_line.lower() for kw in ["recrute", "recherche", "cdi", "cdd", "poste"]):
-                                    entreprise_score += 7  # Forte indication d'un poste
-                                    score_details["entreprise_matches"]["Titre avec termes d'emploi"] = 7
+                                # Format typique d'un intitulé de poste: Commercial, Assistant, etc.
+                                if not first_line.isupper() and len(first_line) > 5:
+                                    # Vérifier les termes courants des offres d'emploi
+                                    if any(kw in first_line.lower() for kw in keywords.job_title_terms.terms):
+                                        entreprise_score += keywords.job_title_terms.weight
+                                        score_details["entreprise_matches"]["Titre avec termes d'emploi"] = keywords.job_title_terms.weight
                         
-                        # 6. Analyse spécifique pour La Bonne Alternance
-                        # Sur ce site, les offres de formations contiennent souvent des parenthèses avec le type
-                        if any(pattern in card_text for pattern in ["(bts)", "(bachelor)", "(master)", "(licence)", "(mba)", "(dut)", "(formatives)", "(tp)", "(lp)"]):
-                            formation_score += 10  # Indication très forte d'une formation
-                            score_details["formation_matches"]["Format avec parenthèses typiques des formations"] = 10
+                            # 6. Analyse spécifique pour La Bonne Alternance
+                            # Sur ce site, les offres de formations contiennent souvent des parenthèses avec le type
+                            if any(pattern in card_text for pattern in ["(bts)", "(bachelor)", "(master)", "(licence)", "(mba)", "(dut)", "(formatives)", "(tp)", "(lp)"]):
+                                formation_score += 10  # Indication très forte d'une formation
+                                score_details["formation_matches"]["Format avec parenthèses typiques des formations"] = 10
                             
-                        # 7. Vérification de l'URL si disponible
-                        if link and "/offres/" in link.lower():
-                            entreprise_score += 6  # Les URLs des offres d'emploi contiennent souvent "/offres/"
-                            score_details["entreprise_matches"]["URL contenant /offres/"] = 6
-                        elif link and "/formations/" in link.lower():
-                            formation_score += 6  # Les URLs des formations contiennent souvent "/formations/"
-                            score_details["formation_matches"]["URL contenant /formations/"] = 6
+                            # 7. Vérification de l'URL si disponible
+                            if link and "/offres/" in link.lower():
+                                entreprise_score += 6  # Les URLs des offres d'emploi contiennent souvent "/offres/"
+                                score_details["entreprise_matches"]["URL contenant /offres/"] = 6
+                            elif link and "/formations/" in link.lower():
+                                formation_score += 6  # Les URLs des formations contiennent souvent "/formations/"
+                                score_details["formation_matches"]["URL contenant /formations/"] = 6
                             
-                        # Décision finale basée sur les scores avec une analyse plus raffinée
-                        if formation_score > entreprise_score * 1.2:  # Exige une différence significative pour être classé comme formation
-                            offer_type = "Formation"
-                            decision_reason = "Score formation significativement plus élevé"
-                        elif entreprise_score > formation_score * 1.0:  # Moins strict pour les offres d'emploi
-                            offer_type = "Entreprise"
-                            decision_reason = "Score entreprise plus élevé"
-                        else:
-                            # En cas de scores proches, utiliser des critères de décision supplémentaires
-                            
-                            # Vérifier des marqueurs explicites très spécifiques
-                            if any(marker in card.text for marker in ["UNIVERSIT", "FORMATION", "BTS ", " BTS", "LICENCE", "BACHELOR"]):
-                                offer_type = "Formation" 
-                                decision_reason = "Marqueurs explicites de formation détectés dans un cas ambigu"
-                            elif "MÉTIER" in card.text or any(marker in card_text for marker in ["cdi", "cdd", "recrute", "poste de"]):
+                            # Décision finale basée sur les scores avec une analyse plus raffinée
+                            if formation_score > entreprise_score * 1.2:  # Exige une différence significative pour être classé comme formation
+                                offer_type = "Formation"
+                                decision_reason = "Score formation significativement plus élevé"
+                            elif entreprise_score > formation_score * 1.0:  # Moins strict pour les offres d'emploi
                                 offer_type = "Entreprise"
-                                decision_reason = "Marqueurs explicites d'emploi détectés dans un cas ambigu"
+                                decision_reason = "Score entreprise plus élevé"
                             else:
-                                # Dans le doute absolu, préférer les offres d'emploi comme demandé par l'utilisateur
-                                offer_type = "Entreprise"
-                                decision_reason = "Décision par défaut - favorise les offres d'entreprise"
+                                # En cas de scores proches, utiliser des critères de décision supplémentaires
                             
-                        # Log détaillé pour le débogage
-                        log_detail = f"Carte analysée:\n"
-                        log_detail += f"- Titre: {title[:50]}...\n"
-                        log_detail += f"- Score formation: {formation_score}, détails: {score_details['formation_matches']}\n"
-                        log_detail += f"- Score entreprise: {entreprise_score}, détails: {score_details['entreprise_matches']}\n"
-                        log_detail += f"- Type final: {offer_type} (Raison: {decision_reason})\n"
-                        logger.info(log_detail)
+                                # Vérifier des marqueurs explicites très spécifiques
+                                if any(marker in card.text for marker in ["UNIVERSIT", "FORMATION", "BTS ", " BTS", "LICENCE", "BACHELOR"]):
+                                    offer_type = "Formation" 
+                                    decision_reason = "Marqueurs explicites de formation détectés dans un cas ambigu"
+                                elif "MÉTIER" in card.text or any(marker in card_text for marker in ["cdi", "cdd", "recrute", "poste de"]):
+                                    offer_type = "Entreprise"
+                                    decision_reason = "Marqueurs explicites d'emploi détectés dans un cas ambigu"
+                                else:
+                                    # Dans le doute absolu, préférer les offres d'emploi comme demandé par l'utilisateur
+                                    offer_type = "Entreprise"
+                                    decision_reason = "Décision par défaut - favorise les offres d'entreprise"
+                            
+                            # Log détaillé pour le débogage
+                            log_detail = f"Carte analysée:\n"
+                            log_detail += f"- Titre: {title[:50]}...\n"
+                            log_detail += f"- Score formation: {formation_score}, détails: {score_details['formation_matches']}\n"
+                            log_detail += f"- Score entreprise: {entreprise_score}, détails: {score_details['entreprise_matches']}\n"
+                            log_detail += f"- Type final: {offer_type} (Raison: {decision_reason})\n"
+                            logger.info(log_detail)
                         
-                        # Filtrer uniquement les offres qui ne sont pas des formations
-                        if offer_type == "Formation":
-                            # Enregistrer le détail de la formation ignorée pour débogage
-                            text_clean = card.text.replace('\n', ' ')
-                            logger.info(f"Formation ignorée: {text_clean[:100]}")
-                            continue
+                            # Filtrer uniquement les offres qui ne sont pas des formations
+                            if offer_type == "Formation":
+                                # Enregistrer le détail de la formation ignorée pour débogage
+                                text_clean = card.text.replace('\n', ' ')
+                                logger.info("Formation ignorée: %s", text_clean[:100])
+                                continue
                         
-                        # Créer un dictionnaire avec les informations de l'offre
-                        job_offer = {
-                            "title": title,
-                            "company": company,
-                            "location": location,
-                            "link": link,
-                            "type": offer_type,
-                            "source": "La bonne alternance",
-                            "postulation_status": "non_postulé"  # Statut initial
-                        }
+                            # Créer l'enregistrement compact de l'offre (statut initial: non postulé)
+                            job_offer = Offer(title, company, location, link, offer_type, SOURCE_LBA)
                         
-                        # --- Bloc de postulation automatique robuste pour La Bonne Alternance ---
-                        if link and AUTO_POSTULER:
-                            logger.info(f"Tentative de postulation automatique pour: {title} chez {company}")
-                            current_url = driver.current_url
-                            current_handles = driver.window_handles
-                            main_handle = driver.current_window_handle
-                            driver.execute_script("window.open(arguments[0], '_blank');", link)
-                            time.sleep(2)
-                            new_handles = [handle for handle in driver.window_handles if handle != main_handle]
-                            if new_handles:
-                                driver.switch_to.window(new_handles[0])
-                                # Vérifier si l'offre redirige vers un site externe (HelloWork, Meteojob, etc.)
-                                external_domains = ["hellowork.com", "meteojob.com", "jobteaser.com", "apec.fr"]
+                            # --- Bloc de postulation automatique robuste pour La Bonne Alternance ---
+                            if link and postuler:
+                                logger.info("Tentative de postulation automatique pour: %s chez %s", title, company)
                                 current_url = driver.current_url
-                                if any(domain in current_url for domain in external_domains):
-                                    logger.info(f"Redirection externe détectée ({current_url}), on passe à l'offre suivante via le bouton 'next'.")
-                                    if driver.current_window_handle != main_handle:
-                                        driver.close()
-                                        driver.switch_to.window(main_handle)
+                                current_handles = driver.window_handles
+                                main_handle = driver.current_window_handle
+                                driver.execute_script("window.open(arguments[0], '_blank');", link)
+                                time.sleep(2)
+                                new_handles = [handle for handle in driver.window_handles if handle != main_handle]
+                                if new_handles:
+                                    driver.switch_to.window(new_handles[0])
+                                    # Vérifier si l'offre redirige vers un site externe (HelloWork, Meteojob, etc.)
+                                    current_url = driver.current_url
+                                    if any(domain in current_url for domain in SITE_PROFILE.results.external_domains):
+                                        logger.info("Redirection externe détectée (%s), on passe à l'offre suivante via le bouton 'next'.", current_url)
+                                        if driver.current_window_handle != main_handle:
+                                            driver.close()
+                                            driver.switch_to.window(main_handle)
+                                        results_frame.reenter()
+                                        try:
+                                            next_btn = driver.find_element(By.CSS_SELECTOR, "button[data-testid='next-button']")
+                                            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_btn)
+                                            time.sleep(0.5)
+                                            next_btn.click()
+                                            logger.info("Bouton 'next' cliqué pour passer à l'offre suivante.")
+                                            time.sleep(2)
+                                        except Exception as e:
+                                            logger.warning("Impossible de cliquer sur le bouton 'next' : %s", e)
+                                        continue
                                     try:
-                                        next_btn = driver.find_element(By.CSS_SELECTOR, "button[data-testid='next-button']")
-                                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_btn)
-                                        time.sleep(0.5)
-                                        next_btn.click()
-                                        logger.info("Bouton 'next' cliqué pour passer à l'offre suivante.")
+                                        wait = WebDriverWait(driver, 20)
+                                        # 1. Clic sur le premier bouton "J'envoie ma candidature"
+                                        logger.info("Recherche du bouton 'J'envoie ma candidature' (postuler-button)...")
+                                        postuler_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'div[data-testid="CandidatureSpontanee"] button[data-testid="postuler-button"]')))
+                                        postuler_btn.click()
+                                        logger.info("Bouton 'J'envoie ma candidature' cliqué.")
+                                        # 2. Attendre l'apparition du formulaire modal
+                                        logger.info("Attente de l'apparition du formulaire modal...")
+                                        wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, 'section.chakra-modal__content[role="dialog"] form[data-sentry-component="CandidatureLbaModalBody"]')))
+                                        # 3. Remplir les champs obligatoires
+                                        logger.info("Remplissage des champs du formulaire...")
+                                        driver.find_element(By.CSS_SELECTOR, 'input[data-testid="lastName"]').clear()
+                                        driver.find_element(By.CSS_SELECTOR, 'input[data-testid="lastName"]').send_keys("DUPONT")
+                                        driver.find_element(By.CSS_SELECTOR, 'input[data-testid="firstName"]').clear()
+                                        driver.find_element(By.CSS_SELECTOR, 'input[data-testid="firstName"]').send_keys("Jean")
+                                        driver.find_element(By.CSS_SELECTOR, 'input[data-testid="email"]').clear()
+                                        driver.find_element(By.CSS_SELECTOR, 'input[data-testid="email"]').send_keys("silasiharis@gmail.com")
+                                        driver.find_element(By.CSS_SELECTOR, 'input[data-testid="phone"]').clear()
+                                        driver.find_element(By.CSS_SELECTOR, 'input[data-testid="phone"]').send_keys("0601020304")
+                                        driver.find_element(By.CSS_SELECTOR, 'textarea[data-testid="message"]').clear()
+                                        driver.find_element(By.CSS_SELECTOR, 'textarea[data-testid="message"]').send_keys("Je suis très motivé par cette alternance.")
+                                        # 4. Upload du CV (validé une fois par session par le registre de documents)
+                                        cv_path = DocumentRegistry.for_user(user_data).cv
+                                        if not cv_path:
+                                            logger.error("Le fichier CV est manquant ou invalide, annulation de la candidature.")
+                                            driver.save_screenshot("debug_screenshots/cv_missing_or_empty.png")
+                                            driver.close()
+                                            driver.switch_to.window(main_handle)
+                                            continue
+                                        cv_input = driver.find_element(By.CSS_SELECTOR, 'div[data-testid="fileDropzone"] input[type="file"]')
+                                        cv_input.send_keys(cv_path)
+                                        logger.info("CV uploadé avec succès.")
                                         time.sleep(2)
-                                    except Exception as e:
-                                        logger.warning(f"Impossible de cliquer sur le bouton 'next' : {e}")
-                                    continue
-                                try:
-                                    wait = WebDriverWait(driver, 20)
-                                    # 1. Clic sur le premier bouton "J'envoie ma candidature"
-                                    logger.info("Recherche du bouton 'J'envoie ma candidature' (postuler-button)...")
-                                    postuler_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'div[data-testid="CandidatureSpontanee"] button[data-testid="postuler-button"]')))
-                                    postuler_btn.click()
-                                    logger.info("Bouton 'J'envoie ma candidature' cliqué.")
-                                    # 2. Attendre l'apparition du formulaire modal
-                                    logger.info("Attente de l'apparition du formulaire modal...")
-                                    wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, 'section.chakra-modal__content[role="dialog"] form[data-sentry-component="CandidatureLbaModalBody"]')))
-                                    # 3. Remplir les champs obligatoires
-                                    logger.info("Remplissage des champs du formulaire...")
-                                    driver.find_element(By.CSS_SELECTOR, 'input[data-testid="lastName"]').clear()
-                                    driver.find_element(By.CSS_SELECTOR, 'input[data-testid="lastName"]').send_keys("DUPONT")
-                                    driver.find_element(By.CSS_SELECTOR, 'input[data-testid="firstName"]').clear()
-                                    driver.find_element(By.CSS_SELECTOR, 'input[data-testid="firstName"]').send_keys("Jean")
-                                    driver.find_element(By.CSS_SELECTOR, 'input[data-testid="email"]').clear()
-                                    driver.find_element(By.CSS_SELECTOR, 'input[data-testid="email"]').send_keys("silasiharis@gmail.com")
-                                    driver.find_element(By.CSS_SELECTOR, 'input[data-testid="phone"]').clear()
-                                    driver.find_element(By.CSS_SELECTOR, 'input[data-testid="phone"]').send_keys("0601020304")
-                                    driver.find_element(By.CSS_SELECTOR, 'textarea[data-testid="message"]').clear()
-                                    driver.find_element(By.CSS_SELECTOR, 'textarea[data-testid="message"]').send_keys("Je suis très motivé par cette alternance.")
-                                    # 4. Upload du CV (s'assurer que le fichier n'est pas vide !)
-                                    cv_path = "/Users/davidravin/Desktop/floup.pdf"  # CV réel de l'utilisateur
-                                    if not os.path.exists(cv_path) or os.path.getsize(cv_path) == 0:
-                                        logger.error("Le fichier CV est manquant ou vide, annulation de la candidature.")
-                                        driver.save_screenshot("debug_screenshots/cv_missing_or_empty.png")
+                                        # 4.1 Cocher toutes les cases à cocher (checklist anti-bot)
+                                        checkboxes = driver.find_elements(By.CSS_SELECTOR, "input[type='checkbox']")
+                                        for checkbox in checkboxes:
+                                            try:
+                                                if checkbox.is_displayed() and not checkbox.is_selected():
+                                                    driver.execute_script("arguments[0].click();", checkbox)
+                                                    logger.info("Checkbox cochée (anti-bot)")
+                                            except Exception as e:
+                                                logger.warning("Impossible de cocher une checkbox: %s", e)
+                                        # 5. Clic sur le bouton final d'envoi
+                                        logger.info("Recherche du bouton final 'J'envoie ma candidature' (candidature-not-sent)...")
+                                        final_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[data-testid="candidature-not-sent"][type="submit"]')))
+                                        # La page est suivie dès avant le clic : on repart dès la réponse du serveur
+                                        watch = SubmissionWatch(driver).arm()
+                                        final_btn.click()
+                                        envoi = watch.wait()
+                                        log_submission(envoi, title)
+                                        if envoi.confirmed:
+                                            job_offer.set_status(STATUT_SUCCES)
+                                        elif envoi.outcome == REJECTED:
+                                            job_offer.set_status(STATUT_ECHEC)
+                                        else:
+                                            job_offer.set_status(STATUT_SOUMIS)
                                         driver.close()
                                         driver.switch_to.window(main_handle)
-                                        continue
-                                    cv_input = driver.find_element(By.CSS_SELECTOR, 'div[data-testid="fileDropzone"] input[type="file"]')
-                                    cv_input.send_keys(cv_path)
-                                    logger.info("CV uploadé avec succès.")
-                                    time.sleep(2)
-                                    # 4.1 Cocher toutes les cases à cocher (checklist anti-bot)
-                                    checkboxes = driver.find_elements(By.CSS_SELECTOR, "input[type='checkbox']")
-                                    for checkbox in checkboxes:
-                                        try:
-                                            if checkbox.is_displayed() and not checkbox.is_selected():
-                                                driver.execute_script("arguments[0].click();", checkbox)
-                                                logger.info("Checkbox cochée (anti-bot)")
-                                        except Exception as e:
-                                            logger.warning(f"Impossible de cocher une checkbox: {e}")
-                                    # 5. Clic sur le bouton final d'envoi
-                                    logger.info("Recherche du bouton final 'J'envoie ma candidature' (candidature-not-sent)...")
-                                    final_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[data-testid="candidature-not-sent"][type="submit"]')))
-                                    time.sleep(7)
-                                    final_btn.click()
-                                    logger.info("Candidature envoyée avec succès.")
-                                      # Pause pour laisser le site traiter la soumission
-                                    time.sleep(15)
-                                    driver.close()
-                                    driver.switch_to.window(main_handle)
-                                except Exception as e:
-                                    logger.error(f"Erreur lors de la postulation automatique : {e}")
+                                    except Exception as e:
+                                        logger.error("Erreur lors de la postulation automatique : %s", e)
                                 
                                     
-                            switch_to_iframe_if_needed(driver)
+                                results_frame.reenter()
                         
-                        job_offers.append(job_offer)
-                        logger.info(f"Offre {index+1} ajoutée: {title} chez {company} à {location} ({offer_type}) - Statut postulation: {job_offer['postulation_status']}")
+                            job_offers.append(job_offer)
+                            if on_offer:
+                                on_offer(job_offer, index)
+                            logger.info("Offre %s ajoutée: %s chez %s à %s (%s) - Statut postulation: %s", index+1, title, company, location, offer_type, job_offer.status)
                         
-                    except Exception as e:
-                        logger.error(f"Erreur lors de l'extraction des données de la carte {index}: {e}", exc_info=True)
-                
-                # Revenir au contexte principal
-                driver.switch_to.default_content()
+                        except Exception as e:
+                            logger.error("Erreur lors de l'extraction des données de la carte %s: %s", index, e, exc_info=True)
+
                 logger.info("Retour au contexte principal après traitement de l'iframe")
                 
                 # Afficher le résumé des offres trouvées
-                logger.info(f"Total des offres extraites depuis La bonne alternance: {len(job_offers)}")
+                logger.info("Total des offres extraites depuis La bonne alternance: %s", len(job_offers))
                 
                 # Si des offres ont été trouvées, les retourner directement
                 if job_offers:
                     return job_offers
                     
             except Exception as e:
-                logger.error(f"Erreur lors du traitement de l'iframe La bonne alternance: {e}")
-                driver.switch_to.default_content()  # S'assurer de revenir au contexte principal
+                logger.error("Erreur lors du traitement de l'iframe La bonne alternance: %s", e)
+                iframe_error = e
 
         # Si on n'a pas pu extraire depuis l'iframe, essayer la méthode classique
+        # ([] pour une page sans résultat, None si la page n'a pas pu être analysée)
         logger.info("Analyse des résultats via la méthode classique...")
-        return parse_results(driver.page_source)
+        job_offers = parse_results(driver.page_source)
+        if not job_offers and iframe_error is not None:
+            # L'iframe n'a pas pu être lue : ce n'est pas une recherche sans résultat
+            return None
+        if job_offers and on_offer:
+            for index, job_offer in enumerate(job_offers):
+                if index >= start_index:
+                    on_offer(job_offer, index)
+        return job_offers
 
     except Exception as e:
-        logger.error(f"Une erreur est survenue dans run_scraper: {e}", exc_info=True)
+        logger.error("Une erreur est survenue dans run_scraper: %s", e, exc_info=True)
         if driver:
             timestamp = int(time.time())
             driver.save_screenshot(f'error_screenshot_{timestamp}.png')
             with open(f'error_page_{timestamp}.html', 'w', encoding='utf-8') as f:
                 f.write(driver.page_source)
-            logger.info(f"Screenshot et source de la page sauvegardés.")
+            logger.info("Screenshot et source de la page sauvegardés.")
     finally:
         if driver:
+            try:
+                driver.switch_to.default_content()
+                state_store.save(driver)
+            except Exception as e:
+                logger.warning("Sauvegarde de l'état navigateur impossible: %s", e)
             driver.quit()
             logger.info("WebDriver fermé.")
+        if chrome_profile:
+            chrome_profile.release()
 
 def parse_results(html_content):
-    """Parse la page de résultats pour en extraire les offres."""
+    """
+    Parse la page de résultats pour en extraire les offres.
+    Renvoie la liste des offres ([] si la page n'a aucun résultat), None en cas d'échec.
+    """
     try:
+        from bs4 import BeautifulSoup  # import différé, seul le repli HTML en a besoin
         soup = BeautifulSoup(html_content, 'html.parser')
         
         # Le conteneur principal des résultats
@@ -1989,7 +1616,7 @@ def parse_results(html_content):
             results_container = soup.find('body')
             if not results_container:
                 logger.error("Le corps du document est vide. Impossible de continuer.")
-                return
+                return None
             logger.warning("Conteneur 'result-list-content' non trouvé, recherche des cartes sur toute la page.")
 
         # Les offres sont des div avec la classe 'fr-card'
@@ -1997,11 +1624,11 @@ def parse_results(html_content):
         
         if not job_offers:
             logger.warning("Aucune offre d'emploi trouvée avec le sélecteur 'div.fr-card'. Le site a peut-être changé ou il n'y a pas de résultats pour cette recherche.")
-            return
+            return []
 
-        logger.info(f"{len(job_offers)} offres trouvées. Début de l'extraction...")
+        logger.info("%s offres trouvées. Début de l'extraction...", len(job_offers))
         base_url = "https://www.alternance.emploi.gouv.fr"
-        extracted_count = 0
+        extracted = []
 
         for offer in job_offers:
             title_element = offer.find(['h3', 'h4'], class_='fr-card__title')
@@ -2024,25 +1651,27 @@ def parse_results(html_content):
             if link.startswith('/'):
                 link = f"{base_url}{link}"
             
-            extracted_count += 1
+            extracted.append(Offer(title, company, location, link, source=SOURCE_ALTERNANCE_GOUV))
             logger.info("--- Offre --- ")
-            logger.info(f"Titre: {title}")
-            logger.info(f"Entreprise: {company}")
-            logger.info(f"Lieu: {location}")
-            logger.info(f"Lien: {link}")
+            logger.info("Titre: %s", title)
+            logger.info("Entreprise: %s", company)
+            logger.info("Lieu: %s", location)
+            logger.info("Lien: %s", link)
         
-        if extracted_count == 0:
+        if not extracted:
             logger.warning("Aucune offre valide n'a pu être extraite des cartes trouvées.")
+        return extracted
 
     except Exception as e:
-        logger.error(f"Erreur lors de l'analyse des résultats: {e}", exc_info=True)
+        logger.error("Erreur lors de l'analyse des résultats: %s", e, exc_info=True)
+        return None
 
 def main():
     user_email = 'test@gmail.com' # Email par défaut pour le test
     if len(sys.argv) > 1 and sys.argv[1] != 'test@gmail.com':
         user_email = sys.argv[1]
     
-    logger.info(f"Recherche de l'utilisateur : {user_email}")
+    logger.info("Recherche de l'utilisateur : %s", user_email)
     
     # Essayer de charger la configuration depuis le frontend
     user_data = load_frontend_config()
@@ -2052,7 +1681,7 @@ def main():
         logger.info("Configuration frontend non disponible, utilisation des données par défaut")
         user_data = {'email': user_email, 'search_query': 'Commercial', 'location': 'Lyon'}
     else:
-        logger.info(f"Configuration chargée depuis le frontend : {user_data['prenom']} {user_data['nom']}")
+        logger.info("Configuration chargée depuis le frontend : %s %s", user_data['prenom'], user_data['nom'])
         # Ajouter l'email de la ligne de commande si fourni
         if user_email != 'test@gmail.com':
             user_data['email'] = user_email
@@ -2060,7 +1689,7 @@ def main():
     if user_data:
         run_scraper(user_data)
     else:
-        logger.error(f"Aucune donnée utilisateur disponible pour lancer le scraper.")
+        logger.error("Aucune donnée utilisateur disponible pour lancer le scraper.")
 
 def setup_and_run():
     """Fonction principale pour configurer les paramètres et lancer le scraper"""
@@ -2121,10 +1750,8 @@ def setup_and_run():
             postuler_functions.CHEMIN_CV = os.path.expanduser(args.cv)
     
     # Afficher la configuration
-    logger.info(f"Configuration: Postulation automatique = {AUTO_POSTULER}, "
-              f"Remplissage auto = {args.remplir}, "
-              f"Envoi auto = {args.envoyer}, "
-              f"Pause inspection = {PAUSE_APRES_POSTULATION}")
+    logger.info("Configuration: Postulation automatique = %s, Remplissage auto = %s, Envoi auto = %s, "
+                "Pause inspection = %s", AUTO_POSTULER, args.remplir, args.envoyer, PAUSE_APRES_POSTULATION)
     
     # Créer un objet user_data à partir des arguments de ligne de commande
     if args.email or args.metier or args.ville:
@@ -2147,4 +1774,7 @@ def setup_and_run():
         main()
 
 if __name__ == "__main__":
+    # Ajout du chemin racine du projet pour permettre les imports
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+    configure_logging()
     setup_and_run()
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""
+Issue d'une candidature : taxonomie commune à la postulation, au scraper et au runner.
+
+Chaque étape de la postulation se termine par une ``Outcome`` plutôt que par un
+texte libre. Une issue porte :
+
+- sa politique de reprise : ``DONE`` (rien à refaire), ``RETRY`` (échec passager
+  survenu avant tout envoi : l'offre est remise en file), ``REVIEW`` (le formulaire a
+  pu partir mais l'issue est inconnue : jamais renvoyé automatiquement, pour ne pas
+  postuler deux fois, et signalé pour vérification manuelle) ou ``PERMANENT`` (l'offre
+  ne sera jamais postulable : l'issue est mise dans le cache des issues et jamais
+  retentée) ;
+- la valeur de la colonne ``applications.status`` de shared/schema.ts ;
+- le statut historique (``soumis``, ``ignoré``, ``echec``...) encore lu par les appelants
+  qui testent ``result["status"]``.
+
+``resultat(outcome, raison, **extra)`` construit le dictionnaire renvoyé par
+``postuler_offre`` ; ``outcome_of(resultat)`` relit l'issue d'un résultat, y compris
+d'un ancien dictionnaire sans clé ``outcome``.
+"""
+
+from enum import Enum
+
+from offer_record import (STATUT_SOUMIS, STATUT_IGNORE, STATUT_ECHEC, STATUT_ERREUR,
+                          STATUT_NON_POSTULE)
+from submission_watch import CONFIRMED, REJECTED
+
+
+class RetryPolicy(Enum):
+    DONE = "done"
+    RETRY = "retry"
+    REVIEW = "review"
+    PERMANENT = "permanent"
+
+
+class Outcome(str, Enum):
+    # Envoyées (ou prêtes à l'envoi manuel)
+    SUBMITTED = "submitted"
+    SUBMITTED_UNCONFIRMED = "submitted_unconfirmed"
+    FORM_FILLED = "form_filled"
+    # Offres jamais postulables
+    NO_CONTACT = "no_contact"
+    EXTERNAL_REDIRECT = "external_redirect"
+    SUBMIT_REJECTED = "submit_rejected"
+    MISSING_URL = "missing_url"
+    # Échecs passagers, avant tout envoi
+    APPLY_BUTTON_NOT_FOUND = "apply_button_not_found"
+    FORM_NOT_FOUND = "form_not_found"
+    UPLOAD_FAILED = "upload_failed"
+    SEND_BUTTON_NOT_FOUND = "send_button_not_found"
+    PAGE_ERROR_BEFORE_SUBMIT = "page_error_before_submit"
+    # Envois peut-être partis, à vérifier
+    SUBMIT_TIMEOUT = "submit_timeout"
+    SERVER_ERROR = "server_error"
+    PAGE_ERROR = "page_error"
+    DRIVER_CRASH = "driver_crash"
+
+    @property
+    def policy(self):
+        return _POLICIES[self]
+
+    @property
+    def succeeded(self):
+        """Candidature effectivement envoyée."""
+        return self in (Outcome.SUBMITTED, Outcome.SUBMITTED_UNCONFIRMED)
+
+    @property
+    def skipped(self):
+        """Offre écartée d'emblée (rien n'a été tenté ni envoyé)."""
+        return self in (Outcome.NO_CONTACT, Outcome.EXTERNAL_REDIRECT, Outcome.MISSING_URL)
+
+    @property
+    def sent(self):
+        """Le formulaire a été soumis au site (qu'il ait été accepté ou non)."""
+        return self not in _NOT_SENT
+
+    @property
+    def retryable(self):
+        """Échec passager qu'on peut retenter sans risque de double envoi."""
+        return self.policy is RetryPolicy.RETRY and not self.sent
+
+    @property
+    def needs_review(self):
+        """Le formulaire a pu être envoyé sans qu'on sache s'il a été reçu."""
+        return self.policy is RetryPolicy.REVIEW
+
+    @property
+    def permanent(self):
+        return self.policy is RetryPolicy.PERMANENT
+
+    @property
+    def application_status(self):
+        """Valeur de applications.status ('sent', 'pending' ou 'failed')."""
+        if self.succeeded:
+            return "sent"
+        return "pending" if self is Outcome.FORM_FILLED else "failed"
+
+    @property
+    def label(self):
+        return _LABELS[self]
+
+
+_POLICIES = {
+    Outcome.SUBMITTED: RetryPolicy.DONE,
+    Outcome.SUBMITTED_UNCONFIRMED: RetryPolicy.DONE,
+    Outcome.FORM_FILLED: RetryPolicy.DONE,
+    Outcome.NO_CONTACT: RetryPolicy.PERMANENT,
+    Outcome.EXTERNAL_REDIRECT: RetryPolicy.PERMANENT,
+    Outcome.SUBMIT_REJECTED: RetryPolicy.PERMANENT,
+    Outcome.MISSING_URL: RetryPolicy.PERMANENT,
+    Outcome.APPLY_BUTTON_NOT_FOUND: RetryPolicy.RETRY,
+    Outcome.FORM_NOT_FOUND: RetryPolicy.RETRY,
+    Outcome.UPLOAD_FAILED: RetryPolicy.RETRY,
+    Outcome.SEND_BUTTON_NOT_FOUND: RetryPolicy.RETRY,
+    Outcome.PAGE_ERROR_BEFORE_SUBMIT: RetryPolicy.RETRY,
+    Outcome.SUBMIT_TIMEOUT: RetryPolicy.REVIEW,
+    Outcome.SERVER_ERROR: RetryPolicy.REVIEW,
+    Outcome.PAGE_ERROR: RetryPolicy.REVIEW,
+    Outcome.DRIVER_CRASH: RetryPolicy.REVIEW,
+}
+
+# Issues atteintes avant toute soumission du formulaire
+_NOT_SENT = frozenset({
+    Outcome.FORM_FILLED, Outcome.NO_CONTACT, Outcome.EXTERNAL_REDIRECT, Outcome.MISSING_URL,
+    Outcome.APPLY_BUTTON_NOT_FOUND, Outcome.FORM_NOT_FOUND, Outcome.UPLOAD_FAILED, Outcome.SEND_BUTTON_NOT_FOUND,
+    Outcome.PAGE_ERROR_BEFORE_SUBMIT,
+})
+
+_LABELS = {
+    Outcome.SUBMITTED: "Candidature envoyée",
+    Outcome.SUBMITTED_UNCONFIRMED: "Candidature envoyée sans confirmation",
+    Outcome.FORM_FILLED: "Formulaire rempli, envoi manuel",
+    Outcome.NO_CONTACT: "Candidature spontanée sans contact direct",
+    Outcome.EXTERNAL_REDIRECT: "Redirection vers un site externe",
+    Outcome.SUBMIT_REJECTED: "Envoi refusé par le site",
+    Outcome.MISSING_URL: "URL de l'offre manquante",
+    Outcome.APPLY_BUTTON_NOT_FOUND: "Bouton de candidature introuvable",
+    Outcome.FORM_NOT_FOUND: "Formulaire de candidature introuvable",
+    Outcome.UPLOAD_FAILED: "Envoi du CV impossible",
+    Outcome.SEND_BUTTON_NOT_FOUND: "Bouton d'envoi introuvable",
+    Outcome.PAGE_ERROR_BEFORE_SUBMIT: "Erreur de page avant l'envoi",
+    Outcome.SUBMIT_TIMEOUT: "Soumission du formulaire interrompue",
+    Outcome.SERVER_ERROR: "Erreur du serveur à l'envoi",
+    Outcome.PAGE_ERROR: "Erreur pendant l'envoi, issue inconnue",
+    Outcome.DRIVER_CRASH: "Navigateur perdu pendant la candidature",
+}
+
+# Statut historique ("status" des dictionnaires de résultat) de chaque issue
+_STATUTS = {
+    Outcome.SUBMITTED: STATUT_SOUMIS,
+    Outcome.SUBMITTED_UNCONFIRMED: STATUT_SOUMIS,
+    Outcome.FORM_FILLED: "formulaire_rempli",
+    Outcome.NO_CONTACT: STATUT_IGNORE,
+    Outcome.EXTERNAL_REDIRECT: STATUT_IGNORE,
+    Outcome.MISSING_URL: STATUT_IGNORE,
+    Outcome.PAGE_ERROR_BEFORE_SUBMIT: STATUT_ERREUR,
+    Outcome.PAGE_ERROR: STATUT_ERREUR,
+    Outcome.DRIVER_CRASH: STATUT_ERREUR,
+}
+
+# Classifications d'OfferPrefetcher (pages écartées avant toute candidature)
+CLASSIFICATIONS = {
+    "no_contact": Outcome.NO_CONTACT,
+    "external": Outcome.EXTERNAL_REDIRECT,
+}
+
+
+def outcome_for_http(status):
+    """
+    Issue d'une réponse HTTP à l'envoi : 429, 5xx et 0 (requête interrompue) laissent l'envoi
+    incertain, les autres 4xx sont des refus définitifs.
+    """
+    if 200 <= status < 400:
+        return Outcome.SUBMITTED
+    if status == 429 or status >= 500 or status == 0:
+        return Outcome.SERVER_ERROR
+    return Outcome.SUBMIT_REJECTED
+
+
+def resultat(outcome, raison="", **extra):
+    """Dictionnaire de résultat d'une postulation pour une issue."""
+    result = {"status": _STATUTS.get(outcome, STATUT_ECHEC), "outcome": outcome}
+    if raison or not outcome.succeeded:
+        result["raison"] = raison or outcome.label
+    result.update(extra)
+    return result
+
+
+def outcome_of(result):
+    """
+    Issue d'un résultat de postulation : dictionnaire (avec ou sans clé ``outcome``),
+    booléen (simulation) ou None.
+    """
+    if isinstance(result, dict):
+        outcome = result.get("outcome")
+        if outcome:
+            return Outcome(outcome)
+        status = result.get("status")
+        if status == STATUT_IGNORE:
+            raison = str(result.get("raison", "")).lower()
+            return Outcome.EXTERNAL_REDIRECT if "externe" in raison else Outcome.NO_CONTACT
+        if status in (STATUT_SOUMIS, "succes", "success"):
+            return Outcome.SUBMITTED
+        if status == "formulaire_rempli":
+            return Outcome.FORM_FILLED if result.get("soumission") == "en_attente" else Outcome.SUBMIT_TIMEOUT
+        if status == STATUT_NON_POSTULE:
+            return Outcome.FORM_FILLED
+        return Outcome.PAGE_ERROR
+    return Outcome.SUBMITTED if result else Outcome.PAGE_ERROR
+
+
+def outcome_for_submission(envoi):
+    """Issue d'un envoi suivi par SubmissionWatch (code HTTP, sinon message de la page)."""
+    if envoi.http_status:
+        return outcome_for_http(envoi.http_status)
+    if envoi.outcome == CONFIRMED:
+        return Outcome.SUBMITTED
+    if envoi.outcome == REJECTED:
+        return Outcome.SUBMIT_REJECTED
+    return Outcome.SUBMITTED_UNCONFIRMED
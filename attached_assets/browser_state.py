@@ -0,0 +1,163 @@
+"""
+Persistance des cookies et du localStorage entre deux exécutions.
+
+Le jar de cookies (tous domaines, via CDP) et le localStorage de
+alternance.emploi.gouv.fr et de labonnealternance sont sauvegardés par profil de
+worker, puis réinjectés au démarrage du driver : la bannière de consentement
+tarteaucitron ne réapparaît plus et il n'est plus nécessaire de l'attendre.
+L'état est invalidé automatiquement s'il est trop ancien, d'une version de
+format différente, ou si la bannière réapparaît malgré l'injection.
+
+Le jar contient les cookies de session : le répertoire est créé en 0700 et les
+fichiers en 0600, et le nom de profil est réduit à un identifiant sûr avant de
+servir de nom de fichier.
+"""
+
+import os
+import re
+import json
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATE_DIR = "browser_state"
+STATE_VERSION = 1
+MAX_AGE = 7 * 24 * 3600  # une semaine
+
+# Réinjecte le localStorage sauvegardé dans chaque document (frames comprises) avant ses propres scripts
+LOCAL_STORAGE_INJECTION = """
+(function() {
+    var saved = %s;
+    var items = saved[window.location.origin];
+    if (!items) return;
+    try {
+        for (var key in items) {
+            if (window.localStorage.getItem(key) === null) {
+                window.localStorage.setItem(key, items[key]);
+            }
+        }
+    } catch (e) {}
+})();
+"""
+
+READ_LOCAL_STORAGE = """
+var items = {};
+try {
+    for (var i = 0; i < window.localStorage.length; i++) {
+        var key = window.localStorage.key(i);
+        items[key] = window.localStorage.getItem(key);
+    }
+} catch (e) {}
+return [window.location.origin, items];
+"""
+
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+def profile_slug(name):
+    """Nom de profil utilisable comme nom de fichier : lettres, chiffres, '-' et '_' (pas de '../')."""
+    return _UNSAFE.sub("-", str(name or "")).strip("-")[:64] or "default"
+
+
+def worker_profile(user_data=None):
+    """Nom du profil de worker : réglage workerProfile, puis $AUTOMATION_WORKER_PROFILE, puis 'default'."""
+    settings = (user_data or {}).get("settings") or {}
+    return profile_slug(settings.get("workerProfile") or os.environ.get("AUTOMATION_WORKER_PROFILE"))
+
+
+class BrowserStateStore:
+    """État navigateur (cookies + localStorage) d'un profil de worker."""
+
+    def __init__(self, profile="default", directory=STATE_DIR, max_age=MAX_AGE):
+        self.profile = profile_slug(profile)
+        self.path = os.path.join(directory, f"{self.profile}.json")
+        self.max_age = max_age
+        self.loaded = False
+        self._cookies = []
+        self._local_storage = {}
+
+    def _read(self):
+        """Lit l'état sauvegardé, ou None s'il est absent ou périmé."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("État navigateur illisible (%s): %s", self.path, e)
+            self.invalidate()
+            return None
+        if state.get("version") != STATE_VERSION or time.time() - state.get("saved_at", 0) > self.max_age:
+            logger.info("État navigateur périmé pour le profil '%s', il sera recréé", self.profile)
+            self.invalidate()
+            return None
+        now = time.time()
+        # Les cookies expirés sont écartés (expires <= 0 : cookie de session, conservé)
+        state["cookies"] = [c for c in state.get("cookies", []) if c.get("expires", -1) <= 0 or c["expires"] > now]
+        return state
+
+    def inject(self, driver):
+        """Injecte cookies et localStorage dans un driver fraîchement créé. Renvoie True si un état a été chargé."""
+        state = self._read()
+        if not state:
+            return False
+        self._cookies = state.get("cookies", [])
+        self._local_storage = state.get("local_storage", {})
+        try:
+            if self._cookies:
+                driver.execute_cdp_cmd("Network.setCookies", {"cookies": self._cookies})
+            if self._local_storage:
+                source = LOCAL_STORAGE_INJECTION % json.dumps(self._local_storage)
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+        except Exception as e:
+            logger.warning("Injection de l'état navigateur impossible: %s", e)
+            return False
+        self.loaded = True
+        logger.info("État navigateur du profil '%s' injecté (%d cookies, %d origines localStorage)",
+                    self.profile, len(self._cookies), len(self._local_storage))
+        return True
+
+    def capture_local_storage(self, driver):
+        """Mémorise le localStorage du contexte courant (page principale ou iframe)."""
+        try:
+            origin, items = driver.execute_script(READ_LOCAL_STORAGE)
+            if origin and origin != "null":
+                self._local_storage[origin] = items
+        except Exception as e:
+            logger.debug("Lecture du localStorage impossible: %s", e)
+
+    def save(self, driver):
+        """Sauvegarde le jar de cookies complet et le localStorage capturé."""
+        try:
+            self._cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        except Exception as e:
+            logger.debug("Lecture des cookies via CDP impossible: %s", e)
+            try:
+                self._cookies = driver.get_cookies()
+            except Exception:
+                return
+        self.capture_local_storage(driver)
+        os.makedirs(os.path.dirname(self.path) or ".", mode=0o700, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": STATE_VERSION,
+                "saved_at": time.time(),
+                "cookies": self._cookies,
+                "local_storage": self._local_storage,
+            }, f)
+        os.replace(tmp_path, self.path)
+        logger.info("État navigateur sauvegardé pour le profil '%s'", self.profile)
+
+    def invalidate(self):
+        """Supprime l'état sauvegardé (il sera recréé à la prochaine sauvegarde)."""
+        self.loaded = False
+        self._cookies = []
+        self._local_storage = {}
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,164 @@
+"""
+Profils Chrome persistants (user-data-dir) par emplacement de worker.
+
+Un profil jetable oblige chaque exécution à retélécharger les bundles React, les
+polices et les ressources de l'iframe labonnealternance. Chaque worker réserve ici
+un répertoire de profil sur disque (chrome_profiles/<profil>-<n>), verrouillé pour
+que deux workers ne partagent jamais le même : Chrome refuse d'ouvrir un
+user-data-dir déjà utilisé. Le cache disque est plafonné par --disk-cache-size et
+le profil est compacté (caches purgés) lorsqu'il dépasse son budget ou après un
+certain nombre d'exécutions.
+"""
+
+import os
+import time
+import shutil
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+PROFILES_DIR = "chrome_profiles"
+MAX_SLOTS = 8
+DISK_CACHE_SIZE = 200 * 1024 * 1024   # plafond passé à Chrome (--disk-cache-size)
+MAX_PROFILE_SIZE = 500 * 1024 * 1024  # au-delà, le profil est compacté au démarrage
+COMPACT_EVERY = 20                    # compaction forcée toutes les N exécutions
+
+# Sous-répertoires reconstruits par Chrome à la demande : les supprimer ne perd ni cookies ni localStorage
+CACHE_DIRS = [
+    os.path.join("Default", "Cache"),
+    os.path.join("Default", "Code Cache"),
+    os.path.join("Default", "GPUCache"),
+    os.path.join("Default", "Service Worker", "CacheStorage"),
+    os.path.join("Default", "Service Worker", "ScriptCache"),
+    "ShaderCache",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+]
+
+# Verrous laissés par un Chrome qui a planté
+SINGLETON_FILES = ["SingletonLock", "SingletonSocket", "SingletonCookie"]
+
+
+def directory_size(path):
+    """Taille cumulée des fichiers d'un répertoire, en octets."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def _try_lock(handle):
+    try:
+        if fcntl:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(handle):
+    try:
+        if fcntl:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        else:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+
+
+class ChromeProfile:
+    """
+    Répertoire de profil Chrome réservé par un worker.
+
+    ``acquire()`` verrouille le premier emplacement libre du profil de worker ; le
+    verrou (flock) est libéré par ``release()`` ou automatiquement par le système si
+    le processus meurt, si bien qu'un emplacement n'est jamais bloqué durablement.
+    """
+
+    def __init__(self, profile="default", directory=PROFILES_DIR, max_slots=MAX_SLOTS,
+                 disk_cache_size=DISK_CACHE_SIZE, max_size=MAX_PROFILE_SIZE, compact_every=COMPACT_EVERY):
+        self.profile = profile
+        self.directory = directory
+        self.max_slots = max_slots
+        self.disk_cache_size = disk_cache_size
+        self.max_size = max_size
+        self.compact_every = compact_every
+        self.path = None
+        self._lock_handle = None
+
+    def acquire(self):
+        """Réserve un emplacement libre et renvoie le chemin du user-data-dir."""
+        if self.path:
+            return self.path
+        os.makedirs(self.directory, exist_ok=True)
+        for slot in range(self.max_slots):
+            path = os.path.join(self.directory, f"{self.profile}-{slot}")
+            handle = open(f"{path}.lock", "a+")
+            if not _try_lock(handle):
+                handle.close()
+                continue
+            self.path = os.path.abspath(path)
+            self._lock_handle = handle
+            os.makedirs(self.path, exist_ok=True)
+            self._prepare()
+            logger.info("Profil Chrome réservé: %s", self.path)
+            return self.path
+        raise RuntimeError(f"Aucun emplacement de profil Chrome libre pour '{self.profile}' ({self.max_slots} occupés)")
+
+    def _prepare(self):
+        """Nettoie les verrous d'un Chrome planté et compacte le profil si nécessaire."""
+        for name in SINGLETON_FILES:
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                pass
+        runs = self._bump_run_counter()
+        size = directory_size(self.path)
+        if size > self.max_size or (self.compact_every and runs % self.compact_every == 0):
+            self.compact(size)
+
+    def _bump_run_counter(self):
+        counter_path = os.path.join(self.path, ".runs")
+        try:
+            with open(counter_path, "r") as f:
+                runs = int(f.read().strip() or 0) + 1
+        except (OSError, ValueError):
+            runs = 1
+        with open(counter_path, "w") as f:
+            f.write(str(runs))
+        return runs
+
+    def compact(self, size=None):
+        """Supprime les caches reconstructibles du profil (les cookies et le localStorage sont conservés)."""
+        size = directory_size(self.path) if size is None else size
+        start = time.time()
+        for relative in CACHE_DIRS:
+            shutil.rmtree(os.path.join(self.path, relative), ignore_errors=True)
+        logger.info("Profil Chrome compacté: %.1f Mo -> %.1f Mo en %.1fs",
+                    size / 1e6, directory_size(self.path) / 1e6, time.time() - start)
+
+    def apply(self, options):
+        """Ajoute le user-data-dir et le plafond de cache aux options Chrome."""
+        options.add_argument(f"--user-data-dir={self.acquire()}")
+        options.add_argument(f"--disk-cache-size={self.disk_cache_size}")
+
+    def release(self):
+        """Libère l'emplacement (à appeler après driver.quit())."""
+        if self._lock_handle:
+            _unlock(self._lock_handle)
+            self._lock_handle.close()
+            self._lock_handle = None
+            logger.info("Profil Chrome libéré: %s", self.path)
+        self.path = None
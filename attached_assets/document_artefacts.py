@@ -0,0 +1,144 @@
+"""
+Préparation des documents envoyés : conversion en PDF compact, une seule fois.
+
+Les CV sont souvent déposés en .docx et envoyés tels quels à chaque candidature.
+``prepare_upload`` produit à la place un PDF normalisé :
+
+1. conversion .docx/.odt/.doc -> PDF avec LibreOffice en mode headless ;
+2. réécriture avec Ghostscript (pdfwrite, réglage /ebook) : polices sous-ensemblées,
+   images rééchantillonnées à 150 dpi, métadonnées du document vidées.
+
+Le résultat est rangé sous cache/documents/<empreinte du contenu>/<nom d'origine>.pdf :
+une session suivante (ou un autre worker) qui envoie le même fichier réutilise
+l'artefact sans rien reconvertir, et le nom vu par le recruteur reste celui du
+document. Si les outils ne sont pas installés ou qu'une étape échoue, le
+document d'origine est envoyé ; un PDF n'est remplacé que si l'artefact est plus petit.
+"""
+
+import os
+import shutil
+import hashlib
+import logging
+import tempfile
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+ARTEFACTS_DIR = os.path.join("cache", "documents")
+# À incrémenter quand les réglages de conversion changent (invalide les artefacts existants)
+PIPELINE_VERSION = b"1"
+CONVERSION_TIMEOUT = 120
+IMAGE_RESOLUTION = 150
+
+CONVERTIBLE_EXTENSIONS = (".docx", ".odt", ".doc")
+
+# Vide les champs Info du PDF (Ghostscript reconstruit les métadonnées XMP à partir de ceux-ci)
+STRIP_METADATA = "[ /Title () /Author () /Subject () /Keywords () /Creator () /Producer () /DOCINFO pdfmark"
+
+
+def content_hash(path):
+    """Empreinte SHA-256 du contenu du fichier et de la version du traitement."""
+    digest = hashlib.sha256(PIPELINE_VERSION)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _libreoffice():
+    return shutil.which("soffice") or shutil.which("libreoffice")
+
+
+def _ghostscript():
+    return shutil.which("gs") or shutil.which("gswin64c")
+
+
+def _run(command, workdir):
+    subprocess.run(command, cwd=workdir, check=True, timeout=CONVERSION_TIMEOUT,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def convert_to_pdf(source, workdir):
+    """Convertit un document bureautique en PDF avec LibreOffice ; renvoie le chemin ou None."""
+    soffice = _libreoffice()
+    if not soffice:
+        logger.info("LibreOffice non installé, %s sera envoyé sans conversion", os.path.basename(source))
+        return None
+    # Profil LibreOffice jetable : une instance déjà ouverte par l'utilisateur ne bloque pas la conversion
+    profile = f"-env:UserInstallation=file://{os.path.abspath(os.path.join(workdir, 'lo_profile'))}"
+    try:
+        _run([soffice, profile, "--headless", "--convert-to", "pdf", "--outdir", workdir, source], workdir)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning("Conversion PDF de %s impossible: %s", os.path.basename(source), e)
+        return None
+    converted = os.path.join(workdir, os.path.splitext(os.path.basename(source))[0] + ".pdf")
+    return converted if os.path.exists(converted) else None
+
+
+def optimize_pdf(source, workdir):
+    """Réécrit un PDF avec Ghostscript (polices, images, métadonnées) ; renvoie le chemin ou None."""
+    gs = _ghostscript()
+    if not gs:
+        logger.info("Ghostscript non installé, PDF non optimisé")
+        return None
+    target = os.path.join(workdir, "optimized.pdf")
+    command = [
+        gs, "-sDEVICE=pdfwrite", "-dCompatibilityLevel=1.5", "-dPDFSETTINGS=/ebook",
+        "-dSubsetFonts=true", "-dEmbedAllFonts=true", "-dCompressFonts=true",
+        "-dDownsampleColorImages=true", f"-dColorImageResolution={IMAGE_RESOLUTION}",
+        "-dDownsampleGrayImages=true", f"-dGrayImageResolution={IMAGE_RESOLUTION}",
+        "-dNOPAUSE", "-dBATCH", "-dQUIET", "-dSAFER",
+        f"-sOutputFile={target}", source, "-c", STRIP_METADATA,
+    ]
+    try:
+        _run(command, workdir)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning("Optimisation PDF de %s impossible: %s", os.path.basename(source), e)
+        return None
+    return target if os.path.exists(target) and os.path.getsize(target) > 0 else None
+
+
+def _cached_artefact(folder):
+    """Artefact déjà produit dans le dossier d'une empreinte (le même contenu a pu être envoyé sous un autre nom)."""
+    try:
+        names = [name for name in os.listdir(folder) if name.endswith(".pdf")]
+    except OSError:
+        return None
+    return os.path.abspath(os.path.join(folder, names[0])) if names else None
+
+
+def prepare_upload(source, directory=ARTEFACTS_DIR):
+    """
+    Chemin du fichier à envoyer pour ``source`` : l'artefact PDF compact (produit
+    une fois, puis réutilisé d'après l'empreinte du contenu) ou ``source`` lui-même.
+    """
+    folder = os.path.join(directory, content_hash(source))
+    stem = os.path.splitext(os.path.basename(source))[0]
+    target = os.path.join(folder, f"{stem}.pdf")
+    if os.path.exists(target):
+        return os.path.abspath(target)
+    existing = _cached_artefact(folder)
+    if existing:
+        return existing
+
+    is_pdf = source.lower().endswith(".pdf")
+    if not is_pdf and not source.lower().endswith(CONVERTIBLE_EXTENSIONS):
+        return source
+
+    with tempfile.TemporaryDirectory(prefix="document_") as workdir:
+        pdf = source if is_pdf else convert_to_pdf(source, workdir)
+        if not pdf:
+            return source
+        optimized = optimize_pdf(pdf, workdir)
+        if optimized and os.path.getsize(optimized) < os.path.getsize(pdf):
+            pdf = optimized
+        elif pdf == source and not optimized:
+            return source
+        # Un PDF que l'optimisation n'a pas réduit est mis en cache tel quel : il ne sera plus retraité
+        os.makedirs(folder, exist_ok=True)
+        shutil.copyfile(pdf, f"{target}.tmp")
+        os.replace(f"{target}.tmp", target)
+
+    logger.info("Document préparé: %s (%.0f Ko) -> %s (%.0f Ko)", os.path.basename(source),
+                os.path.getsize(source) / 1024, os.path.basename(target), os.path.getsize(target) / 1024)
+    return os.path.abspath(target)
@@ -0,0 +1,199 @@
+"""
+Registre des documents de candidature (CV et lettre de motivation).
+
+Les chemins sont résolus une fois par session : d'abord ``cvPath`` /
+``coverLetterPath`` de la configuration, sinon le fichier le plus récent du
+répertoire ``uploads/`` (cv_*.docx, cover-letter_*.pdf...). Chaque document est
+validé une seule fois (présent, non vide, taille maximale, type reconnu à son
+extension et à sa signature) et son chemin absolu mis en cache. Les postulations
+suivantes ne coûtent qu'un ``os.stat`` : le document n'est revalidé que si sa
+taille ou sa date de modification a changé, et le répertoire n'est rescanné que
+s'il a lui-même changé (nouvel envoi depuis l'interface).
+
+Le fichier réellement envoyé (``cv``, ``lettre``, ``upload_path``) est l'artefact
+PDF compact préparé une fois par document_artefacts, sauf réglage
+``optimizeDocuments`` à false.
+"""
+
+import os
+import logging
+import threading
+
+from document_artefacts import prepare_upload
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPLOADS_DIR = os.path.join(PROJECT_ROOT, "uploads")
+
+MAX_DOCUMENT_SIZE = 5 * 1024 * 1024
+
+CV = "cv"
+LETTRE = "lettre"
+
+# Clé de configuration et préfixes de fichiers dans uploads/ pour chaque document
+DOCUMENT_SOURCES = {
+    CV: ("cvPath", ("cv",)),
+    LETTRE: ("coverLetterPath", ("cover-letter", "cover_letter", "lm", "lettre")),
+}
+
+# Extensions acceptées et signature (premiers octets) attendue
+SIGNATURES = {
+    ".pdf": b"%PDF",
+    ".docx": b"PK\x03\x04",
+    ".odt": b"PK\x03\x04",
+    ".doc": b"\xd0\xcf\x11\xe0",
+}
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+class InvalidDocumentError(ValueError):
+    """Document présent mais inutilisable (vide, trop volumineux, type non reconnu)."""
+
+
+def validate_document(path, max_size=MAX_DOCUMENT_SIZE):
+    """Vérifie un document et renvoie son os.stat ; lève InvalidDocumentError sinon."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SIGNATURES:
+        raise InvalidDocumentError(f"type de fichier non accepté ({extension or 'sans extension'})")
+    stat = os.stat(path)
+    if stat.st_size == 0:
+        raise InvalidDocumentError("fichier vide")
+    if stat.st_size > max_size:
+        raise InvalidDocumentError(f"fichier trop volumineux ({stat.st_size / 1e6:.1f} Mo)")
+    with open(path, "rb") as f:
+        if not f.read(len(SIGNATURES[extension])).startswith(SIGNATURES[extension]):
+            raise InvalidDocumentError(f"contenu ne correspondant pas à l'extension {extension}")
+    return stat
+
+
+def _stat_key(stat):
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+class DocumentRegistry:
+    """Chemins validés des documents d'un candidat, résolus une fois et surveillés."""
+
+    def __init__(self, user_data=None, uploads_dir=UPLOADS_DIR, max_size=MAX_DOCUMENT_SIZE, optimize=None):
+        self.user_data = user_data or {}
+        self.uploads_dir = uploads_dir
+        self.max_size = max_size
+        if optimize is None:
+            optimize = (self.user_data.get("settings") or {}).get("optimizeDocuments", True)
+        self.optimize = optimize
+        self._lock = threading.Lock()
+        self._documents = {}   # nom -> (chemin absolu, clé stat, fichier à envoyer) ou None
+        self._uploads_key = None
+
+    @classmethod
+    def for_user(cls, user_data=None):
+        """Registre partagé pour une configuration (même cvPath / coverLetterPath)."""
+        user_data = user_data or {}
+        key = tuple(user_data.get(config_key) for config_key, _ in DOCUMENT_SOURCES.values())
+        with _registries_lock:
+            registry = _registries.get(key)
+            if registry is None:
+                registry = _registries[key] = cls(user_data)
+            return registry
+
+    def _configured_path(self, config_key):
+        path = self.user_data.get(config_key)
+        if not path:
+            return None
+        if os.path.isabs(path):
+            return path
+        # Chemin relatif : au répertoire courant, sinon à la racine du projet
+        for base in (os.getcwd(), PROJECT_ROOT):
+            candidate = os.path.join(base, path)
+            if os.path.exists(candidate):
+                return os.path.abspath(candidate)
+        return os.path.abspath(path)
+
+    def _uploaded_path(self, prefixes):
+        """Fichier le plus récent de uploads/ dont le nom commence par un des préfixes."""
+        try:
+            entries = [entry for entry in os.scandir(self.uploads_dir)
+                       if entry.is_file() and entry.name.lower().startswith(prefixes)
+                       and os.path.splitext(entry.name)[1].lower() in SIGNATURES]
+        except OSError:
+            return None
+        if not entries:
+            return None
+        return max(entries, key=lambda entry: entry.stat().st_mtime).path
+
+    def _resolve(self, name):
+        """Premier candidat valide : chemin de la configuration, puis fichier le plus récent de uploads/."""
+        config_key, prefixes = DOCUMENT_SOURCES[name]
+        for path in (self._configured_path(config_key), self._uploaded_path(prefixes)):
+            if not path:
+                continue
+            path = os.path.abspath(path)
+            try:
+                stat = validate_document(path, self.max_size)
+            except FileNotFoundError:
+                logger.warning("Document '%s' introuvable : %s", name, path)
+                continue
+            except (OSError, InvalidDocumentError) as e:
+                logger.warning("Document '%s' ignoré (%s) : %s", name, e, path)
+                continue
+            logger.info("Document '%s' validé : %s (%.0f Ko)", name, path, stat.st_size / 1024)
+            upload = path
+            if self.optimize:
+                try:
+                    upload = prepare_upload(path)
+                except OSError as e:
+                    logger.warning("Préparation du document '%s' impossible, envoi de l'original: %s", name, e)
+            return path, _stat_key(stat), upload
+        logger.warning("Aucun document '%s' utilisable (configuration ou %s)", name, self.uploads_dir)
+        return None
+
+    def _uploads_changed(self):
+        try:
+            key = os.stat(self.uploads_dir).st_mtime_ns
+        except OSError:
+            key = None
+        changed = key != self._uploads_key
+        self._uploads_key = key
+        return changed
+
+    def _entry(self, name):
+        with self._lock:
+            if self._uploads_changed():
+                # Un envoi depuis l'interface peut remplacer un document résolu depuis uploads/
+                self._documents.clear()
+            if name in self._documents:
+                cached = self._documents[name]
+                if cached is None:
+                    return None
+                try:
+                    if _stat_key(os.stat(cached[0])) == cached[1]:
+                        return cached
+                except OSError:
+                    pass
+                logger.info("Document '%s' modifié depuis sa validation, nouvelle résolution", name)
+            self._documents[name] = self._resolve(name)
+            return self._documents[name]
+
+    def path(self, name):
+        """Chemin absolu validé du document d'origine, ou None s'il est absent ou invalide."""
+        entry = self._entry(name)
+        return entry[0] if entry else None
+
+    def upload_path(self, name):
+        """Fichier à envoyer pour le document (artefact PDF préparé ou original), ou None."""
+        entry = self._entry(name)
+        return entry[2] if entry else None
+
+    @property
+    def cv(self):
+        return self.upload_path(CV)
+
+    @property
+    def lettre(self):
+        return self.upload_path(LETTRE)
+
+    def resolve_all(self):
+        """Résout, valide et prépare tous les documents (début de session) ; renvoie {nom: fichier à envoyer ou None}."""
+        return {name: self.upload_path(name) for name in DOCUMENT_SOURCES}
@@ -0,0 +1,104 @@
+"""
+Suivi du contexte iframe du driver.
+
+Remplace les différentes versions de ``switch_to_iframe_if_needed`` qui, à chaque
+appel, sondaient le DOM (find_element) pour deviner si le driver était déjà dans
+l'iframe puis parcouraient jusqu'à cinq sélecteurs. ``FrameContext`` mémorise
+dans quel contexte se trouve le driver et garde l'élément iframe résolu en cache :
+il n'est résolu à nouveau que s'il est devenu obsolète (StaleElementReferenceException).
+
+    with FrameContext(driver) as frame:
+        ...  # dans l'iframe des résultats, retour automatique au default_content
+"""
+
+import logging
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import (
+    StaleElementReferenceException, NoSuchFrameException, TimeoutException
+)
+
+from site_profile import SITE_PROFILE
+
+logger = logging.getLogger(__name__)
+
+# Sélecteurs de l'iframe des résultats La bonne alternance, du plus précis au plus générique
+RESULTS_IFRAME_SELECTORS = SITE_PROFILE.results.iframe_selectors
+
+
+class FrameNotFoundError(NoSuchFrameException):
+    """Aucun iframe ne correspond aux sélecteurs."""
+
+
+class FrameContext:
+    """
+    Contexte iframe suivi d'un driver.
+
+    ``inside`` reflète le contexte courant tel que connu par cet objet : tout
+    basculement fait en dehors (switch_to.window, default_content...) doit être
+    signalé par ``reenter()`` ou ``mark_outside()``.
+    """
+
+    def __init__(self, driver, iframe=None, selectors=RESULTS_IFRAME_SELECTORS, timeout=5):
+        self.driver = driver
+        self.selectors = selectors
+        self.timeout = timeout
+        self.inside = False
+        self._iframe = iframe
+
+    def resolve(self):
+        """Recherche l'iframe depuis le document principal et la met en cache."""
+        def first_match(driver):
+            for selector in self.selectors:
+                for frame in driver.find_elements(By.CSS_SELECTOR, selector):
+                    if frame.is_displayed():
+                        return frame
+            return None
+
+        try:
+            self._iframe = WebDriverWait(self.driver, self.timeout).until(first_match)
+        except TimeoutException:
+            raise FrameNotFoundError("Aucun iframe de résultats trouvé")
+        logger.debug("Iframe de résultats résolue")
+        return self._iframe
+
+    def enter(self):
+        """Bascule dans l'iframe, sans aucune sonde DOM si le driver y est déjà."""
+        if self.inside:
+            return self
+        self.driver.switch_to.default_content()
+        iframe = self._iframe or self.resolve()
+        try:
+            self.driver.switch_to.frame(iframe)
+        except (StaleElementReferenceException, NoSuchFrameException):
+            # La page principale a été rechargée : l'élément en cache n'est plus valide
+            logger.info("Iframe de résultats obsolète, nouvelle résolution")
+            self.driver.switch_to.default_content()
+            self.driver.switch_to.frame(self.resolve())
+        self.inside = True
+        return self
+
+    def exit(self):
+        """Revient au document principal."""
+        self.driver.switch_to.default_content()
+        self.inside = False
+
+    def mark_outside(self):
+        """Signale que le driver a quitté l'iframe (changement d'onglet par exemple)."""
+        self.inside = False
+
+    def reenter(self):
+        """Rebascule dans l'iframe après un changement d'onglet (un seul switch_to.frame)."""
+        self.mark_outside()
+        return self.enter()
+
+    def __enter__(self):
+        return self.enter()
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.exit()
+        except Exception as e:
+            logger.debug("Retour au contexte principal impossible: %s", e)
+        return False
@@ -0,0 +1,102 @@
+"""
+Configuration unique du logging, avec écritures hors du thread d'automatisation.
+
+Les modules se contentent de ``logging.getLogger(__name__)`` ; seul le point
+d'entrée (runner ou exécution directe du scraper) appelle ``configure_logging``.
+Les loggers n'ont alors qu'un ``QueueHandler`` : un enregistrement coûte un
+``put`` dans une file, et un ``QueueListener`` (thread dédié) se charge du
+formatage et des écritures fichier / console / stdout.
+
+Les lignes destinées à l'interface web (``WEB_LOG:`` / ``WEB_EVENT:``) passent par
+le logger ``web`` et la même file : elles restent ordonnées entre elles et ne
+sont jamais écrites dans le fichier de log ni sur la console.
+"""
+
+import sys
+import queue
+import atexit
+import logging
+import logging.handlers
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+WEB_LOGGER = "web"
+
+_listener = None
+
+web_logger = logging.getLogger(WEB_LOGGER)
+
+
+class _WebFilter(logging.Filter):
+    """Sépare les lignes du protocole web (logger ``web``) des logs applicatifs."""
+
+    def __init__(self, web):
+        super().__init__()
+        self.web = web
+
+    def filter(self, record):
+        return (record.name == WEB_LOGGER) == self.web
+
+
+def configure_logging(log_file=None, level=logging.INFO, console=True, file_handler=None):
+    """
+    Installe la file de logs sur le logger racine (une seule fois par processus).
+
+    ``log_file`` ou ``file_handler`` (handler déjà construit) reçoit les logs
+    applicatifs, ``console`` les recopie sur stderr ; les lignes web vont sur stdout.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    handlers = []
+    if file_handler is None and log_file:
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+    if file_handler is not None:
+        handlers.append(file_handler)
+    if console:
+        handlers.append(logging.StreamHandler(sys.stderr))
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        handler.addFilter(_WebFilter(web=False))
+
+    web_handler = logging.StreamHandler(sys.stdout)
+    web_handler.setFormatter(logging.Formatter("%(message)s"))
+    web_handler.addFilter(_WebFilter(web=True))
+    handlers.append(web_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    web_logger.setLevel(logging.INFO)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Vide la file et arrête le thread d'écriture (appelé automatiquement à la sortie)."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.flush()
+        if isinstance(handler, logging.FileHandler):
+            handler.close()
+    _listener = None
+
+
+def web_line(prefix, payload):
+    """Envoie une ligne ``<prefix>: <json>`` à l'interface web via la file de logs."""
+    if _listener is None:
+        # Pas de pipeline (validation --dry-run, import en test) : écriture directe
+        print(f"{prefix}: {payload}", flush=True)
+        return
+    web_logger.info("%s: %s", prefix, payload)
@@ -0,0 +1,98 @@
+"""
+Messages de candidature personnalisés par offre.
+
+Le message (``message`` de la configuration, sinon ``MESSAGE_CANDIDATURE``) est un
+modèle : ``{titre}``, ``{entreprise}``, ``{lieu}``, ``{prenom}`` et ``{nom}`` sont
+remplacés par les valeurs de l'offre et du candidat, ``{entreprise|votre entreprise}``
+fournit une valeur de repli quand le champ est inconnu. Toute autre accolade est
+recopiée telle quelle, si bien qu'un message libre sans champ est envoyé à l'identique.
+Le marqueur historique ``[Prénom Nom]`` reste reconnu.
+
+Un modèle n'est analysé qu'une fois (cache par texte) ; le rendu se réduit alors à
+un ``join`` de segments. Le runner rend les messages de toute la moisson d'un coup,
+avant la boucle de candidatures.
+"""
+
+import re
+from functools import lru_cache
+
+from offer_record import NON_SPECIFIE
+
+# Message de candidature par défaut
+MESSAGE_CANDIDATURE = """Bonjour,
+
+Je suis vivement intéressé(e) par votre offre « {titre} » au sein de {entreprise|votre entreprise}, qui correspond parfaitement à mon projet professionnel.
+Mon profil et ma formation correspondent aux compétences requises pour ce poste.
+
+Je serais ravi(e) de pouvoir échanger avec vous pour vous présenter ma motivation et mes ambitions.
+
+Cordialement,
+{prenom} {nom}
+"""
+
+FIELDS = ("titre", "entreprise", "lieu", "prenom", "nom")
+LEGACY_SIGNATURE = "[Prénom Nom]"
+
+_FIELD = re.compile(r"\{(%s)(?:\|([^{}]*))?\}" % "|".join(FIELDS))
+
+# Valeurs considérées comme absentes (repli sur la valeur par défaut du champ)
+_MISSING = ("", None, NON_SPECIFIE, "Titre non disponible", "Entreprise non disponible", "Lieu non disponible")
+
+
+@lru_cache(maxsize=64)
+def parse_template(text):
+    """
+    Découpe un modèle en segments : une chaîne pour le texte littéral, un tuple
+    (champ, valeur par défaut) pour un champ. Résultat mis en cache par texte.
+    """
+    text = text.replace(LEGACY_SIGNATURE, "{prenom} {nom}")
+    segments = []
+    position = 0
+    for match in _FIELD.finditer(text):
+        if match.start() > position:
+            segments.append(text[position:match.start()])
+        segments.append((match.group(1), match.group(2) or ""))
+        position = match.end()
+    if position < len(text):
+        segments.append(text[position:])
+    return tuple(segments)
+
+
+def render(segments, values):
+    """Rend des segments analysés avec un dictionnaire de valeurs."""
+    parts = []
+    for segment in segments:
+        if type(segment) is str:
+            parts.append(segment)
+        else:
+            value = values.get(segment[0])
+            parts.append(segment[1] if value in _MISSING else str(value))
+    return "".join(parts)
+
+
+class MessageRenderer:
+    """Modèle analysé et valeurs du candidat, prêt à rendre un message par offre."""
+
+    def __init__(self, template=MESSAGE_CANDIDATURE, prenom="", nom=""):
+        self.segments = parse_template(template)
+        self.candidate = {"prenom": prenom, "nom": nom}
+
+    @classmethod
+    def for_user(cls, user_data=None):
+        """Renderer pour une configuration (clés du scraper ou du frontend)."""
+        user_data = user_data or {}
+        return cls(
+            template=user_data.get("message") or MESSAGE_CANDIDATURE,
+            prenom=user_data.get("prenom") or user_data.get("firstName") or "",
+            nom=user_data.get("nom") or user_data.get("lastName") or "",
+        )
+
+    def render_fields(self, titre="", entreprise="", lieu=""):
+        return render(self.segments, dict(self.candidate, titre=titre, entreprise=entreprise, lieu=lieu))
+
+    def render_offer(self, offer):
+        return self.render_fields(offer.title, offer.company, offer.location)
+
+    def render_all(self, offers, key=lambda offer: offer.link or offer.title):
+        """Rend le message de chaque offre d'une moisson ; renvoie {clé de l'offre: message}."""
+        return {key(offer): self.render_offer(offer) for offer in offers}
@@ -0,0 +1,160 @@
+"""
+Préchargement des pages d'offres dans des onglets en arrière-plan.
+
+Pendant que l'offre courante est traitée, les suivantes se chargent déjà dans
+d'autres onglets. Chaque page est ensuite classée (postulable, sans contact,
+redirection externe) par une seule sonde DOM (voir page_signature), si bien que
+les offres à ignorer ne consomment jamais de place dans la boucle séquentielle
+de candidature.
+"""
+
+import time
+import logging
+from collections import deque
+
+from offer_record import STATUT_IGNORE
+from page_signature import probe, APPLY_MASK, EXTERNAL_MASK, NO_CONTACT_MASK, NO_CONTACT_STRICT_MASK
+from site_profile import SITE_PROFILE
+
+logger = logging.getLogger(__name__)
+
+# Classifications possibles d'une page d'offre
+APPLYABLE = "applyable"
+NO_CONTACT = "no_contact"
+EXTERNAL = "external"
+UNKNOWN = "unknown"
+
+# Domaines des sites partenaires vers lesquels certaines offres redirigent
+EXTERNAL_DOMAINS = SITE_PROFILE.results.external_domains
+
+
+def classify_current_page(driver):
+    """
+    Classe la page de l'onglet courant à partir d'une seule sonde DOM.
+    Renvoie (classification, raison).
+    """
+    signature = probe(driver)
+    if any(domain in signature.host for domain in EXTERNAL_DOMAINS):
+        return EXTERNAL, f"Redirection vers un site externe: {signature.host}"
+    if not signature.ready:
+        return UNKNOWN, "Page en cours de chargement"
+    if signature.matches(EXTERNAL_MASK):
+        return EXTERNAL, f"Redirection vers un site externe: {signature.text(EXTERNAL_MASK)}"
+    applyable = signature.matches(APPLY_MASK)
+    if signature.matches(NO_CONTACT_STRICT_MASK) or (signature.matches(NO_CONTACT_MASK) and not applyable):
+        return NO_CONTACT, "Candidature spontanée sans contact direct"
+    if applyable:
+        return APPLYABLE, ""
+    return UNKNOWN, "Aucun bouton de candidature détecté"
+
+
+class OfferPrefetcher:
+    """
+    Itère sur les offres postulables en gardant ``depth`` pages préchargées d'avance.
+    Avec ``limit`` (candidatures restantes de la session), l'itération s'arrête après
+    ``limit`` offres et la fenêtre de préchargement ne dépasse jamais le nombre d'offres
+    qui peuvent encore être traitées.
+
+    Chaque élément produit est un couple ``(offer, handle)`` où ``handle`` est l'onglet
+    déjà chargé sur la page de l'offre ; il peut être passé à ``postuler_offre`` qui
+    le réutilise au lieu d'ouvrir un nouvel onglet. Les offres ignorées sont marquées
+    ``ignoré`` et rangées dans ``skipped`` avec leur classification et leur raison.
+    """
+
+    def __init__(self, driver, offers, depth=3, timeout=15, limit=None):
+        self.driver = driver
+        self.depth = max(1, depth)
+        self.limit = limit
+        self.timeout = timeout
+        self.main_handle = driver.current_window_handle
+        self.skipped = []
+        self._pending = deque(offers)
+        self._open = deque()
+        self._yielded = 0
+
+    def _window(self, reserved):
+        """Taille de la fenêtre de préchargement, ``reserved`` offres étant déjà en cours de traitement."""
+        if self.limit is None:
+            return self.depth
+        return min(self.depth, self.limit - self._yielded - reserved)
+
+    def _open_next(self, reserved=0):
+        """Ouvre les prochaines offres en arrière-plan jusqu'à remplir la fenêtre de préchargement."""
+        while len(self._open) < self._window(reserved) and self._pending:
+            offer = self._pending.popleft()
+            if not offer.link:
+                self._skip(offer, UNKNOWN, "URL de l'offre manquante")
+                continue
+            handles_before = set(self.driver.window_handles)
+            self.driver.execute_script("window.open(arguments[0], '_blank');", offer.link)
+            new_handles = [h for h in self.driver.window_handles if h not in handles_before]
+            if not new_handles:
+                logger.warning("Impossible d'ouvrir l'onglet de préchargement pour %s", offer.title)
+                self._pending.appendleft(offer)
+                return
+            self._open.append((offer, new_handles[0]))
+            logger.debug("Préchargement de l'offre: %s", offer.title)
+
+    def _skip(self, offer, classification, reason):
+        offer.set_status(STATUT_IGNORE)
+        self.skipped.append((offer, classification, reason))
+        logger.info("Offre ignorée avant candidature: %s (%s)", offer.title, reason)
+
+    def _classify(self, handle):
+        """Attend que la page de l'onglet soit classable (ou le délai écoulé)."""
+        self.driver.switch_to.window(handle)
+        deadline = time.time() + self.timeout
+        classification, reason = classify_current_page(self.driver)
+        while classification == UNKNOWN and time.time() < deadline:
+            time.sleep(0.25)
+            classification, reason = classify_current_page(self.driver)
+        return classification, reason
+
+    def _close(self, handle):
+        try:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        except Exception as e:
+            logger.debug("Fermeture de l'onglet de préchargement impossible: %s", e)
+        finally:
+            self.driver.switch_to.window(self.main_handle)
+
+    def __iter__(self):
+        while self.limit is None or self._yielded < self.limit:
+            self._open_next()
+            if not self._open:
+                return
+            offer, handle = self._open.popleft()
+            # Garder la fenêtre de préchargement pleine pendant le traitement de cette offre
+            self._open_next(reserved=1)
+            try:
+                classification, reason = self._classify(handle)
+            except Exception as e:
+                logger.warning("Classification impossible pour %s: %s", offer.title, e)
+                classification, reason = UNKNOWN, str(e)
+
+            if classification in (NO_CONTACT, EXTERNAL):
+                self._close(handle)
+                self._skip(offer, classification, reason)
+                continue
+
+            # Page postulable (ou indéterminée: postuler_offre tranchera)
+            self._yielded += 1
+            yield offer, handle
+
+    def reset(self, driver):
+        """
+        Rattache le préchargement à un nouveau navigateur (après un crash) : les onglets
+        de l'ancien navigateur sont perdus, leurs offres repassent en tête de file.
+        """
+        while self._open:
+            offer, _ = self._open.pop()
+            self._pending.appendleft(offer)
+        self.driver = driver
+        self.main_handle = driver.current_window_handle
+
+    def close(self):
+        """Ferme les onglets préchargés non consommés."""
+        while self._open:
+            _, handle = self._open.popleft()
+            self._close(handle)
@@ -0,0 +1,121 @@
+"""
+Enregistrement compact d'une offre d'alternance.
+
+Les offres circulaient jusqu'ici sous forme de dictionnaires ad hoc (``job_offer``
+dans ``run_scraper``, ``offer_data``/``application_data`` dans l'``AutomationRunner``).
+``Offer`` utilise ``__slots__`` et des chaînes internées pour les champs à faible
+cardinalité (type, source, statut, lieu), ce qui réduit fortement l'empreinte
+mémoire des grosses moissons d'offres.
+"""
+
+import sys
+
+# Valeurs énumérées internées (une seule instance partagée par toutes les offres)
+TYPE_ENTREPRISE = sys.intern("Entreprise")
+TYPE_FORMATION = sys.intern("Formation")
+TYPE_INDETERMINE = sys.intern("Indéterminé")
+
+SOURCE_LBA = sys.intern("La bonne alternance")
+SOURCE_ALTERNANCE_GOUV = sys.intern("alternance.emploi.gouv.fr")
+
+STATUT_NON_POSTULE = sys.intern("non_postulé")
+STATUT_SOUMIS = sys.intern("soumis")
+STATUT_SUCCES = sys.intern("succes")
+STATUT_IGNORE = sys.intern("ignoré")
+STATUT_ECHEC = sys.intern("echec")
+STATUT_ERREUR = sys.intern("erreur")
+
+# Correspondance entre les statuts de postulation et la colonne applications.status
+# de shared/schema.ts ('pending', 'sent', 'failed', 'retrying')
+STATUTS_APPLICATIONS = {
+    STATUT_NON_POSTULE: "pending",
+    STATUT_SOUMIS: "sent",
+    STATUT_SUCCES: "sent",
+    "success": "sent",
+    "formulaire_rempli": "pending",
+    STATUT_IGNORE: "failed",
+    STATUT_ECHEC: "failed",
+    STATUT_ERREUR: "failed",
+}
+
+NON_SPECIFIE = sys.intern("Non spécifié")
+
+
+def _intern(value):
+    """Interne une chaîne (les autres valeurs sont renvoyées telles quelles)."""
+    return sys.intern(value) if type(value) is str else value
+
+
+class Offer:
+    """Offre d'alternance (ou formation) extraite des résultats de recherche."""
+
+    __slots__ = ("title", "company", "location", "link", "offer_type", "source", "status")
+
+    def __init__(self, title, company=NON_SPECIFIE, location=NON_SPECIFIE, link="",
+                 offer_type=TYPE_INDETERMINE, source=SOURCE_LBA, status=STATUT_NON_POSTULE):
+        self.title = title
+        self.company = _intern(company)
+        self.location = _intern(location)
+        self.link = link
+        self.offer_type = _intern(offer_type)
+        self.source = _intern(source)
+        self.status = _intern(status)
+
+    def __repr__(self):
+        return f"Offer({self.title!r}, {self.company!r}, {self.location!r}, status={self.status!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Offer):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self):
+        return hash((self.link, self.title))
+
+    @property
+    def url(self):
+        """Alias de ``link`` (le runner historique utilisait la clé 'url')."""
+        return self.link
+
+    def set_status(self, status):
+        self.status = _intern(status)
+
+    # --- Sérialisation ---
+
+    def to_dict(self):
+        """Forme historique de ``job_offer`` (également utilisée dans les WEB_EVENT)."""
+        return {
+            "title": self.title,
+            "company": self.company,
+            "location": self.location,
+            "link": self.link,
+            "type": self.offer_type,
+            "source": self.source,
+            "postulation_status": self.status,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstruit une offre depuis un ``job_offer``, un WEB_EVENT ou une ligne ``applications``."""
+        return cls(
+            data.get("title") or data.get("job_title") or "",
+            data.get("company") or NON_SPECIFIE,
+            data.get("location") or NON_SPECIFIE,
+            data.get("link") or data.get("url") or "",
+            data.get("type") or TYPE_INDETERMINE,
+            data.get("source") or SOURCE_LBA,
+            data.get("postulation_status") or STATUT_NON_POSTULE,
+        )
+
+    def to_application(self, session_id, status=None, error_message=None):
+        """Ligne au format de la table ``applications`` de shared/schema.ts."""
+        row = {
+            "session_id": session_id,
+            "job_title": self.title,
+            "company": self.company,
+            "location": self.location,
+            "status": status or STATUTS_APPLICATIONS.get(self.status, "pending"),
+        }
+        if error_message:
+            row["error_message"] = error_message
+        return row
@@ -0,0 +1,102 @@
+"""
+Signature d'une page d'offre calculée en un seul ``execute_script``.
+
+Tous les indicateurs (candidature spontanée sans contact, redirection externe,
+bouton de candidature) sont évalués dans la page et renvoyés sous forme d'un
+masque de bits : les décisions de sortie anticipée de ``postuler_offre`` et la
+classification du préchargement se font à partir de ce seul résultat au lieu
+d'un ``find_element`` par sélecteur. Les XPath des indicateurs viennent du profil de
+site (``application.page_indicators``).
+"""
+
+from site_profile import SITE_PROFILE
+
+_PAGE = SITE_PROFILE.application.page_indicators
+
+# Groupes d'indicateurs du profil de site : (groupe, visible_requis).
+# - no_contact : candidature spontanée sans contact, sauf si un bouton de candidature est présent
+# - no_contact_strict : absence de contact avérée, même si un bouton est présent
+# - external : redirections externes (Hellowork et autres plateformes partenaires)
+# - apply : candidature directe possible
+_GROUPS = (
+    ("no_contact", True),
+    ("no_contact_strict", True),
+    ("external", False),
+    ("apply", False),
+)
+
+# (nom, xpath, visible_requis) — l'ordre définit la position du bit
+INDICATORS = tuple(
+    (f"{group}_{index}", xpath, visible)
+    for group, visible in _GROUPS
+    for index, xpath in enumerate(getattr(_PAGE, group))
+)
+
+BITS = {name: 1 << index for index, (name, _, _) in enumerate(INDICATORS)}
+assert len(INDICATORS) <= 31, "le masque doit tenir dans un entier 32 bits côté JavaScript"
+
+
+def _mask(group):
+    return sum(BITS[f"{group}_{index}"] for index in range(len(getattr(_PAGE, group))))
+
+
+# Indicateurs qui prouvent l'absence de contact même si un bouton est présent
+NO_CONTACT_STRICT_MASK = _mask("no_contact_strict")
+NO_CONTACT_MASK = _mask("no_contact") | NO_CONTACT_STRICT_MASK
+EXTERNAL_MASK = _mask("external")
+APPLY_MASK = _mask("apply")
+
+_XPATHS = [xpath for _, xpath, _ in INDICATORS]
+_VISIBLE = [visible for _, _, visible in INDICATORS]
+
+PROBE_SCRIPT = """
+var xpaths = arguments[0], visibleOnly = arguments[1];
+var bits = 0, texts = {};
+for (var i = 0; i < xpaths.length; i++) {
+    var node = document.evaluate(xpaths[i], document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (!node) continue;
+    if (visibleOnly[i] && !(node.offsetWidth || node.offsetHeight || node.getClientRects().length)) continue;
+    bits |= (1 << i);
+    texts[i] = (node.textContent || '').trim().substring(0, 200);
+}
+return {bits: bits, texts: texts, host: window.location.hostname,
+        ready: document.readyState === 'complete'};
+"""
+
+
+class PageSignature:
+    """Résultat d'une sonde : masque des indicateurs présents et texte du premier nœud trouvé."""
+
+    __slots__ = ("bits", "texts", "host", "ready")
+
+    def __init__(self, bits=0, texts=None, host="", ready=False):
+        self.bits = bits
+        self.texts = texts or {}
+        self.host = host
+        self.ready = ready
+
+    def __repr__(self):
+        matched = [name for name, bit in BITS.items() if self.bits & bit]
+        return f"PageSignature({matched}, host={self.host!r})"
+
+    def matches(self, mask):
+        return bool(self.bits & mask)
+
+    def text(self, mask):
+        """Texte du premier indicateur présent dans ``mask`` (ou chaîne vide)."""
+        for index in range(len(INDICATORS)):
+            if mask & self.bits & (1 << index):
+                return self.texts.get(str(index), self.texts.get(index, ""))
+        return ""
+
+
+def probe(driver):
+    """Évalue tous les indicateurs de la page courante en un seul aller-retour WebDriver."""
+    result = driver.execute_script(PROBE_SCRIPT, _XPATHS, _VISIBLE) or {}
+    return PageSignature(
+        int(result.get("bits", 0)),
+        result.get("texts") or {},
+        result.get("host", ""),
+        bool(result.get("ready")),
+    )
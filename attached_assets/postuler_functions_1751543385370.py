@@ -10,6 +10,12 @@ from selenium.common.exceptions import NoSuchElementException, TimeoutException,
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys # Added for robust clearing
 import json
+from page_signature import probe as probe_page, PageSignature, NO_CONTACT_MASK, EXTERNAL_MASK
+from site_profile import SITE_PROFILE, BY_TEXT
+from document_registry import DocumentRegistry
+from message_templates import MESSAGE_CANDIDATURE, MessageRenderer
+from submission_watch import SubmissionWatch, log_submission, UNCONFIRMED
+from application_outcome import Outcome, resultat, outcome_of, outcome_for_submission
 
 def load_frontend_config():
     """
@@ -23,7 +29,7 @@ def load_frontend_config():
         config_path = os.path.join(project_root, 'frontend', 'user_config.json')
         
         if not os.path.exists(config_path):
-            print(f"⚠️ Fichier de configuration non trouvé : {config_path}")
+            logger.warning("Fichier de configuration non trouvé : %s", config_path)
             return None
             
         with open(config_path, 'r', encoding='utf-8') as f:
@@ -40,81 +46,52 @@ def load_frontend_config():
             'type_contrat': config.get('contract_type', 'CDI')
         }
         
-        print(f"✅ Configuration chargée depuis le frontend : {user_data['prenom']} {user_data['nom']}")
+        logger.info("Configuration chargée depuis le frontend : %s %s", user_data['prenom'], user_data['nom'])
         return user_data
         
     except Exception as e:
-        print(f"❌ Erreur lors du chargement de la configuration frontend : {e}")
+        logger.error("Erreur lors du chargement de la configuration frontend : %s", e)
         return None
 
 # Configuration du logging
 logger = logging.getLogger(__name__)
-if not logger.handlers:
-    # Configuration du fichier log persistant
-    log_dir = "logs"
-    os.makedirs(log_dir, exist_ok=True)
-    log_file = os.path.join(log_dir, f"postulation_{time.strftime('%Y%m%d_%H%M%S')}.log")
-    
-    # Handler pour la console
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    logger.addHandler(console_handler)
-    
-    # Handler pour le fichier log
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    logger.addHandler(file_handler)
-    
-    logger.setLevel(logging.INFO)
+_environment_ready = False
+
+def prepare_environment():
+    """
+    Crée le répertoire des captures d'écran.
+    Appelée à la première postulation plutôt qu'à l'import du module, qui reste sans effet de bord.
+    Les logs de postulation passent par la configuration du point d'entrée (log_pipeline).
+    """
+    global _environment_ready
+    if _environment_ready:
+        return
+    _environment_ready = True
+    os.makedirs("debug_screenshots", exist_ok=True)
 
 # Configuration pour la postulation automatique
 AUTO_REMPLIR_FORMULAIRE = True  # Activer/désactiver le remplissage automatique du formulaire
 AUTO_ENVOYER_CANDIDATURE = True  # Activer par défaut l'envoi automatique du formulaire après remplissage
 PAUSE_AVANT_ENVOI = False  # Désactiver la pause avant l'envoi final pour une automatisation complète
 
-# Assurer l'existence du répertoire pour les captures d'écran de debug
-os.makedirs("debug_screenshots", exist_ok=True)
-
-# Message de candidature par défaut
-MESSAGE_CANDIDATURE = """Bonjour,
-
-Je suis vivement intéressé(e) par cette offre d'alternance qui correspond parfaitement à mon projet professionnel. 
-Mon profil et ma formation correspondent aux compétences requises pour ce poste.
-
-Je serais ravi(e) de pouvoir échanger avec vous pour vous présenter ma motivation et mes ambitions.
+def detect_cv_lm_files(user_data=None):
+    """CV et lettre de motivation validés, résolus une fois par session par le registre de documents."""
+    registry = DocumentRegistry.for_user(user_data)
+    return registry.cv, registry.lettre
 
-Cordialement,
-[Prénom Nom]
-"""
-
-def detect_cv_lm_files():
-    # Chemin vers les fichiers centralisés
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.join(script_dir, '..', '..', '..', '..')
-    upload_dir = os.path.join(project_root, 'frontend', 'static', 'uploads')
-    
-    # Détecter les fichiers CV et LM
-    cv_path = None
-    lm_path = None
-    for filename in os.listdir(upload_dir):
-        if filename.lower().startswith('cv') and (filename.endswith('.pdf') or filename.endswith('.docx')):
-            cv_path = os.path.join(upload_dir, filename)
-        elif filename.lower().startswith('lm') and (filename.endswith('.pdf') or filename.endswith('.docx')):
-            lm_path = os.path.join(upload_dir, filename)
-    
-    return cv_path, lm_path
-
-def remplir_formulaire_candidature(driver, user_data, titre_offre):
+def remplir_formulaire_candidature(driver, user_data, titre_offre, message=None):
     """
-    Remplit automatiquement le formulaire de candidature avec les données utilisateur
+    Remplit automatiquement le formulaire de candidature avec les données utilisateur.
+    ``message`` est le message déjà rendu pour l'offre (voir message_templates) ; à défaut,
+    le modèle est rendu ici avec le seul titre de l'offre.
     """
+    # Une erreur n'est ambiguë (candidature peut-être envoyée) qu'après un clic d'envoi
+    clic_envoi = False
     try:
-        print('--- Début du remplissage du formulaire de candidature ---')
         logger.info("Début du remplissage du formulaire de candidature...")
         wait = WebDriverWait(driver, 20)  # Augmenter le temps d'attente à 20s
         
         # Attendre que le formulaire soit complètement chargé
-        print('Attente du chargement complet du formulaire...')
         logger.info("Attente du chargement complet du formulaire...")
         try:
             # Attendre que le formulaire soit visible et chargé
@@ -128,154 +105,119 @@ def remplir_formulaire_candidature(driver, user_data, titre_offre):
         try:
             driver.save_screenshot(f"debug_screenshots/formulaire_avant_remplissage_{titre_offre.replace(' ', '_')}.png")
         except Exception as e:
-            logger.debug(f"Impossible de capturer le screenshot avant remplissage: {e}")
+            logger.debug("Impossible de capturer le screenshot avant remplissage: %s", e)
         
         # Définir les données utilisateur à remplir
         nom = user_data.get('nom', 'Dupont')
         prenom = user_data.get('prenom', 'Jean')
         email = user_data.get('email', 'jean.dupont@example.com')
         telephone = user_data.get('telephone', '0612345678')
-        message = user_data.get('message', MESSAGE_CANDIDATURE.replace('[Prénom Nom]', f"{prenom} {nom}"))
-        
-        # Mapping des champs avec les sélecteurs exacts du DOM
-        fields_mapping = {
-            "lastName": {
-                "value": nom,
-                "selectors": ["input[data-testid='lastName']", "#lastName", "input[name='applicant_last_name']", "//input[@data-testid='lastName']"] 
-            },
-            "firstName": {
-                "value": prenom,
-                "selectors": ["input[data-testid='firstName']", "#firstName", "input[name='applicant_first_name']", "//input[@data-testid='firstName']"] 
-            },
-            "email": {
-                "value": email,
-                "selectors": ["input[data-testid='email']", "#email", "input[name='applicant_email']", "//input[@data-testid='email']"] 
-            },
-            "phone": {
-                "value": telephone,
-                "selectors": ["input[data-testid='phone']", "#phone", "input[name='applicant_phone']", "//input[@data-testid='phone']"] 
-            },
-            "message": {
-                "value": message,
-                "selectors": ["textarea[data-testid='message']", "textarea[name='applicant_message']", "#message", "//textarea[@data-testid='message']"] 
-            }
+        if message is None:
+            renderer = MessageRenderer(user_data.get('message') or MESSAGE_CANDIDATURE, prenom, nom)
+            message = renderer.render_fields(titre=titre_offre)
+        
+        # Valeurs à saisir ; les sélecteurs des champs viennent du profil de site
+        field_values = {
+            "lastName": nom,
+            "firstName": prenom,
+            "email": email,
+            "phone": telephone,
+            "message": message,
         }
         
         # Remplir chaque champ avec plusieurs tentatives de sélecteurs
-        for field_name, field_info in fields_mapping.items():
-            print(f'  → Remplissage du champ : {field_name}')
+        for field_name, locators in SITE_PROFILE.application.fields:
+            logger.debug("Remplissage du champ : %s", field_name)
             field_found = False
-            value = field_info["value"]
-            selectors = field_info["selectors"]
+            value = field_values.get(field_name, "")
             
-            for selector in selectors:
+            for locator in locators:
                 try:
-                    if selector.startswith("//"):  # XPath
-                        field = wait.until(EC.element_to_be_clickable((By.XPATH, selector)))
-                    else:  # CSS
-                        field = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
+                    field = wait.until(EC.element_to_be_clickable(locator))
                     
                     # Mettre en évidence le champ pour le débogage
                     driver.execute_script("arguments[0].style.border='3px solid green';", field)
                     
                     # LOG : Valeur du champ avant effacement
-                    try:
-                        logger.info(f"[DEBUG] Valeur du champ {field_name} AVANT effacement : '{field.get_attribute('value')}'")
-                    except Exception:
-                        pass
+                    if logger.isEnabledFor(logging.DEBUG):
+                        try:
+                            logger.debug("Valeur du champ %s AVANT effacement : '%s'", field_name, field.get_attribute('value'))
+                        except Exception:
+                            pass
                     # Effacer le champ de façon robuste avant de remplir
                     try:
                         field.clear()
-                        logger.info(f"[DEBUG] clear() appelé sur {field_name}")
+                        logger.debug("clear() appelé sur %s", field_name)
                     except Exception:
-                        logger.info(f"[DEBUG] clear() a échoué sur {field_name}")
+                        logger.debug("clear() a échoué sur %s", field_name)
                         pass
                     try:
                         field.send_keys(Keys.CONTROL + "a")
                         field.send_keys(Keys.DELETE)
-                        logger.info(f"[DEBUG] Ctrl+A+Delete appelé sur {field_name}")
+                        logger.debug("Ctrl+A+Delete appelé sur %s", field_name)
                     except Exception:
-                        logger.info(f"[DEBUG] Ctrl+A+Delete a échoué sur {field_name}")
+                        logger.debug("Ctrl+A+Delete a échoué sur %s", field_name)
                         pass
                     try:
                         driver.execute_script("arguments[0].value = '';", field)
-                        logger.info(f"[DEBUG] JS value='' appelé sur {field_name}")
+                        logger.debug("JS value='' appelé sur %s", field_name)
                     except Exception:
-                        logger.info(f"[DEBUG] JS value='' a échoué sur {field_name}")
+                        logger.debug("JS value='' a échoué sur %s", field_name)
                         pass
                     # LOG : Valeur du champ avant remplissage
-                    try:
-                        logger.info(f"[DEBUG] Valeur du champ {field_name} AVANT remplissage : '{field.get_attribute('value')}'")
-                    except Exception:
-                        pass
+                    if logger.isEnabledFor(logging.DEBUG):
+                        try:
+                            logger.debug("Valeur du champ %s AVANT remplissage : '%s'", field_name, field.get_attribute('value'))
+                        except Exception:
+                            pass
                     # Remplir le champ
                     field.send_keys(value)
                     # LOG : Valeur du champ après remplissage
-                    try:
-                        logger.info(f"[DEBUG] Valeur du champ {field_name} APRÈS remplissage : '{field.get_attribute('value')}'")
-                    except Exception:
-                        pass
-                    logger.info(f"✅ Champ {field_name} rempli avec succès")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        try:
+                            logger.debug("Valeur du champ %s APRÈS remplissage : '%s'", field_name, field.get_attribute('value'))
+                        except Exception:
+                            pass
+                    logger.info("✅ Champ %s rempli avec succès", field_name)
                     field_found = True
                     break
                 except Exception as e:
-                    logger.debug(f"Sélecteur {selector} pour {field_name} non trouvé: {str(e)[:100]}...")
+                    logger.debug("Sélecteur %s pour %s non trouvé: %s...", locator.value, field_name, str(e)[:100])
                     continue
             
             if not field_found:
-                logger.warning(f"⚠️ Impossible de trouver le champ {field_name}")
+                logger.warning("⚠️ Impossible de trouver le champ %s", field_name)
                 # Capture d'écran en cas d'échec
                 driver.save_screenshot(f"debug_screenshots/champ_non_trouve_{field_name}_{titre_offre.replace(' ', '_')}.png")
         
-        # Gestion des documents (CV et LM) depuis le dossier centralisé
-        print('Recherche des champs d\'upload de documents (CV, LM) ...')
+        # Gestion des documents (CV et LM) : chemins déjà validés par le registre de la session
         logger.info("Recherche des champs d'upload de documents...")
+        cv_path, lm_path = detect_cv_lm_files(user_data)
         
-        # Détecter automatiquement les fichiers CV/LM dans le dossier centralisé
-        cv_path, lm_path = detect_cv_lm_files()
-        
-        # Tableau des types de documents à gérer et leurs sélecteurs potentiels
+        # Types de documents à gérer (sélecteurs du profil de site) et fichiers correspondants
+        document_files = {"CV": cv_path, "Lettre de motivation": lm_path}
         document_types = [
-            {
-                "name": "CV",
-                "file_path": cv_path,
-                "selectors": [
-                    "input[type='file'][accept='.docx,.pdf']", 
-                    "input[type='file'][data-testid='cv-upload']",
-                    "//input[@type='file' and contains(@accept, '.pdf')]"
-                ]
-            },
-            {
-                "name": "Lettre de motivation", 
-                "file_path": lm_path,
-                "selectors": [
-                    "input[type='file'][data-testid='lm-upload']",
-                    "input[type='file'][accept='.docx,.pdf']:not(:first-child)",
-                    "//input[@type='file'][position()>1]"
-                ]
-            }
+            {"name": name, "file_path": document_files.get(name), "selectors": locators}
+            for name, locators in SITE_PROFILE.application.documents
         ]
         
         # Upload des documents depuis le dossier centralisé
         for doc_type in document_types:
-            if doc_type["file_path"] and os.path.exists(doc_type["file_path"]):
-                logger.info(f"📁 Fichier {doc_type['name']} détecté : {doc_type['file_path']}")
+            if doc_type["file_path"]:
+                logger.info("📁 Fichier %s détecté : %s", doc_type['name'], doc_type['file_path'])
                 
                 # Chercher le champ d'upload pour ce type de document
                 upload_field = None
-                for selector in doc_type["selectors"]:
+                for locator in doc_type["selectors"]:
                     try:
-                        if selector.startswith("//"): # XPath
-                            upload_field = driver.find_element(By.XPATH, selector)
-                        else: # CSS
-                            upload_field = driver.find_element(By.CSS_SELECTOR, selector)
+                        upload_field = driver.find_element(*locator)
                         
                         if upload_field and upload_field.is_displayed():
                             break
                     except NoSuchElementException:
                         continue
                     except Exception as e:
-                        logger.debug(f"Erreur lors de la recherche du champ {doc_type['name']}: {str(e)[:100]}...")
+                        logger.debug("Erreur lors de la recherche du champ %s: %s...", doc_type['name'], str(e)[:100])
                         continue
                 
                 # Uploader le fichier si un champ est trouvé
@@ -286,32 +228,32 @@ def remplir_formulaire_candidature(driver, user_data, titre_offre):
                         
                         # Uploader le fichier
                         upload_field.send_keys(doc_type["file_path"])
-                        logger.info(f"✅ {doc_type['name']} uploadé avec succès : {os.path.basename(doc_type['file_path'])}")
+                        logger.info("✅ %s uploadé avec succès : %s", doc_type['name'], os.path.basename(doc_type['file_path']))
                         
                         # Pause pour laisser le temps au site de traiter le fichier
                         time.sleep(2)
                         
                     except Exception as e:
-                        logger.warning(f"⚠️ Impossible d'uploader le {doc_type['name']} : {e}")
+                        logger.warning("⚠️ Impossible d'uploader le %s : %s", doc_type['name'], e)
                         driver.save_screenshot(f"debug_screenshots/erreur_upload_{doc_type['name'].replace(' ', '_')}_{titre_offre.replace(' ', '_')}.png")
+                        # Sans CV la candidature ne part pas : échec passager, l'offre sera retentée
+                        if doc_type["name"] == "CV":
+                            return resultat(Outcome.UPLOAD_FAILED, str(e))
                 else:
-                    logger.info(f"ℹ️ Aucun champ d'upload trouvé pour {doc_type['name']} - le document du profil sera peut-être utilisé automatiquement")
+                    logger.info("ℹ️ Aucun champ d'upload trouvé pour %s - le document du profil sera peut-être utilisé automatiquement", doc_type['name'])
             else:
-                logger.warning(f"⚠️ Fichier {doc_type['name']} non trouvé dans le dossier centralisé")
+                logger.warning("⚠️ Fichier %s non trouvé dans le dossier centralisé", doc_type['name'])
         
         # Vérifier si des champs d'upload sont présents et les mettre en évidence pour débogage
         for doc_type in document_types:
-            for selector in doc_type["selectors"]:
+            for locator in doc_type["selectors"]:
                 try:
-                    if selector.startswith("//"): # XPath
-                        upload_field = driver.find_element(By.XPATH, selector)
-                    else: # CSS
-                        upload_field = driver.find_element(By.CSS_SELECTOR, selector)
+                    upload_field = driver.find_element(*locator)
                     
                     # Si un champ est trouvé, vérifier s'il est obligatoire ou si le système utilise déjà le document associé au profil
                     if upload_field:
                         is_required = upload_field.get_attribute("required") == "true" or upload_field.get_attribute("aria-required") == "true"
-                        logger.info(f"Champ d'upload pour {doc_type['name']} détecté (obligatoire: {is_required})")
+                        logger.info("Champ d'upload pour %s détecté (obligatoire: %s)", doc_type['name'], is_required)
                         
                         # Mettre en évidence le champ pour débogage
                         driver.execute_script("arguments[0].style.border='2px dashed blue'; arguments[0].style.backgroundColor='rgba(0,0,255,0.1)'", upload_field)
@@ -319,40 +261,31 @@ def remplir_formulaire_candidature(driver, user_data, titre_offre):
                         # Vérifier si le système a automatiquement associé le document du profil utilisateur
                         try:
                             confirmation_text = driver.find_element(By.XPATH, f"//div[contains(text(), '{doc_type['name']}') and contains(text(), 'chargé')]")
-                            logger.info(f"✅ Confirmation que le {doc_type['name']} du profil utilisateur est bien utilisé")
+                            logger.info("✅ Confirmation que le %s du profil utilisateur est bien utilisé", doc_type['name'])
                         except NoSuchElementException:
                             if is_required:
-                                logger.warning(f"⚠️ Le {doc_type['name']} semble obligatoire mais n'est pas automatiquement associé depuis le profil")
+                                logger.warning("⚠️ Le %s semble obligatoire mais n'est pas automatiquement associé depuis le profil", doc_type['name'])
                             else:
-                                logger.debug(f"Pas de confirmation explicite pour l'utilisation du {doc_type['name']} du profil")
+                                logger.debug("Pas de confirmation explicite pour l'utilisation du %s du profil", doc_type['name'])
                         break
                 except NoSuchElementException:
                     continue
                 except Exception as e:
-                    logger.debug(f"Erreur lors de la vérification du champ d'upload pour {doc_type['name']}: {str(e)[:100]}...")
+                    logger.debug("Erreur lors de la vérification du champ d'upload pour %s: %s...", doc_type['name'], str(e)[:100])
                     continue
         
         # Gestion des cases à cocher (consentement) avec les sélecteurs précis
-        checkbox_selectors = [
-            ".chakra-checkbox input[type='checkbox']",  # Sélecteur basé sur la structure fournie
-            "input.chakra-checkbox__input",  # Classe spécifique
-            "input[type='checkbox']",  # Sélecteur générique
-            "//label[contains(@class, 'chakra-checkbox')]/input",  # XPath par label parent
-        ]
+        checkbox_selectors = SITE_PROFILE.application.consent_checkboxes
         
-        print('Recherche et activation des cases à cocher...')
         logger.info("Recherche et activation des cases à cocher...")
         checkboxes_found = False
-        for selector in checkbox_selectors:
+        for locator in checkbox_selectors:
             try:
-                if selector.startswith("//"):  # XPath
-                    checkboxes = driver.find_elements(By.XPATH, selector)
-                else:  # CSS
-                    checkboxes = driver.find_elements(By.CSS_SELECTOR, selector)
+                checkboxes = driver.find_elements(*locator)
                 
                 if checkboxes:
                     checkboxes_found = True
-                    logger.info(f"{len(checkboxes)} cases à cocher trouvées")
+                    logger.info("%s cases à cocher trouvées", len(checkboxes))
                     
                     for i, checkbox in enumerate(checkboxes):
                         try:
@@ -365,13 +298,13 @@ def remplir_formulaire_candidature(driver, user_data, titre_offre):
                                 # Sinon, essayer avec JavaScript directement sur la case
                                 driver.execute_script("arguments[0].click();", checkbox)
                             
-                            logger.info(f"✅ Case à cocher {i+1} activée")
+                            logger.info("✅ Case à cocher %s activée", i+1)
                             time.sleep(0.5)  # Courte pause entre chaque clic
                         except Exception as checkbox_error:
-                            logger.warning(f"⚠️ Erreur lors du clic sur la case {i+1}: {str(checkbox_error)[:100]}...")
+                            logger.warning("⚠️ Erreur lors du clic sur la case %s: %s...", i+1, str(checkbox_error)[:100])
                     break
             except Exception as e:
-                logger.debug(f"Sélecteur {selector} pour cases à cocher non trouvé: {str(e)[:100]}...")
+                logger.debug("Sélecteur %s pour cases à cocher non trouvé: %s...", locator.value, str(e)[:100])
                 
         if not checkboxes_found:
             logger.warning("⚠️ Aucune case à cocher trouvée - possible changement dans la structure du formulaire")
@@ -389,34 +322,18 @@ def remplir_formulaire_candidature(driver, user_data, titre_offre):
                     continue
             logger.info("✅ Cases à cocher activées")
         except Exception as e:
-            logger.warning(f"Impossible de cocher les cases: {e}")
+            logger.warning("Impossible de cocher les cases: %s", e)
         
         # Option pour envoyer automatiquement la candidature
         if AUTO_ENVOYER_CANDIDATURE:
             try:
-                # Liste de sélecteurs pour le bouton d'envoi final
-                submit_selectors = [
-                    # AJOUT : Sélecteur précis du bouton final fourni par l'utilisateur
-                    "button[data-testid='candidature-not-sent'][type='submit']",
-                    "button[data-tracking-id='postuler-offre-lba'][type='submit']",
-                    "button[data-testid='candidature-not-sent']",
-                    "button[data-tracking-id='postuler-offre-lba']",
-                    "button[type='submit']",
-                    ".fr-btn--submit",
-                    "button.chakra-button[type='submit']",
-                    "//button[contains(., 'J\'envoie ma candidature')]",
-                    "//button[contains(., 'Envoyer')]",
-                    "//button[contains(., 'Soumettre')]",
-                    "//button[@type='submit']"
-                ]
+                # Sélecteurs du bouton d'envoi final (profil de site)
+                submit_selectors = SITE_PROFILE.application.submit_buttons
                 
                 submit_button = None
-                for selector in submit_selectors:
+                for locator in submit_selectors:
                     try:
-                        if selector.startswith("/"):
-                            submit_button = wait.until(EC.element_to_be_clickable((By.XPATH, selector)))
-                        else:
-                            submit_button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
+                        submit_button = wait.until(EC.element_to_be_clickable(locator))
                         if submit_button:
                             break
                     except Exception:
@@ -444,162 +361,123 @@ def remplir_formulaire_candidature(driver, user_data, titre_offre):
                     """
                     submit_button = driver.execute_script(js)
                 
+                # L'envoi est suivi dès avant le clic (réponse HTTP ou message de la page)
+                watch = SubmissionWatch(driver)
+                envoi = None
                 if submit_button:
                     logger.info("Soumission du formulaire de candidature...")
                     driver.execute_script("arguments[0].style.border='3px solid red';arguments[0].scrollIntoView();", submit_button)
                     driver.save_screenshot(f"debug_screenshots/avant_soumission_{titre_offre.replace(' ', '_')}.png")
                     
-                    # Cliquer sur le bouton
+                    clic_envoi = True
+                    watch.arm()
                     submit_button.click()
-                    logger.info(f"✅ Clic sur le bouton de soumission effectué")
-                    
-                    # AJOUT : Vérification si la candidature a bien été envoyée
-                    logger.info("Vérification de l'envoi de la candidature...")
-                    try:
-                        # Attendre un peu pour que la page se mette à jour
-                        time.sleep(3)
-                        
-                        # Chercher des messages de confirmation/succès
-                        success_indicators = [
-                            # Messages de succès en français
-                            "//div[contains(text(), 'Candidature envoyée')]",
-                            "//div[contains(text(), 'Votre candidature a été envoyée')]",
-                            "//div[contains(text(), 'Merci pour votre candidature')]",
-                            "//div[contains(text(), 'Candidature transmise')]",
-                            "//div[contains(text(), 'succès')]",
-                            # Classes CSS de succès
-                            ".fr-alert--success",
-                            ".chakra-alert[status='success']",
-                            ".success-message",
-                            # Attributs data-testid de confirmation
-                            "[data-testid*='success']",
-                            "[data-testid*='confirmation']",
-                            # Messages génériques
-                            "//div[contains(@class, 'success')]",
-                            "//div[@role='alert' and contains(@class, 'success')]"
-                        ]
-                        
-                        candidature_envoyee = False
-                        for indicator in success_indicators:
-                            try:
-                                if indicator.startswith("//"):  # XPath
-                                    confirmation = driver.find_element(By.XPATH, indicator)
-                                else:  # CSS
-                                    confirmation = driver.find_element(By.CSS_SELECTOR, indicator)
-                                
-                                if confirmation and confirmation.is_displayed():
-                                    confirmation_text = confirmation.text.strip()
-                                    logger.info(f"✅ CONFIRMATION D'ENVOI DÉTECTÉE: '{confirmation_text}'")
-                                    candidature_envoyee = True
-                                    # Mettre en évidence le message de confirmation
-                                    driver.execute_script("arguments[0].style.border='3px solid green';", confirmation)
-                                    driver.save_screenshot(f"debug_screenshots/confirmation_envoi_{titre_offre.replace(' ', '_')}.png")
-                                    break
-                            except:
-                                continue
-                        
-                        if not candidature_envoyee:
-                            # Vérifier si on a été redirigé vers une page de confirmation
-                            current_url = driver.current_url
-                            if "confirmation" in current_url.lower() or "success" in current_url.lower():
-                                logger.info(f"✅ REDIRECTION VERS PAGE DE CONFIRMATION: {current_url}")
-                                candidature_envoyee = True
-                                driver.save_screenshot(f"debug_screenshots/page_confirmation_{titre_offre.replace(' ', '_')}.png")
-                            else:
-                                logger.warning("⚠️ Aucune confirmation d'envoi détectée - la candidature a peut-être été envoyée mais sans message explicite")
-                                driver.save_screenshot(f"debug_screenshots/pas_de_confirmation_{titre_offre.replace(' ', '_')}.png")
-                        
-                        if candidature_envoyee:
-                            logger.info("🎉 CANDIDATURE ENVOYÉE AVEC SUCCÈS!")
-                        else:
-                            logger.info("ℹ️ Candidature probablement envoyée, mais pas de confirmation explicite détectée")
-                            
-                    except Exception as e:
-                        logger.warning(f"Erreur lors de la vérification de confirmation: {e}")
-                        driver.save_screenshot(f"debug_screenshots/erreur_verification_{titre_offre.replace(' ', '_')}.png")
-                    
-                    # Attendre une confirmation
-                    try:
-                        wait.until(lambda driver: EC.presence_of_element_located((By.CSS_SELECTOR, ".fr-alert--success")) or 
-                                  EC.presence_of_element_located((By.XPATH, "//div[contains(text(), 'Candidature envoyée')]")) or
-                                  EC.presence_of_element_located((By.XPATH, "//div[contains(text(), 'Merci')]")))
-                        logger.info(f"✅ Confirmation reçue - Candidature envoyée avec succès pour: {titre_offre}")
-                    except:
-                        logger.info(f"Pas de confirmation explicite, mais la candidature a probablement été envoyée pour: {titre_offre}")
+                    logger.info("✅ Clic sur le bouton de soumission effectué")
+                    envoi = watch.wait()
+                    log_submission(envoi, titre_offre)
+                    if envoi.confirmed:
+                        driver.save_screenshot(f"debug_screenshots/confirmation_envoi_{titre_offre.replace(' ', '_')}.png")
+                    elif envoi.outcome == UNCONFIRMED:
+                        driver.save_screenshot(f"debug_screenshots/pas_de_confirmation_{titre_offre.replace(' ', '_')}.png")
 
                 # --- AJOUT : Clic sur le bouton final d'envoi de candidature dans le modal ---
-                try:
-                    # --- AJOUT : Diagnostic des boutons présents dans le modal avant tentative de clic ---
+                final_clicked = False
+                # Inutile si le serveur a déjà répondu au premier envoi
+                if envoi is None or envoi.outcome == UNCONFIRMED:
                     try:
-                        logger.info("[DEBUG] Listing des boutons présents dans le modal avant tentative de clic sur le bouton final...")
-                        modal_buttons = driver.find_elements(By.CSS_SELECTOR, "button")
-                        for idx, btn in enumerate(modal_buttons):
+                        # --- AJOUT : Diagnostic des boutons présents dans le modal avant tentative de clic ---
+                        # Six allers-retours WebDriver par bouton : uniquement au niveau DEBUG
+                        if logger.isEnabledFor(logging.DEBUG):
                             try:
-                                btn_text = btn.text.strip()
-                                btn_id = btn.get_attribute('id')
-                                btn_class = btn.get_attribute('class')
-                                btn_type = btn.get_attribute('type')
-                                btn_data_testid = btn.get_attribute('data-testid')
-                                btn_data_tracking = btn.get_attribute('data-tracking-id')
-                                logger.info(f"[DEBUG] Bouton {idx}: text='{btn_text}', id='{btn_id}', class='{btn_class}', type='{btn_type}', data-testid='{btn_data_testid}', data-tracking-id='{btn_data_tracking}'")
+                                logger.debug("Listing des boutons présents dans le modal avant tentative de clic sur le bouton final...")
+                                modal_buttons = driver.find_elements(By.CSS_SELECTOR, "button")
+                                for idx, btn in enumerate(modal_buttons):
+                                    try:
+                                        btn_text = btn.text.strip()
+                                        btn_id = btn.get_attribute('id')
+                                        btn_class = btn.get_attribute('class')
+                                        btn_type = btn.get_attribute('type')
+                                        btn_data_testid = btn.get_attribute('data-testid')
+                                        btn_data_tracking = btn.get_attribute('data-tracking-id')
+                                        logger.debug("Bouton %s: text='%s', id='%s', class='%s', type='%s', data-testid='%s', data-tracking-id='%s'", idx, btn_text, btn_id, btn_class, btn_type, btn_data_testid, btn_data_tracking)
+                                    except Exception as e:
+                                        logger.debug("Impossible de lire les attributs du bouton %s: %s", idx, e)
                             except Exception as e:
-                                logger.info(f"[DEBUG] Impossible de lire les attributs du bouton {idx}: {e}")
-                    except Exception as e:
-                        logger.info(f"[DEBUG] Impossible de lister les boutons du modal: {e}")
-                    # --- FIN AJOUT ---
+                                logger.debug("Impossible de lister les boutons du modal: %s", e)
+                        # --- FIN AJOUT ---
 
-                    # Essayer le sélecteur ultra-précis en priorité
-                    try:
-                        ultra_precise_selector = "button[data-testid='candidature-not-sent'][type='submit'][data-tracking-id='postuler-offre-lba']"
-                        final_submit_btn = driver.find_element(By.CSS_SELECTOR, ultra_precise_selector)
-                        final_submit_btn.click()
-                        logger.info("✅ Clic sur le bouton final ultra-précis 'J'envoie ma candidature' effectué")
-                    except Exception as e:
-                        logger.warning(f"Impossible de cliquer sur le bouton final ultra-précis : {e}")
-                        # Fallback sur l'ancien sélecteur si besoin
+                        # Essayer le sélecteur ultra-précis en priorité
                         try:
-                            final_submit_btn = WebDriverWait(driver, 10).until(
-                                EC.element_to_be_clickable((By.CSS_SELECTOR, "button[data-testid='candidature-not-sent'][type='submit']"))
-                            )
+                            ultra_precise_selector = "button[data-testid='candidature-not-sent'][type='submit'][data-tracking-id='postuler-offre-lba']"
+                            final_submit_btn = driver.find_element(By.CSS_SELECTOR, ultra_precise_selector)
+                            clic_envoi = True
+                            watch.arm()
                             final_submit_btn.click()
-                            logger.info("✅ Clic sur le bouton final 'J'envoie ma candidature' dans le modal effectué (fallback)")
-                        except Exception as e2:
-                            logger.warning(f"Impossible de cliquer sur le bouton final d'envoi de candidature (fallback) : {e2}")
-                            logger.info("[DEBUG] Aucun bouton final cliquable détecté. Voir la liste des boutons ci-dessus pour diagnostic.")
-                except Exception as e:
-                    logger.warning(f"Impossible de cliquer sur le bouton final d'envoi de candidature : {e}")
+                            final_clicked = True
+                            logger.info("✅ Clic sur le bouton final ultra-précis 'J'envoie ma candidature' effectué")
+                        except Exception as e:
+                            logger.warning("Impossible de cliquer sur le bouton final ultra-précis : %s", e)
+                            # Fallback sur l'ancien sélecteur si besoin
+                            try:
+                                final_submit_btn = WebDriverWait(driver, 10).until(
+                                    EC.element_to_be_clickable((By.CSS_SELECTOR, "button[data-testid='candidature-not-sent'][type='submit']"))
+                                )
+                                clic_envoi = True
+                                watch.arm()
+                                final_submit_btn.click()
+                                final_clicked = True
+                                logger.info("✅ Clic sur le bouton final 'J'envoie ma candidature' dans le modal effectué (fallback)")
+                            except Exception as e2:
+                                logger.warning("Impossible de cliquer sur le bouton final d'envoi de candidature (fallback) : %s", e2)
+                                logger.debug("Aucun bouton final cliquable détecté. Voir la liste des boutons ci-dessus pour diagnostic.")
+                    except Exception as e:
+                        logger.warning("Impossible de cliquer sur le bouton final d'envoi de candidature : %s", e)
                 # --- FIN AJOUT ---
                     
-                # --- AJOUT : Pause pour inspection manuelle juste avant le clic final ---
-                logger.info('[DEBUG] Pause de 10 secondes avant le clic sur le bouton final pour inspection manuelle...')
-                time.sleep(10)
-                # --- FIN AJOUT ---
+                if final_clicked:
+                    envoi = watch.wait()
+                    log_submission(envoi, titre_offre)
 
-                return {"status": "soumis"}
+                if envoi is None:
+                    return resultat(Outcome.SEND_BUTTON_NOT_FOUND)
+                outcome = outcome_for_submission(envoi)
+                raison = "" if outcome.succeeded else f"{outcome.label} ({envoi.http_status or envoi.detail})"
+                return resultat(outcome, raison, confirmation=envoi.outcome, http_status=envoi.http_status,
+                                duree_confirmation=round(envoi.elapsed, 2))
                     
             except Exception as e:
-                logger.warning(f"Erreur lors de la soumission du formulaire: {e}")
+                logger.warning("Erreur lors de la soumission du formulaire: %s", e)
                 driver.save_screenshot(f"debug_screenshots/erreur_soumission_{titre_offre.replace(' ', '_')}.png")
-                return {"status": "formulaire_rempli", "soumission": "echec", "raison": str(e)}
+                return resultat(Outcome.SUBMIT_TIMEOUT if clic_envoi else Outcome.PAGE_ERROR_BEFORE_SUBMIT, str(e))
         else:
             logger.info("Formulaire rempli avec succès, en attente de confirmation manuelle pour l'envoi")
-            return {"status": "formulaire_rempli", "soumission": "en_attente"}
+            return resultat(Outcome.FORM_FILLED)
             
     except Exception as e:
-        logger.error(f"Erreur lors du remplissage du formulaire: {e}")
+        logger.error("Erreur lors du remplissage du formulaire: %s", e)
         driver.save_screenshot(f"debug_screenshots/erreur_remplissage_{titre_offre.replace(' ', '_')}.png")
-        return {"status": "echec", "raison": str(e)}
+        return resultat(Outcome.PAGE_ERROR if clic_envoi else Outcome.PAGE_ERROR_BEFORE_SUBMIT, str(e))
 
-def postuler_offre(driver, url_offre, titre_offre, user_data=None):
-    """Ouvre l'offre et postule en remplissant le formulaire"""
+def postuler_offre(driver, url_offre, titre_offre, user_data=None, onglet=None, message=None):
+    """
+    Ouvre l'offre et postule en remplissant le formulaire.
+    Si ``onglet`` est fourni (onglet déjà préchargé par OfferPrefetcher), il est réutilisé.
+    ``message`` est le message personnalisé déjà rendu pour cette offre.
+    """
+    prepare_environment()
+    clic_envoi = False
     try:
         # Log détaillé
-        logger.info(f"=== DÉBUT POSTULATION pour: {titre_offre} - {url_offre} ===") 
-        # Ouvrir l'URL dans un nouvel onglet
-        driver.execute_script(f"window.open('{url_offre}', '_blank');")
-        
-        # Basculer vers le nouvel onglet
-        driver.switch_to.window(driver.window_handles[-1])
+        logger.info("=== DÉBUT POSTULATION pour: %s - %s ===", titre_offre, url_offre) 
+        if onglet:
+            # Page déjà chargée en arrière-plan
+            driver.switch_to.window(onglet)
+        else:
+            # Ouvrir l'URL dans un nouvel onglet
+            driver.execute_script("window.open(arguments[0], '_blank');", url_offre)
+            
+            # Basculer vers le nouvel onglet
+            driver.switch_to.window(driver.window_handles[-1])
         
         # Attendre que la page soit chargée
         wait = WebDriverWait(driver, 15)
@@ -607,122 +485,68 @@ def postuler_offre(driver, url_offre, titre_offre, user_data=None):
         # --- AJOUT : Clic robuste sur le bouton 'J\'envoie ma candidature' (data-testid='postuler-button') ---
         
         try:
-            print("Recherche du bouton 'J'envoie ma candidature' (data-testid='postuler-button')...")
+            logger.info("Recherche du bouton 'J'envoie ma candidature' (data-testid='postuler-button')...")
             postuler_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button[data-testid='postuler-button']")))
             driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", postuler_btn)
             time.sleep(0.5)
             try:
                 postuler_btn.click()
-                print("✅ Clic standard sur 'J'envoie ma candidature' effectué")
                 logger.info("✅ Clic standard sur 'J'envoie ma candidature' effectué")
             except Exception as e:
-                print(f"⚠️ Clic standard échoué : {e}, tentative via JavaScript...")
-                logger.warning(f"Clic standard échoué : {e}, tentative via JavaScript...")
+                logger.warning("Clic standard échoué : %s, tentative via JavaScript...", e)
                 try:
                     driver.execute_script("arguments[0].click();", postuler_btn)
-                    print("✅ Clic via JavaScript effectué")
                     logger.info("✅ Clic via JavaScript effectué")
                 except Exception as js_e:
-                    print(f"⚠️ Clic JS échoué : {js_e}, tentative via ActionChains...")
-                    logger.warning(f"Clic JS échoué : {js_e}, tentative via ActionChains...")
+                    logger.warning("Clic JS échoué : %s, tentative via ActionChains...", js_e)
                     try:
                         ActionChains(driver).move_to_element(postuler_btn).click().perform()
-                        print("✅ Clic via ActionChains effectué")
                         logger.info("✅ Clic via ActionChains effectué")
                     except Exception as ac_e:
-                        print(f"❌ Toutes les tentatives de clic ont échoué : {ac_e}")
-                        logger.error(f"Toutes les tentatives de clic ont échoué : {ac_e}")
+                        logger.error("Toutes les tentatives de clic ont échoué : %s", ac_e)
                         driver.save_screenshot("debug_screenshots/echec_clic_postuler_btn.png")
         except Exception as e:
-            print(f"❌ Bouton 'J'envoie ma candidature' non trouvé ou non cliquable : {e}")
-            logger.error(f"Bouton 'J'envoie ma candidature' non trouvé ou non cliquable : {e}")
+            logger.error("Bouton 'J'envoie ma candidature' non trouvé ou non cliquable : %s", e)
             driver.save_screenshot("debug_screenshots/postuler_btn_non_trouve.png")
         # --- FIN AJOUT ---
 
-        # Vérifier si c'est une candidature spontanée sans contact (impossible de postuler)
+        # Sonde unique de la page : tous les indicateurs de sortie anticipée sont évalués
+        # en un seul execute_script (voir page_signature.INDICATORS)
         try:
-            # Recherche des éléments spécifiques aux candidatures spontanées sans contact
-            candidature_spontanee_indicators = [
-                "//span[contains(@class, 'chakra-text') and contains(text(), 'CANDIDATURE SPONTANÉE')]",
-                "//div[contains(text(), \"Nous n'avons pas de contact pour cette entreprise\")]",
-                "//div[@data-sentry-component='NoCandidatureLba']"
-            ]
-            
-            for selector in candidature_spontanee_indicators:
-                elements = driver.find_elements(By.XPATH, selector)
-                if elements and elements[0].is_displayed():
-                    try:
-                        # Prendre une capture d'écran pour debug avec surbrillance
-                        driver.execute_script("arguments[0].style.border='3px solid red'", elements[0])
-                        screenshot_path = f"debug_screenshots/candidature_spontanee_sans_contact_{titre_offre.replace(' ', '_')}.png"
-                        driver.save_screenshot(screenshot_path)
-                        
-                        logger.warning(f"⚠️ Candidature spontanée sans contact détectée pour '{titre_offre}'. Impossible de postuler automatiquement. Offre ignorée.")
-                        logger.info(f"Capture d'écran sauvegardée: {screenshot_path}")
-                        
-                        # Ignorer cette offre et passer à la suivante
-                        return {"status": "ignoré", "raison": "Candidature spontanée sans contact direct"}
-                    except Exception as inner_e:
-                        logger.debug(f"Erreur lors de la capture d'écran pour candidature spontanée: {str(inner_e)}")
-                        return {"status": "ignoré", "raison": "Candidature spontanée sans contact direct (erreur capture)"}
+            signature = probe_page(driver)
+            logger.debug("Signature de la page: %r", signature)
         except Exception as e:
-            logger.debug(f"Erreur lors de la vérification de candidature spontanée: {str(e)}")
-        
-        # Ensuite vérifier s'il y a un bouton ou lien qui redirige vers un site externe
-        external_button_selectors = [
-            # Sélecteurs spécifiques pour Hellowork basés sur l'exemple reçu
-            "//a[@data-tracking-id='postuler-offre-job-partner']",
-            "//a[contains(@href, 'holeest.com/redirect')]",
-            "//a[contains(@href, 'hellowork.com')]",
-            
-            # Sélecteurs par texte pour les boutons et liens
-            "//button[contains(text(), 'Je postule sur Hellowork')]",
-            "//button[contains(., 'Je postule sur Hellowork')]",
-            "//a[contains(text(), 'Je postule sur Hellowork')]",
-            "//a[contains(., 'Je postule sur Hellowork')]",
-            
-            # Sélecteurs génériques pour d'autres plateformes externes
-            "//button[contains(text(), 'Postuler sur')]",
-            "//button[contains(., 'Postuler sur')]",
-            "//button[contains(text(), 'Je postule sur')]",
-            "//a[contains(text(), 'Je postule sur')]",
-            "//a[contains(text(), 'Postuler sur')]"
-        ]
+            logger.debug("Erreur lors de la sonde de la page: %s...", str(e)[:100])
+            signature = PageSignature()
         
-        # Vérifier si un bouton de redirection externe existe
-        for selector in external_button_selectors:
+        # Vérifier si c'est une candidature spontanée sans contact (impossible de postuler)
+        if signature.matches(NO_CONTACT_MASK):
             try:
-                external_button = driver.find_element(By.XPATH, selector)
-                if external_button:
-                    button_text = external_button.text.strip()
-                    logger.warning(f"⚠️ Détection d'une redirection externe: '{button_text}' - Offre ignorée")
-                    driver.save_screenshot(f"debug_screenshots/redirection_externe_{titre_offre.replace(' ', '_')}.png")
-                    return {"status": "ignoré", "raison": f"Redirection vers un site externe: {button_text}"}
-            except NoSuchElementException:
-                continue
-            except Exception as e:
-                logger.debug(f"Erreur lors de la recherche des boutons externes: {str(e)[:100]}...")
+                screenshot_path = f"debug_screenshots/candidature_spontanee_sans_contact_{titre_offre.replace(' ', '_')}.png"
+                driver.save_screenshot(screenshot_path)
+                logger.warning("⚠️ Candidature spontanée sans contact détectée pour '%s'. Impossible de postuler automatiquement. Offre ignorée.", titre_offre)
+                logger.info("Capture d'écran sauvegardée: %s", screenshot_path)
+                return resultat(Outcome.NO_CONTACT)
+            except Exception as inner_e:
+                logger.debug("Erreur lors de la capture d'écran pour candidature spontanée: %s", str(inner_e))
+                return resultat(Outcome.NO_CONTACT)
+        
+        # Ensuite vérifier s'il y a un bouton ou lien qui redirige vers un site externe
+        if signature.matches(EXTERNAL_MASK):
+            button_text = signature.text(EXTERNAL_MASK)
+            logger.warning("⚠️ Détection d'une redirection externe: '%s' - Offre ignorée", button_text)
+            driver.save_screenshot(f"debug_screenshots/redirection_externe_{titre_offre.replace(' ', '_')}.png")
+            return resultat(Outcome.EXTERNAL_REDIRECT, f"Redirection vers un site externe: {button_text}")
         
         # Tenter de trouver et cliquer sur le bouton de candidature
         # Multiples sélecteurs pour maximiser les chances
-        selectors = [
-            "button[data-tracking-id='postuler-offre-lba']",
-            "button:contains('J'envoie ma candidature')",
-            "//button[contains(., 'J'envoie ma candidature')]",
-            ".fr-btn[type='button']",
-            "//button[contains(., 'Je candidate')]",
-            "//button[contains(., 'Candidater')]",
-            "a.fr-btn",
-            ".send-application-button"
-        ]
+        selectors = SITE_PROFILE.application.apply_buttons
         
         bouton_trouve = False
-        for selector in selectors:
+        for locator in selectors:
             try:
-                if selector.startswith("//"):  # XPath
-                    bouton = wait.until(EC.element_to_be_clickable((By.XPATH, selector)))
-                elif ":contains(" in selector:  # Sélecteur jQuery
-                    texte = selector.split(":contains('")[1].split("')")[0]
+                if locator.by == BY_TEXT:  # Recherche du bouton par son texte
+                    texte = locator.value
                     js = f"""
                     var buttons = document.querySelectorAll('button');
                     for (var i = 0; i < buttons.length; i++) {{
@@ -735,25 +559,25 @@ def postuler_offre(driver, url_offre, titre_offre, user_data=None):
                     bouton = driver.execute_script(js)
                     
                     # Vérifier que ce n'est pas un bouton vers un site externe
-                    if bouton and ("Je postule sur" in bouton.text or "Postuler sur" in bouton.text):
-                        logger.warning(f"⚠️ Détection d'une redirection externe: '{bouton.text}' - Offre ignorée")
+                    if bouton and any(t in bouton.text for t in SITE_PROFILE.application.external_button_texts):
+                        logger.warning("⚠️ Détection d'une redirection externe: '%s' - Offre ignorée", bouton.text)
                         driver.save_screenshot(f"debug_screenshots/redirection_externe_{titre_offre.replace(' ', '_')}.png")
-                        return {"status": "ignoré", "raison": f"Redirection vers un site externe: {bouton.text}"}
+                        return resultat(Outcome.EXTERNAL_REDIRECT, f"Redirection vers un site externe: {bouton.text}")
                     if bouton:
                         wait.until(EC.element_to_be_clickable((By.XPATH, f"//button[contains(., '{texte}')]")))
-                else:  # Sélecteur CSS
-                    bouton = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
+                else:
+                    bouton = wait.until(EC.element_to_be_clickable(locator))
                 
                 if bouton:
                     # Vérifier si c'est un bouton qui redirige vers un site externe
                     if hasattr(bouton, 'text'):
                         bouton_text = bouton.text.strip()
-                        if "Je postule sur" in bouton_text or "Postuler sur" in bouton_text:
-                            logger.warning(f"⚠️ Détection d'une redirection externe: '{bouton_text}' - Offre ignorée")
+                        if any(t in bouton_text for t in SITE_PROFILE.application.external_button_texts):
+                            logger.warning("⚠️ Détection d'une redirection externe: '%s' - Offre ignorée", bouton_text)
                             driver.save_screenshot(f"debug_screenshots/redirection_externe_{titre_offre.replace(' ', '_')}.png")
-                            return {"status": "ignoré", "raison": f"Redirection vers un site externe: {bouton_text}"}
+                            return resultat(Outcome.EXTERNAL_REDIRECT, f"Redirection vers un site externe: {bouton_text}")
                     
-                    logger.info(f"✅ Bouton 'J'envoie ma candidature' trouvé")
+                    logger.info("✅ Bouton 'J'envoie ma candidature' trouvé")
                     # Mettre en évidence le bouton pour le débogage
                     driver.execute_script("arguments[0].style.border='3px solid red';", bouton)
                     
@@ -766,7 +590,7 @@ def postuler_offre(driver, url_offre, titre_offre, user_data=None):
                     bouton_trouve = True
                     break
             except Exception as e:
-                logger.debug(f"Sélecteur {selector} non trouvé: {e}")
+                logger.debug("Sélecteur %s non trouvé: %s", locator.value, e)
         
         if not bouton_trouve:
             # Essayer un dernier recours avec JavaScript pour trouver des éléments interactifs
@@ -791,53 +615,46 @@ def postuler_offre(driver, url_offre, titre_offre, user_data=None):
                 """
                 js_bouton = driver.execute_script(js)
                 if js_bouton:
-                    logger.info(f"✅ Bouton trouvé via recherche JavaScript avancée: {js_bouton.text if hasattr(js_bouton, 'text') else 'sans texte'}")
+                    logger.info("✅ Bouton trouvé via recherche JavaScript avancée: %s", js_bouton.text if hasattr(js_bouton, 'text') else 'sans texte')
                     driver.execute_script("arguments[0].style.border='3px solid red';", js_bouton)
                     driver.save_screenshot(f"debug_screenshots/bouton_js_trouve_{titre_offre.replace(' ', '_')}.png")
                     js_bouton.click()
                     bouton_trouve = True
                 else:
-                    logger.warning(f"❌ Impossible de trouver le bouton de candidature pour {titre_offre}")
+                    logger.warning("❌ Impossible de trouver le bouton de candidature pour %s", titre_offre)
                     driver.save_screenshot(f"debug_screenshots/bouton_candidature_non_trouve_{titre_offre.replace(' ', '_')}.png")
-                    return {"status": "echec", "raison": "bouton_non_trouve"}
+                    return resultat(Outcome.APPLY_BUTTON_NOT_FOUND)
             except Exception as e:
-                logger.warning(f"❌ Impossible de trouver le bouton de candidature pour {titre_offre}")
-                logger.debug(f"Erreur lors de la recherche avancée: {str(e)}")
+                logger.warning("❌ Impossible de trouver le bouton de candidature pour %s", titre_offre)
+                logger.debug("Erreur lors de la recherche avancée: %s", str(e))
                 driver.save_screenshot(f"debug_screenshots/bouton_candidature_non_trouve_{titre_offre.replace(' ', '_')}.png")
-                return {"status": "echec", "raison": "bouton_non_trouve"}
+                return resultat(Outcome.APPLY_BUTTON_NOT_FOUND)
         
         # Attendre l'apparition du formulaire de candidature
-        form_selectors = [
-            "form",
-            ".chakra-modal__body form",
-            "//form"
-        ]
+        form_selectors = SITE_PROFILE.application.form_selectors
         
         form_trouve = False
-        for selector in form_selectors:
+        for locator in form_selectors:
             try:
-                if selector.startswith("//"):  # XPath
-                    wait.until(EC.presence_of_element_located((By.XPATH, selector)))
-                else:  # Sélecteur CSS
-                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+                wait.until(EC.presence_of_element_located(locator))
                 
-                logger.info(f"✅ Formulaire de candidature détecté avec le sélecteur {selector}")
+                logger.info("✅ Formulaire de candidature détecté avec le sélecteur %s", locator.value)
                 form_trouve = True
                 break
             except Exception as e:
-                logger.debug(f"Sélecteur de formulaire {selector} non trouvé: {e}")
+                logger.debug("Sélecteur de formulaire %s non trouvé: %s", locator.value, e)
         
         if not form_trouve:
-            logger.warning(f"❌ Formulaire de candidature non trouvé pour {titre_offre}")
+            logger.warning("❌ Formulaire de candidature non trouvé pour %s", titre_offre)
             driver.save_screenshot(f"debug_screenshots/formulaire_non_trouve_{titre_offre.replace(' ', '_')}.png")
-            return {"status": "echec", "raison": "formulaire_non_trouve"}
+            return resultat(Outcome.FORM_NOT_FOUND)
         
         # Formulaire détecté avec succès
-        logger.info(f"✅ Candidature initiée pour: {titre_offre}")
+        logger.info("✅ Candidature initiée pour: %s", titre_offre)
         driver.save_screenshot(f"debug_screenshots/formulaire_candidature_{titre_offre.replace(' ', '_')}.png")
         
         # Remplir automatiquement le formulaire si l'option est activée
-        result = {"status": "succes"}
+        result = resultat(Outcome.FORM_FILLED)
         if AUTO_REMPLIR_FORMULAIRE:
             # Utiliser les données utilisateur passées en paramètre (depuis le frontend)
             # Ne pas écraser user_data avec des valeurs hardcodées
@@ -849,7 +666,12 @@ def postuler_offre(driver, url_offre, titre_offre, user_data=None):
                     'email': 'jean.dupont@example.com',
                     'telephone': '0612345678'
                 }
-            result = remplir_formulaire_candidature(driver, user_data, titre_offre)
+            result = remplir_formulaire_candidature(driver, user_data, titre_offre, message)
+            outcome = outcome_of(result)
+            clic_envoi = outcome.sent
+            if not outcome.succeeded and outcome is not Outcome.FORM_FILLED:
+                logger.warning("❌ Candidature non envoyée pour %s: %s", titre_offre, result.get("raison", outcome.label))
+                return result
         
         # Pause avant soumission si activé
         if PAUSE_AVANT_ENVOI:
@@ -857,77 +679,27 @@ def postuler_offre(driver, url_offre, titre_offre, user_data=None):
             time.sleep(5)  # Attente pour inspection manuelle
         
         # Si l'envoi automatique est activé, soumettre le formulaire
+        envoi = None
         if AUTO_ENVOYER_CANDIDATURE:
             logger.info("Recherche du bouton d'envoi de candidature...")
             
             # Sélecteurs pour le bouton "J'envoie ma candidature" avec différentes méthodes
             candidature_button = None
             button_found = False
-            external_site_redirect = False
-            
-            # Vérifier d'abord s'il y a un bouton qui redirige vers un site externe
-            external_button_selectors = [
-                "//button[contains(text(), 'Je postule sur Hellowork')]",
-                "//button[contains(., 'Je postule sur Hellowork')]",
-                "//button[contains(text(), 'Postuler sur')]",
-                "//button[contains(., 'Postuler sur')]",
-                "//button[contains(text(), 'Je postule sur')]",
-                "//a[contains(text(), 'Je postule sur')]",
-                "//a[contains(text(), 'Postuler sur')]"
-            ]
-            
-            # Vérifier si un bouton de redirection externe existe
-            for selector in external_button_selectors:
-                try:
-                    external_button = driver.find_element(By.XPATH, selector)
-                    if external_button:
-                        button_text = external_button.text.strip()
-                        logger.warning(f"⚠️ Détection d'une redirection externe: '{button_text}' - Offre ignorée")
-                        driver.save_screenshot(f"debug_screenshots/redirection_externe_{titre_offre.replace(' ', '_')}.png")
-                        external_site_redirect = True
-                        break
-                except NoSuchElementException:
-                    continue
-                except Exception as e:
-                    logger.debug(f"Erreur lors de la recherche des boutons externes: {str(e)[:100]}...")
+            submit_button_found = False
             
-            # Si une redirection externe est détectée, on arrête la postulation
-            if external_site_redirect:
-                return {"status": "ignoré", "raison": "Redirection vers un site externe"}
-            
-            # Sinon, on recherche le bouton standard de candidature
-            button_selectors = [
-                # Sélecteurs précis par data-testid
-                "button[data-testid='apply-button']",
-                "button.fr-btn--secondary[data-testid='apply-button']", 
-                
-                # Sélecteurs basés sur le texte des boutons (différentes variantes possibles)
-                "//button[contains(text(), \"J'envoie ma candidature\")]",
-                "//button[contains(text(), \"Je postule\")]",
-                "//button[contains(., \"J'envoie ma candidature\")]",
-                "//button[contains(., \"Je postule\")]",
-                
-                # Sélecteurs génériques de boutons avec des classes potentielles
-                "button.fr-btn--secondary",
-                "button.chakra-button",
-                "button.fr-btn",
-                
-                # Sélecteurs encore plus génériques si tout échoue
-                "button[type='button']",
-                "//button"
-            ]
+            # Les redirections externes ont déjà été écartées plus haut à partir de la signature
+            # de la page : on recherche directement le bouton standard de candidature
+            button_selectors = SITE_PROFILE.application.send_buttons
             
             # Rechercher le bouton "J'envoie ma candidature" avec différentes méthodes
-            for selector in button_selectors:
+            for locator in button_selectors:
                 try:
-                    if selector.startswith("//"):  # XPath
-                        candidature_button = driver.find_element(By.XPATH, selector)
-                    else:  # CSS
-                        candidature_button = driver.find_element(By.CSS_SELECTOR, selector)
+                    candidature_button = driver.find_element(*locator)
                     
                     if candidature_button:
                         button_text = candidature_button.text.strip()
-                        logger.info(f"✅ Bouton 'J'envoie ma candidature' trouvé: '{button_text}'")
+                        logger.info("✅ Bouton 'J'envoie ma candidature' trouvé: '%s'", button_text)
                         button_found = True
                         # Capturer une image du bouton avant clic
                         driver.save_screenshot(f"debug_screenshots/bouton_envoi_trouve_{titre_offre.replace(' ', '_')}.png")
@@ -936,57 +708,33 @@ def postuler_offre(driver, url_offre, titre_offre, user_data=None):
                         time.sleep(1)  # Attendre que le scroll soit terminé
                         # Cliquer sur le bouton d'envoi
                         logger.info("Clic sur le bouton d'envoi de candidature...")
+                        clic_envoi = True
+                        watch = SubmissionWatch(driver).arm()
                         try:
                             # Méthode 1: clic standard
                             candidature_button.click()
                         except Exception as click_error:
-                            logger.debug(f"Clic standard a échoué: {str(click_error)[:100]}...")
+                            logger.debug("Clic standard a échoué: %s...", str(click_error)[:100])
                             try:
                                 # Méthode 2: clic via JavaScript
                                 driver.execute_script("arguments[0].click();", candidature_button)
                             except Exception as js_error:
-                                logger.debug(f"Clic JavaScript a échoué: {str(js_error)[:100]}...")
+                                logger.debug("Clic JavaScript a échoué: %s...", str(js_error)[:100])
                                 try:
                                     # Méthode 3: clic via Actions
                                     ActionChains(driver).move_to_element(candidature_button).click().perform()
                                 except Exception as action_error:
-                                    logger.error(f"Toutes les tentatives de clic ont échoué: {str(action_error)[:100]}...")
+                                    logger.error("Toutes les tentatives de clic ont échoué: %s...", str(action_error)[:100])
                                     driver.save_screenshot(f"debug_screenshots/erreur_clic_bouton_envoi_{titre_offre.replace(' ', '_')}.png")
-                        # Attendre un moment pour que la soumission soit traitée
-                        time.sleep(3)
-                        # Tenter de détecter une confirmation de succès
-                        try:
-                            success_indicators = [
-                                ".fr-alert--success",  # Alerte de succès
-                                "//div[contains(text(), 'Candidature envoyée')]",  # Message de confirmation
-                                "//p[contains(text(), 'succès')]",  # Texte contenant "succès"
-                                "//div[contains(@class, 'success')]",  # Classe contenant "success"
-                                "//div[@role='alert' and contains(@class, 'success')]",  # Alerte avec classe de succès
-                            ]
-                            success_found = False
-                            for indicator in success_indicators:
-                                try:
-                                    if indicator.startswith("//"):  # XPath
-                                        confirmation = driver.find_element(By.XPATH, indicator)
-                                    else:  # CSS
-                                        confirmation = driver.find_element(By.CSS_SELECTOR, indicator)
-                                    driver.execute_script("arguments[0].style.border='3px solid green';", confirmation)
-                                    success_found = True
-                                    logger.info(f"✅ Confirmation de candidature détectée: '{confirmation.text}'")
-                                    break
-                                except:
-                                    continue
-                            if success_found:
-                                logger.info("✅ CANDIDATURE ENVOYÉE AVEC SUCCÈS!")
-                                driver.save_screenshot(f"debug_screenshots/candidature_success_{titre_offre.replace(' ', '_')}.png")
-                            else:
-                                logger.info("ℹ️ Candidature probablement envoyée, mais pas de message de confirmation explicite détecté")
-                        except Exception as e:
-                            logger.debug(f"Erreur lors de la vérification de confirmation: {str(e)[:100]}...")
+                        # Confirmation dès la réponse du serveur ou le message de la page
+                        envoi = watch.wait()
+                        log_submission(envoi, titre_offre)
+                        if envoi.confirmed:
+                            driver.save_screenshot(f"debug_screenshots/candidature_success_{titre_offre.replace(' ', '_')}.png")
                         submit_button_found = True
                         break
                 except Exception as e:
-                    logger.debug(f"Sélecteur {selector} pour bouton d'envoi non trouvé: {str(e)[:100]}...")
+                    logger.debug("Sélecteur %s pour bouton d'envoi non trouvé: %s...", locator.value, str(e)[:100])
             
             if not submit_button_found:
                 logger.warning("❌ Aucun bouton d'envoi de candidature trouvé - vérifier la structure DOM")
@@ -1000,17 +748,27 @@ def postuler_offre(driver, url_offre, titre_offre, user_data=None):
             driver.save_screenshot(f"debug_screenshots/fin_processus_{titre_offre.replace(' ', '_')}.png")
             logger.info("✅ Capture d'écran finale effectuée")
         except Exception as e:
-            logger.debug(f"Impossible de prendre la capture d'écran finale: {str(e)[:100]}...")
+            logger.debug("Impossible de prendre la capture d'écran finale: %s...", str(e)[:100])
             
-        return {"status": "success", "formulaire_rempli": True, "formulaire_soumis": AUTO_ENVOYER_CANDIDATURE}
+        # Issue du dernier envoi observé (bouton d'envoi, sinon formulaire)
+        if envoi is not None:
+            outcome = outcome_for_submission(envoi)
+            raison = "" if outcome.succeeded else f"{outcome.label} ({envoi.http_status or envoi.detail})"
+            return resultat(outcome, raison, confirmation=envoi.outcome, http_status=envoi.http_status,
+                            duree_confirmation=round(envoi.elapsed, 2))
+        return result
         
     except Exception as e:
-        logger.error(f"❌ Erreur lors de la tentative de postulation pour {titre_offre}: {str(e)}")
+        logger.error("❌ Erreur lors de la tentative de postulation pour %s: %s", titre_offre, str(e))
         logger.error("Trace complète:", exc_info=True)
         driver.save_screenshot(f"debug_screenshots/erreur_postulation_{titre_offre.replace(' ', '_')}.png")
-        return {"status": "erreur", "raison": str(e)}
+        return resultat(Outcome.PAGE_ERROR if clic_envoi else Outcome.PAGE_ERROR_BEFORE_SUBMIT, str(e))
     finally:
-        # Revenir à l'onglet principal
-        if len(driver.window_handles) > 1:
-            driver.close()
-            driver.switch_to.window(driver.window_handles[0])
+        # Revenir à l'onglet principal ; un navigateur mort ici ne doit pas masquer l'issue
+        # déjà connue (le superviseur détecte la session perdue)
+        try:
+            if len(driver.window_handles) > 1:
+                driver.close()
+                driver.switch_to.window(driver.window_handles[0])
+        except Exception as e:
+            logger.warning("Retour à l'onglet principal impossible: %s", e)
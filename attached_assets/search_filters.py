@@ -0,0 +1,114 @@
+"""
+État des filtres de recherche (cases "Formations" / "Offres d'emploi").
+
+Une seule exécution de script dans la page lit les cases, clique celles qui ne
+sont pas dans l'état voulu (le clic natif passe par le gestionnaire onChange de
+React, contrairement à ``checked = false``), puis relit après le rendu suivant
+l'état du DOM et celui des props React. Le tout prend quelques millisecondes, à
+la place des sélecteurs successifs, des trois méthodes de clic et des pauses.
+"""
+
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+FORMATIONS = "formations"
+OFFRES = "offres"
+
+# arguments[0] : {nom_du_filtre: état voulu}. Renvoie {nom: {found, changed, checked, react}}
+FILTER_STATE_SCRIPT = """
+var desired = arguments[0];
+var done = arguments[arguments.length - 1];
+
+function labelText(box) {
+    if (box.labels && box.labels.length) return box.labels[0].textContent;
+    return box.parentElement ? box.parentElement.textContent : '';
+}
+
+function find(name) {
+    var exact = document.querySelector('input[type="checkbox"][name="' + name + '"]');
+    if (exact) return exact;
+    var stem = name.replace(/s$/, '');
+    var boxes = document.querySelectorAll('input[type="checkbox"]');
+    for (var i = 0; i < boxes.length; i++) {
+        var box = boxes[i];
+        var key = ((box.name || '') + ' ' + (box.id || '') + ' ' + labelText(box)).toLowerCase();
+        if (key.indexOf(stem) !== -1) return box;
+    }
+    return null;
+}
+
+function reactChecked(box) {
+    for (var key in box) {
+        if (key.indexOf('__reactProps$') === 0) return box[key] ? box[key].checked : null;
+    }
+    return null;
+}
+
+var boxes = {}, result = {};
+Object.keys(desired).forEach(function(name) {
+    var box = find(name);
+    boxes[name] = box;
+    result[name] = {found: !!box, changed: false};
+    if (box && box.checked !== desired[name]) {
+        box.click();
+        result[name].changed = true;
+    }
+});
+
+// Relire après le rendu React suivant
+requestAnimationFrame(function() {
+    setTimeout(function() {
+        Object.keys(boxes).forEach(function(name) {
+            var box = boxes[name];
+            if (!box) return;
+            result[name].checked = box.checked;
+            result[name].react = reactChecked(box);
+        });
+        done(result);
+    }, 0);
+});
+"""
+
+READ_FILTER_STATE_SCRIPT = """
+var names = arguments[0], state = {};
+names.forEach(function(name) {
+    var box = document.querySelector('input[type="checkbox"][name="' + name + '"]');
+    state[name] = box ? box.checked : null;
+});
+return state;
+"""
+
+
+def read_filter_state(driver, names=(FORMATIONS, OFFRES)):
+    """Renvoie {nom: coché (bool) ou None si la case est absente} pour le document courant."""
+    return driver.execute_script(READ_FILTER_STATE_SCRIPT, list(names))
+
+
+def set_filter_state(driver, formations=False, offres=None):
+    """
+    Applique l'état voulu des filtres dans le document courant (page ou iframe).
+    Un paramètre à None laisse le filtre inchangé. Renvoie True si chaque filtre
+    demandé a été trouvé et que le DOM comme l'état React reflètent la valeur voulue.
+    """
+    desired = {name: value for name, value in ((FORMATIONS, formations), (OFFRES, offres)) if value is not None}
+    start = time.perf_counter()
+    result = driver.execute_async_script(FILTER_STATE_SCRIPT, desired)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    ok = True
+    for name, value in desired.items():
+        state = result.get(name, {})
+        if not state.get("found"):
+            logger.warning("Filtre '%s' introuvable dans la page", name)
+            ok = False
+            continue
+        react = state.get("react")
+        if state.get("checked") != value or (react is not None and react != value):
+            logger.warning("Filtre '%s' non appliqué (DOM: %s, React: %s)", name, state.get('checked'), react)
+            ok = False
+        elif state.get("changed"):
+            logger.info("Filtre '%s' %s", name, 'coché' if value else 'décoché')
+    logger.info("État des filtres appliqué en %.0f ms: %s", elapsed_ms, desired)
+    return ok
@@ -0,0 +1,197 @@
+"""
+Profil de site versionné : sélecteurs et heuristiques des deux sites.
+
+Toutes les listes de sélecteurs, mots-clés et domaines utilisées par le scraper,
+la postulation et le préchargement sont décrites dans un seul fichier de données
+(site_profile.json, ou $AUTOMATION_SITE_PROFILE). Il est lu et compilé une seule
+fois à l'import : les sélecteurs deviennent des ``Locator`` (by, value) prêts à
+être passés à ``find_element(*locator)`` ou aux expected_conditions, les listes
+des tuples immuables. Un changement de structure d'un site se corrige donc dans
+le fichier de données, et les boucles n'allouent plus ces listes à chaque appel.
+"""
+
+import os
+import re
+import json
+from typing import NamedTuple, Tuple
+
+PROFILE_PATH = os.environ.get(
+    "AUTOMATION_SITE_PROFILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "site_profile.json"),
+)
+SUPPORTED_VERSIONS = (1,)
+
+# Valeurs de selenium.webdriver.common.by.By, recopiées pour que le profil se charge
+# sans importer Selenium (validation --dry-run du runner)
+BY_XPATH = "xpath"
+BY_CSS_SELECTOR = "css selector"
+# Pseudo-stratégie pour les sélecteurs "button:contains('texte')" (recherche par texte en JavaScript)
+BY_TEXT = "text"
+
+_CONTAINS = re.compile(r"^(\w+):contains\('(.*)'\)$")
+
+
+class Locator(NamedTuple):
+    by: str
+    value: str
+
+
+class KeywordSet(NamedTuple):
+    weight: int
+    terms: Tuple[str, ...]
+
+
+class SearchProfile(NamedTuple):
+    suggestion_selectors: Tuple[str, ...]
+
+
+class ResultsProfile(NamedTuple):
+    base_url: str
+    iframe_selectors: Tuple[str, ...]
+    card_selectors: Tuple[str, ...]
+    card_fallback_selector: str
+    card_min_text_length: int
+    card_tag_selector: str
+    title_selectors: Tuple[str, ...]
+    company_selectors: Tuple[str, ...]
+    company_exclusions: Tuple[str, ...]
+    location_selectors: Tuple[str, ...]
+    location_cities: Tuple[str, ...]
+    external_domains: Tuple[str, ...]
+
+
+class ClassificationProfile(NamedTuple):
+    explicit_marker_weight: int
+    formation_strong: KeywordSet
+    formation_weak: KeywordSet
+    entreprise_strong: KeywordSet
+    entreprise_weak: KeywordSet
+    formation_title_acronyms: KeywordSet
+    job_title_terms: KeywordSet
+
+
+class PageIndicators(NamedTuple):
+    no_contact: Tuple[str, ...]
+    no_contact_strict: Tuple[str, ...]
+    external: Tuple[str, ...]
+    apply: Tuple[str, ...]
+
+
+class ApplicationProfile(NamedTuple):
+    apply_buttons: Tuple[Locator, ...]
+    external_button_texts: Tuple[str, ...]
+    form_selectors: Tuple[Locator, ...]
+    fields: Tuple[Tuple[str, Tuple[Locator, ...]], ...]
+    documents: Tuple[Tuple[str, Tuple[Locator, ...]], ...]
+    consent_checkboxes: Tuple[Locator, ...]
+    submit_buttons: Tuple[Locator, ...]
+    send_buttons: Tuple[Locator, ...]
+    success_indicators: Tuple[Locator, ...]
+    send_success_indicators: Tuple[Locator, ...]
+    error_indicators: Tuple[Locator, ...]
+    submit_endpoints: Tuple[str, ...]
+    ignored_endpoints: Tuple[str, ...]
+    page_indicators: PageIndicators
+
+
+class SiteProfile(NamedTuple):
+    version: int
+    name: str
+    search: SearchProfile
+    results: ResultsProfile
+    classification: ClassificationProfile
+    application: ApplicationProfile
+
+
+def parse_locator(selector):
+    """Convertit un sélecteur textuel en Locator : XPath s'il commence par '/' ou '(', texte pour ':contains', CSS sinon."""
+    if selector.startswith(("/", "(")):
+        return Locator(BY_XPATH, selector)
+    match = _CONTAINS.match(selector)
+    if match:
+        return Locator(BY_TEXT, match.group(2))
+    return Locator(BY_CSS_SELECTOR, selector)
+
+
+def _locators(selectors):
+    return tuple(parse_locator(selector) for selector in selectors)
+
+
+def _keywords(data):
+    return KeywordSet(int(data["weight"]), tuple(data["terms"]))
+
+
+def _xpaths(selectors):
+    """Indicateurs de la sonde de page : évalués par document.evaluate, donc XPath uniquement."""
+    for selector in selectors:
+        if parse_locator(selector).by != BY_XPATH:
+            raise ValueError(f"Indicateur de page non XPath: {selector}")
+    return tuple(selectors)
+
+
+def compile_profile(data):
+    """Compile le dictionnaire brut du fichier de profil en structures immuables."""
+    version = data.get("version")
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Version de profil de site non supportée: {version} (attendu: {SUPPORTED_VERSIONS})")
+
+    search, results = data["search"], data["results"]
+    classification, application = data["classification"], data["application"]
+    return SiteProfile(
+        version=version,
+        name=data.get("name", ""),
+        search=SearchProfile(
+            suggestion_selectors=tuple(search["suggestion_selectors"]),
+        ),
+        results=ResultsProfile(
+            base_url=results["base_url"],
+            iframe_selectors=tuple(results["iframe_selectors"]),
+            card_selectors=tuple(results["card_selectors"]),
+            card_fallback_selector=results["card_fallback_selector"],
+            card_min_text_length=int(results["card_min_text_length"]),
+            card_tag_selector=results["card_tag_selector"],
+            title_selectors=tuple(results["title_selectors"]),
+            company_selectors=tuple(results["company_selectors"]),
+            company_exclusions=tuple(results["company_exclusions"]),
+            location_selectors=tuple(results["location_selectors"]),
+            location_cities=tuple(results["location_cities"]),
+            external_domains=tuple(results["external_domains"]),
+        ),
+        classification=ClassificationProfile(
+            explicit_marker_weight=int(classification["explicit_marker_weight"]),
+            formation_strong=_keywords(classification["formation_strong"]),
+            formation_weak=_keywords(classification["formation_weak"]),
+            entreprise_strong=_keywords(classification["entreprise_strong"]),
+            entreprise_weak=_keywords(classification["entreprise_weak"]),
+            formation_title_acronyms=_keywords(classification["formation_title_acronyms"]),
+            job_title_terms=_keywords(classification["job_title_terms"]),
+        ),
+        application=ApplicationProfile(
+            apply_buttons=_locators(application["apply_buttons"]),
+            external_button_texts=tuple(application["external_button_texts"]),
+            form_selectors=_locators(application["form_selectors"]),
+            fields=tuple((name, _locators(selectors)) for name, selectors in application["fields"].items()),
+            documents=tuple((name, _locators(selectors)) for name, selectors in application["documents"].items()),
+            consent_checkboxes=_locators(application["consent_checkboxes"]),
+            submit_buttons=_locators(application["submit_buttons"]),
+            send_buttons=_locators(application["send_buttons"]),
+            success_indicators=_locators(application["success_indicators"]),
+            send_success_indicators=_locators(application["send_success_indicators"]),
+            error_indicators=_locators(application["error_indicators"]),
+            submit_endpoints=tuple(application["submit_endpoints"]),
+            ignored_endpoints=tuple(application["ignored_endpoints"]),
+            page_indicators=PageIndicators(
+                **{group: _xpaths(application["page_indicators"][group]) for group in PageIndicators._fields}
+            ),
+        ),
+    )
+
+
+def load_profile(path=PROFILE_PATH):
+    """Lit et compile un fichier de profil de site."""
+    with open(path, "r", encoding="utf-8") as f:
+        return compile_profile(json.load(f))
+
+
+# Compilé une seule fois, partagé par tous les modules
+SITE_PROFILE = load_profile()
@@ -0,0 +1,264 @@
+"""
+Confirmation d'envoi d'une candidature, dès la réponse du serveur.
+
+Au lieu d'attendre 10 à 15 s puis de chercher un message de succès, ``arm`` installe
+dans la page, juste avant le clic d'envoi :
+
+- un relais sur ``fetch`` et ``XMLHttpRequest`` qui note le code HTTP de la première
+  requête POST/PUT vers un point d'envoi de candidature (``submit_endpoints`` du
+  profil de site, hors ``ignored_endpoints`` : Sentry, mesure d'audience...) ;
+- un MutationObserver qui réagit à l'apparition d'un message de succès
+  (``success_indicators`` et ``send_success_indicators``) ou d'erreur
+  (``error_indicators``).
+
+``wait`` rend la main dans une seule exécution de script asynchrone, au premier des
+deux signaux, sans sondage. Si le driver journalise le réseau (``setup_driver(...,
+network_log=True)``), le code HTTP est aussi repris des événements CDP Network du
+journal "performance", ce qui couvre les requêtes que le relais ne voit pas (autre
+frame, service worker). Sans aucun signal avant ``timeout``, la candidature est
+marquée sans confirmation.
+"""
+
+import json
+import time
+import logging
+from typing import NamedTuple, Optional
+
+from site_profile import SITE_PROFILE, BY_XPATH, BY_TEXT
+
+logger = logging.getLogger(__name__)
+
+SUBMIT_TIMEOUT = 20
+
+CONFIRMED = "confirmed"
+REJECTED = "rejected"
+UNCONFIRMED = "unconfirmed"
+
+# Installe (une fois par document) le relais réseau et remet à zéro l'état de la page.
+# arguments[0] : motifs d'URL d'envoi, arguments[1] : motifs ignorés
+ARM_SCRIPT = """
+var include = arguments[0], exclude = arguments[1];
+var watch = window.__submissionWatch;
+if (!watch) {
+    watch = window.__submissionWatch = {};
+    var matches = function(method, url) {
+        url = String(url || '').toLowerCase();
+        method = String(method || 'GET').toUpperCase();
+        if (method !== 'POST' && method !== 'PUT') return false;
+        if (watch.exclude.some(function(p) { return url.indexOf(p) !== -1; })) return false;
+        return watch.include.some(function(p) { return url.indexOf(p) !== -1; });
+    };
+    var record = function(method, url, status) {
+        if (!watch.response && matches(method, url)) {
+            watch.response = {status: status, url: String(url)};
+            if (watch.notify) watch.notify();
+        }
+    };
+    var originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function(input, init) {
+            var url = typeof input === 'string' ? input : (input && input.url);
+            var method = (init && init.method) || (input && input.method) || 'GET';
+            return originalFetch.apply(this, arguments).then(function(response) {
+                record(method, url, response.status);
+                return response;
+            }, function(error) {
+                record(method, url, 0);
+                throw error;
+            });
+        };
+    }
+    var open = XMLHttpRequest.prototype.open, send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.open = function(method, url) {
+        this.__watchRequest = [method, url];
+        return open.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function() {
+        var xhr = this;
+        xhr.addEventListener('loadend', function() {
+            if (xhr.__watchRequest) record(xhr.__watchRequest[0], xhr.__watchRequest[1], xhr.status);
+        });
+        return send.apply(this, arguments);
+    };
+}
+watch.include = include;
+watch.exclude = exclude;
+watch.response = null;
+watch.notify = null;
+return true;
+"""
+
+# Attend la réponse du serveur ou un message de succès / d'erreur.
+# arguments[0] : délai (ms), arguments[1] / [2] : sélecteurs [by, value] de succès / d'erreur
+WAIT_SCRIPT = """
+var timeout = arguments[0], successes = arguments[1], errors = arguments[2];
+var done = arguments[arguments.length - 1];
+var watch = window.__submissionWatch || {};
+var finished = false, observer = null, timer = null;
+
+function visible(el) {
+    return !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length));
+}
+
+function find(locator) {
+    var by = locator[0], value = locator[1];
+    try {
+        if (by === 'xpath') {
+            return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        if (by === 'text') {
+            var elements = document.querySelectorAll('body *');
+            for (var i = 0; i < elements.length; i++) {
+                if (!elements[i].childElementCount && elements[i].textContent.indexOf(value) !== -1) return elements[i];
+            }
+            return null;
+        }
+        return document.querySelector(value);
+    } catch (e) {
+        return null;
+    }
+}
+
+function firstVisible(locators) {
+    for (var i = 0; i < locators.length; i++) {
+        var el = find(locators[i]);
+        if (visible(el)) return el;
+    }
+    return null;
+}
+
+function check() {
+    if (watch.response) return {source: 'network', http_status: watch.response.status, url: watch.response.url};
+    var el = firstVisible(errors);
+    if (el) return {source: 'dom', outcome: 'error', text: el.textContent.trim().slice(0, 200)};
+    el = firstVisible(successes);
+    if (el) return {source: 'dom', outcome: 'success', text: el.textContent.trim().slice(0, 200)};
+    return null;
+}
+
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    if (timer) clearTimeout(timer);
+    watch.notify = null;
+    done(result);
+}
+
+var result = check();
+if (result) {
+    finish(result);
+} else {
+    watch.notify = function() { var r = check(); if (r) finish(r); };
+    observer = new MutationObserver(watch.notify);
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    timer = setTimeout(function() { finish(null); }, timeout);
+}
+"""
+
+
+class SubmissionResult(NamedTuple):
+    outcome: str                    # CONFIRMED, REJECTED ou UNCONFIRMED
+    http_status: Optional[int]
+    source: str                     # "network", "cdp", "dom" ou "" (aucun signal)
+    detail: str
+    elapsed: float
+
+    @property
+    def confirmed(self):
+        return self.outcome == CONFIRMED
+
+
+def _script_locators(locators):
+    return [[locator.by if locator.by in (BY_XPATH, BY_TEXT) else "css", locator.value] for locator in locators]
+
+
+def _matches_endpoint(url, include, exclude):
+    url = (url or "").lower()
+    return not any(p in url for p in exclude) and any(p in url for p in include)
+
+
+def _outcome_for_status(status):
+    return CONFIRMED if 200 <= status < 400 else REJECTED
+
+
+class SubmissionWatch:
+    """Surveillance d'un envoi : ``arm()`` avant le clic, ``wait()`` après."""
+
+    def __init__(self, driver, timeout=SUBMIT_TIMEOUT, profile=None):
+        application = (profile or SITE_PROFILE).application
+        self.driver = driver
+        self.timeout = timeout
+        self.include = [p.lower() for p in application.submit_endpoints]
+        self.exclude = [p.lower() for p in application.ignored_endpoints]
+        self.successes = _script_locators(dict.fromkeys(application.success_indicators
+                                                        + application.send_success_indicators))
+        self.errors = _script_locators(application.error_indicators)
+        self._armed_at = None
+
+    def arm(self):
+        """Installe le relais réseau dans le document courant et vide le journal réseau du driver."""
+        self._drain_network_log()
+        try:
+            self.driver.execute_script(ARM_SCRIPT, self.include, self.exclude)
+        except Exception as e:
+            logger.debug("Relais réseau non installé: %s", e)
+        self._armed_at = time.perf_counter()
+        return self
+
+    def _drain_network_log(self):
+        """Entrées du journal "performance" (CDP) depuis le dernier appel, [] s'il n'est pas activé."""
+        try:
+            return self.driver.get_log("performance")
+        except Exception:
+            return []
+
+    def _cdp_status(self):
+        """Code HTTP de la requête d'envoi d'après les événements CDP Network.*, ou None."""
+        requests = {}
+        for entry in self._drain_network_log():
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            params = message.get("params", {})
+            if message.get("method") == "Network.requestWillBeSent":
+                request = params.get("request", {})
+                if request.get("method") in ("POST", "PUT") and _matches_endpoint(request.get("url"), self.include, self.exclude):
+                    requests[params.get("requestId")] = request.get("url")
+            elif message.get("method") == "Network.responseReceived" and params.get("requestId") in requests:
+                return params.get("response", {}).get("status"), requests[params["requestId"]]
+        return None
+
+    def wait(self):
+        """Attend la réponse du serveur ou le message de la page ; renvoie un SubmissionResult."""
+        started = self._armed_at or time.perf_counter()
+        result = None
+        try:
+            self.driver.set_script_timeout(self.timeout + 5)
+            result = self.driver.execute_async_script(WAIT_SCRIPT, int(self.timeout * 1000), self.successes, self.errors)
+        except Exception as e:
+            logger.debug("Surveillance de l'envoi interrompue: %s", e)
+        elapsed = time.perf_counter() - started
+
+        if result and result.get("source") == "network" and result.get("http_status"):
+            status = int(result["http_status"])
+            return SubmissionResult(_outcome_for_status(status), status, "network", result.get("url", ""), elapsed)
+        cdp = self._cdp_status()
+        if cdp and cdp[0]:
+            return SubmissionResult(_outcome_for_status(int(cdp[0])), int(cdp[0]), "cdp", cdp[1], elapsed)
+        if result and result.get("source") == "dom":
+            outcome = CONFIRMED if result.get("outcome") == "success" else REJECTED
+            return SubmissionResult(outcome, None, "dom", result.get("text", ""), elapsed)
+        return SubmissionResult(UNCONFIRMED, None, "", "", elapsed)
+
+
+def log_submission(result, titre_offre):
+    """Journalise le résultat d'un envoi de candidature."""
+    status = f"HTTP {result.http_status}" if result.http_status else result.source or "aucun signal"
+    if result.outcome == CONFIRMED:
+        logger.info("✅ Candidature confirmée pour %s en %.1fs (%s)", titre_offre, result.elapsed, status)
+    elif result.outcome == REJECTED:
+        logger.warning("❌ Candidature refusée pour %s (%s): %s", titre_offre, status, result.detail)
+    else:
+        logger.warning("⚠️ Aucune confirmation d'envoi pour %s après %.0fs", titre_offre, result.elapsed)
@@ -0,0 +1,91 @@
+"""
+Benchmark : temps jusqu'à la première page prête, profil Chrome froid vs chaud.
+
+Froid : un user-data-dir vierge à chaque exécution (comportement historique).
+Chaud : le même user-data-dir réutilisé, après une exécution d'amorçage.
+
+Pour chaque exécution on mesure le temps écoulé entre driver.get() et
+l'apparition du formulaire de recherche, ainsi que les octets réellement
+transférés (Resource Timing : transferSize vaut 0 pour une ressource servie
+depuis le cache disque).
+
+Usage :
+    python benchmarks/chrome_profile_warmup.py [--runs 3]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'attached_assets'))
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from alternance_gouv_1751543361694 import setup_driver
+from chrome_profile import ChromeProfile
+
+URL = "https://www.alternance.emploi.gouv.fr/recherches-offres-formations"
+READY_SELECTOR = "iframe, #metier, input[type='search']"
+
+TRANSFERRED_BYTES = """
+var entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+var total = 0, cached = 0;
+entries.forEach(function(e) { total += 1; if (e.transferSize === 0 && e.decodedBodySize > 0) cached += 1; });
+return [entries.reduce(function(sum, e) { return sum + (e.transferSize || 0); }, 0), total, cached];
+"""
+
+
+def measure(chrome_profile):
+    driver = setup_driver(chrome_profile=chrome_profile)
+    if not driver:
+        raise RuntimeError("Impossible de créer le driver")
+    try:
+        start = time.perf_counter()
+        driver.get(URL)
+        WebDriverWait(driver, 60).until(EC.presence_of_element_located((By.CSS_SELECTOR, READY_SELECTOR)))
+        elapsed = time.perf_counter() - start
+        transferred, resources, cached = driver.execute_script(TRANSFERRED_BYTES)
+        return elapsed, transferred, resources, cached
+    finally:
+        driver.quit()
+        chrome_profile.release()
+
+
+def report(label, results):
+    times = sorted(r[0] for r in results)
+    median = times[len(times) // 2]
+    transferred = sum(r[1] for r in results) / len(results)
+    print(f"{label:<6} médiane {median:6.2f}s  min {times[0]:6.2f}s  max {times[-1]:6.2f}s  "
+          f"transfert moyen {transferred / 1024:8.0f} Ko  "
+          f"ressources en cache {sum(r[3] for r in results)}/{sum(r[2] for r in results)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='chrome_profile_bench_')
+    try:
+        cold = []
+        for run in range(args.runs):
+            # Un répertoire de profils neuf par exécution : aucun cache disponible
+            cold.append(measure(ChromeProfile('cold', directory=os.path.join(root, f'cold{run}'))))
+
+        warm_profile_dir = os.path.join(root, 'warm')
+        measure(ChromeProfile('warm', directory=warm_profile_dir))  # amorçage du cache
+        warm = [measure(ChromeProfile('warm', directory=warm_profile_dir)) for _ in range(args.runs)]
+
+        report('froid', cold)
+        report('chaud', warm)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark : rendu des messages de candidature pour une grosse moisson d'offres.
+
+Compare, pour N offres synthétiques :
+- l'analyse du modèle à chaque message (cache vidé avant chaque rendu) ;
+- le modèle analysé une fois (cache) et rendu offre par offre ;
+- ``MessageRenderer.render_all`` sur toute la moisson, comme le fait le runner.
+
+Usage :
+    python benchmarks/message_rendering.py [--offers 5000] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'attached_assets'))
+
+from offer_record import Offer
+from message_templates import MessageRenderer, MESSAGE_CANDIDATURE, parse_template, render
+
+TITLES = ["Développeur web", "Assistant marketing digital", "Technicien maintenance", "Comptable", "Chargé RH"]
+COMPANIES = ["Orange", "Non spécifié", "SNCF", "Decathlon", "Leroy Merlin", "Capgemini"]
+CITIES = ["Paris", "Lyon", "Marseille", "Toulouse", "Nantes", "Lille"]
+
+
+def synthetic_offers(count):
+    return [
+        Offer(f"{TITLES[i % len(TITLES)]} H/F #{i}", COMPANIES[i % len(COMPANIES)], CITIES[i % len(CITIES)],
+              link=f"https://labonnealternance.apprentissage.beta.gouv.fr/offre/{i}")
+        for i in range(count)
+    ]
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--offers", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    offers = synthetic_offers(args.offers)
+    candidate = {"prenom": "Jean", "nom": "Dupont"}
+
+    def uncached():
+        for offer in offers:
+            parse_template.cache_clear()
+            render(parse_template(MESSAGE_CANDIDATURE),
+                   dict(candidate, titre=offer.title, entreprise=offer.company, lieu=offer.location))
+
+    renderer = MessageRenderer(MESSAGE_CANDIDATURE, **candidate)
+
+    def cached():
+        for offer in offers:
+            renderer.render_offer(offer)
+
+    def batched():
+        renderer.render_all(offers)
+
+    results = [
+        ("modèle analysé à chaque message", best_of(args.repeat, uncached)),
+        ("modèle en cache, rendu par offre", best_of(args.repeat, cached)),
+        ("render_all (moisson complète)", best_of(args.repeat, batched)),
+    ]
+    print(f"{args.offers} messages, meilleur de {args.repeat} :")
+    for label, seconds in results:
+        print(f"  {label:<36} {seconds * 1000:8.1f} ms  ({seconds / args.offers * 1e6:6.2f} µs/message)")
+    print("Exemple :")
+    print(renderer.render_offer(offers[1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark : coût d'import du runner et d'une validation --dry-run.
+
+1. ``python -X importtime -c "import automation_runner"`` : les modules les plus
+   coûteux (temps cumulé) et le total. Selenium, webdriver_manager, bs4 et le
+   scraper ne doivent plus y apparaître : ils sont chargés au premier usage.
+2. ``automation_runner.py --dry-run`` avec une configuration d'exemple sur stdin :
+   temps de bout en bout d'une validation, sans navigateur.
+
+Usage :
+    python benchmarks/runner_import_time.py [--runs 5] [--top 15]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+RUNNER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'python_scripts')
+
+SAMPLE_CONFIG = {
+    "email": "candidat@example.com",
+    "settings": {"maxApplicationsPerSession": 10, "delayBetweenApplications": 30, "prefetchDepth": 2},
+}
+
+
+def import_profile():
+    """Renvoie [(module, cumulé_us)] triés par coût décroissant, et le total en µs."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import automation_runner"],
+        cwd=RUNNER_DIR, capture_output=True, text=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Un espace de séparation après "|", puis deux espaces par niveau d'imbrication
+        modules.append((name.rstrip()[1:], int(cumulative)))
+    total = sum(cumulative for name, cumulative in modules if not name.startswith(" "))
+    return sorted(modules, key=lambda m: m[1], reverse=True), total
+
+
+def dry_run_time(runs):
+    """Durées (s) de plusieurs exécutions --dry-run, et le dernier code retour."""
+    durations, returncode = [], None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "automation_runner.py", "--dry-run"],
+            cwd=RUNNER_DIR, input=json.dumps(SAMPLE_CONFIG), capture_output=True, text=True,
+        )
+        durations.append(time.perf_counter() - start)
+        returncode = result.returncode
+    return durations, returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    modules, total = import_profile()
+    print(f"Import de automation_runner : {total / 1000:.1f} ms au total")
+    for name, cumulative in modules[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name.strip()}")
+    heavy = [name.strip() for name, _ in modules if name.strip().split(".")[0] in ("selenium", "webdriver_manager", "bs4")]
+    print(f"Modules Selenium/bs4 importés : {len(heavy)}")
+
+    durations, returncode = dry_run_time(args.runs)
+    print(f"--dry-run ({args.runs} exécutions) : min {min(durations) * 1000:.0f} ms, "
+          f"moyenne {sum(durations) / len(durations) * 1000:.0f} ms, code retour {returncode}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,47 +6,98 @@ Automation Runner - Interface between the web application and the existing Pytho
 import json
 import sys
 import os
+import argparse
 import logging
 import traceback
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import time
 
 # Add the attached_assets directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'attached_assets'))
 
-# Import the main automation script
-try:
-    from alternance_gouv_1751543361694 import run_scraper, setup_driver, parse_results
-    from postuler_functions_1751543385370 import postuler_offre, remplir_formulaire_candidature
-    from capture_functions_1751543392689 import capture_and_highlight, switch_to_iframe_if_needed
+from offer_cache import OfferOutcomeCache, DEFAULT_CACHE_PATH, DEFAULT_TTL, content_hash
+from session_checkpoint import SessionCheckpoint, checkpoint_status
+from log_pipeline import configure_logging, web_line
+from document_registry import DocumentRegistry
+from message_templates import MessageRenderer
+from offer_ranking import OfferRanker
+from rate_limiter import RateLimiter, rate_domain
+from retry_queue import RetryQueue
+from application_outcome import Outcome, CLASSIFICATIONS, resultat, outcome_of
+from search_fanout import (SearchFanout, SearchYieldHistory, plan_searches, offer_id,
+                           DEFAULT_CONCURRENCY, MAX_SEARCH_JOBS)
+from persistence import open_store, DEFAULT_SESSION_INTERVAL
+from session_log import SessionLogHandler, DEFAULT_LOG_DIR, MAX_SEGMENT_BYTES, RETENTION_BYTES
+
+# The automation scripts pull in Selenium, webdriver_manager and the 2,000-line scraper:
+# they are imported on first use by load_automation_scripts(), not at import time
+SCRIPTS_LOADED = False
+
+def load_automation_scripts() -> bool:
+    """Import the Selenium-based automation scripts (once), return whether they are available"""
+    global SCRIPTS_LOADED, run_scraper, setup_driver, parse_results, use_persistent_profile
+    global postuler_offre, remplir_formulaire_candidature, capture_and_highlight
+    global Offer, OfferPrefetcher, SupervisedDriver, DriverCrashError, BrowserStateStore, worker_profile, ChromeProfile
+    if SCRIPTS_LOADED:
+        return True
+    try:
+        from alternance_gouv_1751543361694 import run_scraper, setup_driver, parse_results, use_persistent_profile
+        from postuler_functions_1751543385370 import postuler_offre, remplir_formulaire_candidature
+        from capture_functions_1751543392689 import capture_and_highlight
+        from offer_record import Offer
+        from offer_prefetch import OfferPrefetcher
+        from supervised_driver import SupervisedDriver, DriverCrashError
+        from browser_state import BrowserStateStore, worker_profile
+        from chrome_profile import ChromeProfile
+    except ImportError as e:
+        logging.error("Failed to import automation scripts: %s", e)
+        return False
     SCRIPTS_LOADED = True
-except ImportError as e:
-    logging.error(f"Failed to import automation scripts: {e}")
-    SCRIPTS_LOADED = False
+    return True
 
 class AutomationRunner:
-    def __init__(self, session_id: int, user_config: Dict[str, Any], settings: Dict[str, Any]):
+    def __init__(self, session_id: int, user_config: Dict[str, Any], settings: Dict[str, Any],
+                 checkpoint: Optional[SessionCheckpoint] = None):
         self.session_id = session_id
         self.user_config = user_config
         self.settings = settings
         self.driver = None
-        self.applications_processed = 0
-        self.successful_applications = 0
-        self.failed_applications = 0
+        self.supervisor = None
+        self.prefetcher = None
+        self.state_store = None
+        self.chrome_profile = None
+        
+        # Resumed sessions continue from their checkpoint, new ones start a fresh one
+        self.checkpoint = checkpoint or SessionCheckpoint(session_id)
+        self.checkpoint.config = user_config
+        self.applications_processed = self.checkpoint.stats.get('total_applications', 0)
+        self.successful_applications = self.checkpoint.stats.get('successful_applications', 0)
+        self.failed_applications = self.checkpoint.stats.get('failed_applications', 0)
+        self.outcome_cache = OfferOutcomeCache(
+            settings.get('outcomeCachePath', DEFAULT_CACHE_PATH),
+            settings.get('outcomeCacheTtl', DEFAULT_TTL)
+        )
+        self.store = open_store(settings)
+        self.rate_limiter = RateLimiter.from_settings(settings)
+        # Transiently failed offers are attempted again later; the schedule lives in the checkpoint
+        self.retry_queue = RetryQueue.from_settings(self.checkpoint.retries, settings)
+        self.offers_by_key: Dict[str, 'Offer'] = {}
+        self.messages: Dict[str, str] = {}
+        self.session_status = 'running'
+        self._last_stats_event = 0.0
+        if self.store:
+            self.store.update_session(session_id, self.current_stats())
         
         self.setup_logging()
         
     def setup_logging(self):
-        """Setup logging configuration"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(f'logs/automation_{self.session_id}.log'),
-                logging.StreamHandler()
-            ]
-        )
+        """Route every logger of the process through the queued pipeline (file, stderr, web lines on stdout)"""
+        configure_logging(file_handler=SessionLogHandler(
+            self.session_id,
+            max_bytes=self.settings.get('logSegmentBytes', MAX_SEGMENT_BYTES),
+            retention_bytes=self.settings.get('logRetentionBytes', RETENTION_BYTES)
+        ))
         
     def log_message(self, level: str, message: str, metadata: Optional[Dict] = None):
         """Log a message that will be sent to the web interface"""
@@ -59,8 +110,10 @@ class AutomationRunner:
             'metadata': metadata or {}
         }
         
-        # Send to web interface via stdout
-        print(f"WEB_LOG: {json.dumps(log_entry)}")
+        # Send to web interface via stdout (written by the logging thread)
+        web_line('WEB_LOG', json.dumps(log_entry))
+        if self.store:
+            self.store.add_log(log_entry)
         
         # Also log locally
         getattr(logging, level.lower(), logging.info)(message)
@@ -74,19 +127,43 @@ class AutomationRunner:
             'session_id': self.session_id
         }
         
-        print(f"WEB_EVENT: {json.dumps(event)}")
+        web_line('WEB_EVENT', json.dumps(event))
+        
+        # Finished applications and screenshots are also persisted (batched) when a database is configured
+        if self.store:
+            if event_type == 'application_completed':
+                self.store.add_application(data)
+            elif event_type == 'screenshot_captured':
+                self.store.add_screenshot(data)
     
     def setup_driver(self):
         """Setup the Selenium WebDriver"""
         try:
             self.log_message('info', 'Configuration du navigateur Chrome...')
-            self.driver = setup_driver()
+            self.state_store = BrowserStateStore(worker_profile(self.user_config))
+            if use_persistent_profile(self.user_config):
+                # The slot stays reserved across browser relaunches, so restarts also get a warm cache
+                self.chrome_profile = ChromeProfile(worker_profile(self.user_config))
+            self.supervisor = SupervisedDriver(
+                lambda: setup_driver(self.state_store, self.chrome_profile, network_log=True),
+                max_restarts=self.settings.get('maxDriverRestarts', 3),
+                max_retries=self.settings.get('maxOfferRetries', 1),
+                on_restart=self.on_driver_restart
+            )
+            self.driver = self.supervisor.start()
             self.log_message('success', 'Navigateur configuré avec succès')
             return True
         except Exception as e:
             self.log_message('error', f'Erreur lors de la configuration du navigateur: {str(e)}')
             return False
     
+    def on_driver_restart(self, driver):
+        """Rebind everything that holds the old driver after a browser relaunch"""
+        self.driver = driver
+        if self.prefetcher:
+            self.prefetcher.reset(driver)
+        self.log_message('warning', f'Navigateur relancé après un crash ({self.supervisor.restarts}/{self.supervisor.max_restarts})')
+    
     def capture_screenshot(self, description: str, application_data: Optional[Dict] = None):
         """Capture a screenshot and notify the web interface"""
         try:
@@ -118,96 +195,310 @@ class AutomationRunner:
             self.log_message('error', f'Erreur lors de la capture: {str(e)}')
             return None
     
-    def process_application(self, offer_data: Dict[str, Any]) -> bool:
+    def process_application(self, offer: 'Offer', handle: Optional[str] = None) -> bool:
         """Process a single job application"""
         try:
-            self.log_message('info', f'Traitement de l\'offre: {offer_data["title"]}')
+            self.log_message('info', f'Traitement de l\'offre: {offer.title}')
             
             # Create application record
-            application_data = {
-                'session_id': self.session_id,
-                'job_title': offer_data['title'],
-                'company': offer_data.get('company', 'Non spécifié'),
-                'location': offer_data.get('location', 'Non spécifié'),
-                'status': 'pending',
-                'applied_at': datetime.now().isoformat()
-            }
+            application_data = offer.to_application(self.session_id, status='pending')
+            application_data['applied_at'] = datetime.now().isoformat()
             
             self.emit_event('application_started', application_data)
             
             # Capture screenshot before processing
-            self.capture_screenshot(f"Avant candidature - {offer_data['title']}", application_data)
+            self.capture_screenshot(f"Avant candidature - {offer.title}", application_data)
             
-            # Process the application
-            success = self.fill_application_form(offer_data, application_data)
+            # Submissions to the site are paced by the shared, adaptive token bucket
+            domain = rate_domain(offer.link)
+            if domain:
+                self.wait_for_submission_slot(domain)
             
-            if success:
-                application_data['status'] = 'completed'
-                self.successful_applications += 1
-                self.log_message('success', f'Candidature envoyée avec succès pour {offer_data["title"]}')
-            else:
-                application_data['status'] = 'failed'
-                application_data['error_message'] = 'Échec lors du remplissage du formulaire'
-                self.failed_applications += 1
-                self.log_message('error', f'Échec de candidature pour {offer_data["title"]}')
+            # Process the application; if the browser dies mid-application it is relaunched and,
+            # as long as nothing was sent, the offer retried on a fresh tab (the prefetched one
+            # died with the browser). A possibly sent application is never submitted again.
+            try:
+                result = self.supervisor.call(
+                    lambda is_retry: self.fill_application_form(offer, application_data, None if is_retry else handle),
+                    retry_if=lambda result: not outcome_of(result).sent
+                )
+            except DriverCrashError as e:
+                last = outcome_of(e.result) if e.result is not None else None
+                if last is not None and not last.sent:
+                    result = e.result
+                else:
+                    raison = f'{e} (dernière issue: {last.value})' if last is not None else str(e)
+                    result = resultat(Outcome.DRIVER_CRASH, raison)
+            outcome = outcome_of(result)
+            
+            # Transient failures go back to the retry queue until the offer runs out of attempts;
+            # an offer whose form may already have been sent is never resubmitted
+            key = SessionCheckpoint.offer_key(offer)
+            retry_in = (self.retry_queue.schedule(key, outcome.value)
+                        if outcome.retryable and not outcome.sent else None)
+            if retry_in is None:
+                self.retry_queue.discard(key)
+            
+            if domain:
+                self.settle_submission_slot(domain, outcome, result)
+            self.record_outcome(offer, application_data, outcome, result, retry_in)
             
             # Capture screenshot after processing
-            self.capture_screenshot(f"Après candidature - {offer_data['title']}", application_data)
+            self.capture_screenshot(f"Après candidature - {offer.title}", application_data)
             
             self.emit_event('application_completed', application_data)
-            self.applications_processed += 1
+            if retry_in is None:
+                self.applications_processed += 1
+                self.checkpoint.set_status(offer, checkpoint_status(outcome), self.current_stats())
+            else:
+                self.checkpoint.set_status(offer, 'retrying', self.current_stats())
             
-            return success
+            return outcome.succeeded
             
         except Exception as e:
             self.log_message('error', f'Erreur lors du traitement de l\'offre: {str(e)}')
             traceback.print_exc()
             return False
     
-    def fill_application_form(self, offer_data: Dict[str, Any], application_data: Dict[str, Any]) -> bool:
-        """Fill the application form using the existing automation functions"""
+    def wait_for_submission_slot(self, domain: str):
+        """Reserve a submission token for the domain and wait until it is due"""
+        wait = self.rate_limiter.reserve(domain)
+        if wait > 0:
+            self.log_message('info', f'Attente de {wait:.0f} secondes avant la prochaine candidature')
+            time.sleep(wait)
+    
+    def settle_submission_slot(self, domain: str, outcome: 'Outcome', result: Any):
+        """Refund the token of an offer that never reached submission, otherwise adapt the pace to the outcome"""
+        if not outcome.sent:
+            self.rate_limiter.refund(domain)
+            return
+        ok = outcome.succeeded or outcome is Outcome.SUBMIT_REJECTED
+        # Time between the submit click and the server's answer (0 when none was observed)
+        latency = (result.get('duree_confirmation') if isinstance(result, dict) else None) or 0.0
+        interval = self.rate_limiter.record(domain, ok, latency)
+        logging.debug("Intervalle entre candidatures pour %s: %.0fs", domain, interval)
+    
+    def record_outcome(self, offer: 'Offer', application_data: Dict[str, Any], outcome: 'Outcome', result: Any,
+                       retry_in: Optional[float] = None):
+        """
+        Fill the application row from the outcome, update the counters and cache permanent failures.
+        retry_in is the delay before the next attempt of a transient failure that was scheduled again.
+        """
+        raison = result.get('raison', '') if isinstance(result, dict) else ''
+        application_data['status'] = outcome.application_status
+        application_data['outcome'] = outcome.value
+        if not outcome.succeeded:
+            application_data['error_message'] = f'{outcome.value}: {raison or outcome.label}'
+        # Server answer to the submission (HTTP status and confirmation delay), when one was observed
+        if isinstance(result, dict):
+            for key in ('http_status', 'confirmation', 'duree_confirmation'):
+                if result.get(key) is not None:
+                    application_data[key] = result[key]
+        metadata = {key: application_data[key] for key in ('outcome', 'http_status', 'confirmation')
+                    if key in application_data}
+        
+        if outcome.succeeded:
+            self.successful_applications += 1
+            self.log_message('success', f'Candidature envoyée avec succès pour {offer.title}', metadata)
+        elif outcome is Outcome.FORM_FILLED:
+            self.log_message('info', f'Formulaire rempli pour {offer.title}, envoi manuel', metadata)
+        elif outcome.skipped:
+            self.log_message('warning', f'Offre ignorée: {offer.title} - {raison or outcome.label}', metadata)
+        elif retry_in is not None:
+            attempts = self.retry_queue.attempts(SessionCheckpoint.offer_key(offer))
+            application_data['status'] = 'retrying'
+            metadata['attempt'] = attempts
+            self.log_message('warning', f'Échec passager pour {offer.title}: {outcome.label}, nouvel essai dans '
+                                        f'{retry_in:.0f} secondes (tentative {attempts}/{self.retry_queue.max_attempts})',
+                             metadata)
+        elif outcome.needs_review:
+            self.failed_applications += 1
+            application_data['error_message'] += ' (envoi à vérifier manuellement)'
+            self.log_message('warning', f'Envoi incertain pour {offer.title}: {outcome.label}, '
+                                        f'à vérifier manuellement (pas de nouvel envoi)', metadata)
+        else:
+            self.failed_applications += 1
+            abandon = f' (abandon après {self.retry_queue.max_attempts} tentatives)' if outcome.retryable else ''
+            self.log_message('error', f'Échec de candidature pour {offer.title}: {outcome.label}{abandon}', metadata)
+        
+        # Offers that can never be applied to are remembered for later sessions
+        if outcome.permanent and offer.link:
+            self.outcome_cache.put(offer.link, outcome.value, raison or outcome.label,
+                                   content_hash(offer.title, offer.company))
+    
+    def fill_application_form(self, offer: 'Offer', application_data: Dict[str, Any], handle: Optional[str] = None) -> Any:
+        """Fill the application form using the existing automation functions, return the postulation result"""
         try:
             if not SCRIPTS_LOADED:
                 self.log_message('warning', 'Scripts d\'automatisation non chargés, simulation de candidature')
                 return True
             
             # Use the existing postuler_offre function
-            url_offre = offer_data.get('url', '')
-            titre_offre = offer_data.get('title', '')
+            url_offre = offer.link
+            titre_offre = offer.title
             
             if not url_offre:
-                self.log_message('error', 'URL de l\'offre manquante')
-                return False
+                return resultat(Outcome.MISSING_URL)
             
             # Navigate to the offer and apply
-            success = postuler_offre(self.driver, url_offre, titre_offre, self.user_config)
-            
-            return success
+            return postuler_offre(self.driver, url_offre, titre_offre, self.user_config, onglet=handle,
+                                  message=self.messages.get(SessionCheckpoint.offer_key(offer)))
             
         except Exception as e:
             self.log_message('error', f'Erreur lors du remplissage du formulaire: {str(e)}')
-            return False
+            return resultat(Outcome.PAGE_ERROR, str(e))
+    
+    def prepare_documents(self) -> Dict[str, Optional[str]]:
+        """Resolve and validate the CV and cover letter once for the session (form fillers reuse the registry)"""
+        documents = DocumentRegistry.for_user(self.user_config).resolve_all()
+        for name, path in documents.items():
+            if path:
+                self.log_message('info', f'Document {name}: {os.path.basename(path)}')
+            else:
+                self.log_message('warning', f'Document {name} absent ou invalide, il ne sera pas envoyé')
+        return documents
     
-    def update_session_stats(self):
-        """Update and emit session statistics"""
-        stats = {
+    def process_due_retries(self):
+        """Attempt again the offers whose retry is due, between two fresh offers (never waits)"""
+        while True:
+            key = self.retry_queue.pop_due()
+            if key is None:
+                return
+            offer = self.offers_by_key.get(key)
+            if offer is None:
+                self.retry_queue.discard(key)
+                continue
+            self.supervisor.snapshot()
+            self.log_message('info', f'Nouvel essai pour {offer.title} (tentative {self.retry_queue.attempts(key) + 1}'
+                                     f'/{self.retry_queue.max_attempts})')
+            self.process_application(offer)
+            self.update_session_stats()
+    
+    def drain_retries(self):
+        """Once the fresh offers are done, wait for the retries still scheduled and run them"""
+        while len(self.retry_queue):
+            wait = self.retry_queue.next_due() - time.time()
+            if wait > 0:
+                self.checkpoint.save(force=True)
+                self.log_message('info', f'{len(self.retry_queue)} offre(s) en attente de nouvel essai, '
+                                         f'prochain dans {wait:.0f} secondes')
+                time.sleep(wait)
+            self.process_due_retries()
+    
+    def report_skipped(self, prefetcher: 'OfferPrefetcher'):
+        """Report offers skipped by the prefetch stage since the last call"""
+        while prefetcher.skipped:
+            offer, classification, reason = prefetcher.skipped.pop(0)
+            outcome = CLASSIFICATIONS.get(classification, Outcome.NO_CONTACT)
+            self.log_message('warning', f'Offre ignorée: {offer.title} - {reason}',
+                             {'url': offer.link, 'outcome': outcome.value})
+            self.checkpoint.set_status(offer, 'ignoré')
+            if offer.link:
+                self.outcome_cache.put(offer.link, outcome.value, reason, content_hash(offer.title, offer.company))
+    
+    def filter_known_dead_offers(self, offers: list) -> list:
+        """Drop offers whose outcome cache entry says they cannot be applied to"""
+        live_offers = []
+        for offer in offers:
+            cached = offer.link and self.outcome_cache.get(offer.link, content_hash(offer.title, offer.company))
+            if cached:
+                self.log_message('info', f'Offre déjà connue comme non postulable: {offer.title} - {cached.reason}',
+                                 {'url': offer.link, 'status': cached.status})
+                self.checkpoint.set_status(offer, 'ignoré')
+                continue
+            live_offers.append(offer)
+        return live_offers
+    
+    def current_stats(self) -> Dict[str, int]:
+        return {
             'total_applications': self.applications_processed,
             'successful_applications': self.successful_applications,
             'failed_applications': self.failed_applications,
-            'session_id': self.session_id
         }
+    
+    def update_session_stats(self, final: bool = False):
+        """
+        Update and emit session statistics, coalesced: the totals are upserted and the
+        event emitted at most every sessionStatsInterval seconds, and always when final
+        """
+        stats = self.current_stats()
+        if self.store:
+            self.store.update_session(self.session_id, stats, self.session_status,
+                                      datetime.now().isoformat() if final else None)
         
+        now = time.monotonic()
+        if not final and now - self._last_stats_event < self.settings.get('sessionStatsInterval', DEFAULT_SESSION_INTERVAL):
+            return
+        self._last_stats_event = now
+        stats['session_id'] = self.session_id
         self.emit_event('session_stats_updated', stats)
     
+    def harvest_offers(self) -> list:
+        """Run the searches unless the checkpoint already holds a complete harvest, return pending offers"""
+        checkpoint = self.checkpoint
+        if checkpoint.harvest_complete:
+            self.log_message('info', f'Reprise de la session {self.session_id} depuis le point de reprise '
+                                     f'({len(checkpoint.offers)} offres déjà extraites)')
+            return checkpoint.pending()
+        
+        history = SearchYieldHistory()
+        planned = plan_searches(self.user_config, self.settings.get('maxSearchJobs', MAX_SEARCH_JOBS))
+        jobs = history.prune(planned, self.settings.get('minSearchYield', 0))
+        for job in planned:
+            if job not in jobs:
+                self.log_message('info', f'Recherche écartée (rendement faible): {job.query} à {job.location}')
+        single = len(jobs) == 1
+        if single and checkpoint.harvest_cursor:
+            self.log_message('info', f'Reprise de l\'extraction à partir de la carte {checkpoint.harvest_cursor}')
+        jobs = [job for job in jobs if job.key not in checkpoint.completed_searches]
+        if len(jobs) > 1:
+            self.log_message('info', f'{len(jobs)} recherches lancées: ' + ', '.join(
+                f'{job.query} à {job.location}' for job in jobs))
+        
+        def record(offer, card_index, job):
+            if single:
+                checkpoint.record_offer(offer, card_index)
+            else:
+                checkpoint.add_offer(offer)
+        
+        def report(result):
+            self.log_message('info', f'Recherche {result.job.query} à {result.job.location}: '
+                                     f'{result.found} offres, {result.new} nouvelles ({result.duration:.0f}s)')
+            self.emit_event('search_yield', {
+                'query': result.job.query,
+                'location': result.job.location,
+                'found': result.found,
+                'new': result.new,
+                'duration': round(result.duration, 1),
+                'complete': result.complete,
+            })
+            if result.complete:
+                checkpoint.mark_search_complete(result.job.key)
+        
+        fanout = SearchFanout(self.user_config, jobs, self.settings.get('searchConcurrency', DEFAULT_CONCURRENCY),
+                              seen=(offer_id(offer) for offer in checkpoint.offers))
+        yields = fanout.run(run_scraper, record, start_index=checkpoint.harvest_cursor, on_yield=report)
+        try:
+            history.record(yields)
+        except OSError as e:
+            self.log_message('warning', f'Historique des recherches non enregistré: {e}')
+        if all(result.complete for result in yields):
+            checkpoint.mark_harvest_complete()
+        else:
+            checkpoint.save(force=True)
+        return checkpoint.pending()
+    
     def run(self):
         """Main automation loop"""
         try:
             self.log_message('info', 'Démarrage de l\'automatisation réelle...')
             
-            if not SCRIPTS_LOADED:
+            if not load_automation_scripts():
                 self.log_message('error', 'Scripts d\'automatisation non disponibles')
                 return
             
+            self.prepare_documents()
+            
             # Setup WebDriver
             if not self.setup_driver():
                 self.log_message('error', 'Impossible de configurer le navigateur')
@@ -224,70 +515,182 @@ class AutomationRunner:
             
             self.log_message('info', f'Recherche avec les critères: {search_params}')
             
-            # Run the scraper to get job offers
-            offers = run_scraper(self.user_config)
+            # Run the scraper to get job offers (or reload them from the checkpoint)
+            offers = self.harvest_offers()
             
             if not offers:
                 self.log_message('warning', 'Aucune offre trouvée avec les critères spécifiés')
+                self.checkpoint.discard()
                 return
             
             self.log_message('success', f'{len(offers)} offres trouvées')
             
+            # Skip offers already known to be dead without opening them
+            offers = self.filter_known_dead_offers(offers)
+            
+            # The application budget goes to the best-matching offers first
+            if self.settings.get('rankOffers', True) and len(offers) > 1:
+                offers = OfferRanker(self.user_config).rank(offers)
+                self.log_message('info', f'Offres classées par pertinence, en tête: {offers[0].title}')
+            
+            # Cover messages for the whole harvest, rendered before the loop
+            self.messages = MessageRenderer.for_user(self.user_config).render_all(offers, SessionCheckpoint.offer_key)
+            
+            # Offers still waiting for a retry (resumed session) are picked up when due, not as fresh offers
+            self.offers_by_key = {SessionCheckpoint.offer_key(offer): offer for offer in offers}
+            offers = [offer for offer in offers if not self.retry_queue.is_scheduled(SessionCheckpoint.offer_key(offer))]
+            
             # Process each offer
             max_applications = self.settings.get('maxApplicationsPerSession', 10)
-            delay_between_applications = self.settings.get('delayBetweenApplications', 30)
             
-            for i, offer in enumerate(offers[:max_applications]):
-                self.log_message('info', f'Traitement de l\'offre {i+1}/{min(len(offers), max_applications)}')
-                
-                # Process the application
-                self.process_application(offer)
-                
-                # Update statistics
-                self.update_session_stats()
-                
-                # Wait between applications
-                if i < len(offers) - 1:
-                    self.log_message('info', f'Attente de {delay_between_applications} secondes avant la prochaine candidature')
-                    import time
-                    time.sleep(delay_between_applications)
+            # A resumed session only gets what is left of its budget
+            budget = max(0, max_applications - self.applications_processed)
+            if budget < max_applications:
+                self.log_message('info', f'Reprise: {budget} candidature(s) restante(s) sur {max_applications}')
+            
+            # Upcoming offer pages are loaded in background tabs and classified up front,
+            # so skipped offers (no contact, external redirect) never use an application slot;
+            # the prefetcher stops at the remaining budget and never loads pages beyond it
+            prefetcher = self.prefetcher = OfferPrefetcher(self.driver, offers, depth=self.settings.get('prefetchDepth', 3),
+                                                           limit=budget)
+            try:
+                for i, (offer, handle) in enumerate(prefetcher):
+                    self.report_skipped(prefetcher)
+                    self.supervisor.snapshot()
+                    self.log_message('info', f'Traitement de l\'offre {i+1}/{min(len(offers), budget)}')
+                    
+                    # Process the application
+                    self.process_application(offer, handle)
+                    
+                    # Update statistics
+                    self.update_session_stats()
+                    
+                    # Retries that came due meanwhile are interleaved with the fresh offers
+                    self.process_due_retries()
+                self.report_skipped(prefetcher)
+            finally:
+                self.prefetcher = None
+                if self.supervisor.is_alive():
+                    prefetcher.close()
+            
+            self.drain_retries()
             
             self.log_message('success', 'Automatisation terminée avec succès')
+            self.session_status = 'completed'
+            self.checkpoint.discard()
             
         except Exception as e:
+            self.session_status = 'stopped'
             self.log_message('error', f'Erreur fatale: {str(e)}')
             traceback.print_exc()
+            self.checkpoint.save(force=True)
+            self.log_message('info', f'Point de reprise enregistré: {self.checkpoint.path}')
         finally:
-            if self.driver:
-                self.driver.quit()
+            if self.supervisor:
+                if self.state_store and self.supervisor.is_alive():
+                    self.state_store.save(self.driver)
+                self.supervisor.quit()
+            if self.chrome_profile:
+                self.chrome_profile.release()
+            self.outcome_cache.close()
+            self.rate_limiter.close()
             
             # Final statistics
-            self.update_session_stats()
+            self.update_session_stats(final=True)
             self.emit_event('session_completed', {
                 'session_id': self.session_id,
                 'total_applications': self.applications_processed,
                 'successful_applications': self.successful_applications,
                 'failed_applications': self.failed_applications
             })
+            if self.store:
+                self.store.close()
+
+# Settings that must be non-negative numbers when present
+NUMERIC_SETTINGS = ('maxApplicationsPerSession', 'delayBetweenApplications', 'prefetchDepth',
+                    'maxDriverRestarts', 'maxOfferRetries', 'outcomeCacheTtl', 'logSegmentBytes', 'logRetentionBytes',
+                    'persistenceFlushSize', 'persistenceFlushInterval', 'sessionStatsInterval',
+                    'searchConcurrency', 'maxSearchJobs', 'minSearchYield', 'rateLimitBurst',
+                    'minApplicationInterval', 'maxApplicationInterval', 'slowConfirmationSeconds',
+                    'maxApplicationAttempts', 'retryBaseDelay', 'retryMaxDelay')
+
+def validate_config(config: Any) -> List[str]:
+    """Check a session configuration without starting a browser, return the list of problems"""
+    if not isinstance(config, dict):
+        return ['La configuration doit être un objet JSON']
+    errors = []
+    if not config.get('email'):
+        errors.append("Champ 'email' manquant")
+    settings = config.get('settings', {})
+    if not isinstance(settings, dict):
+        errors.append("'settings' doit être un objet")
+        settings = {}
+    for key in NUMERIC_SETTINGS:
+        value = settings.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0):
+            errors.append(f"Paramètre '{key}' invalide: {value!r}")
+    try:
+        from site_profile import load_profile
+        load_profile()
+    except Exception as e:
+        errors.append(f"Profil de site invalide: {e}")
+    for directory in (DEFAULT_LOG_DIR, os.path.dirname(settings.get('outcomeCachePath', DEFAULT_CACHE_PATH)) or '.'):
+        parent = directory if os.path.isdir(directory) else os.path.dirname(os.path.abspath(directory))
+        if not os.access(parent, os.W_OK):
+            errors.append(f"Répertoire non accessible en écriture: {directory}")
+    return errors
+
+def dry_run(session_id: int, config: Any) -> int:
+    """Validate the configuration and report on stdout; no browser, no session side effects"""
+    errors = validate_config(config)
+    for error in errors:
+        web_line('WEB_LOG', json.dumps({'type': 'log', 'level': 'error', 'message': error, 'session_id': session_id}))
+    message = 'Configuration valide' if not errors else f'{len(errors)} problème(s) de configuration'
+    level = 'success' if not errors else 'error'
+    web_line('WEB_LOG', json.dumps({'type': 'log', 'level': level, 'message': message, 'session_id': session_id}))
+    return 0 if not errors else 1
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Automation runner for alternance.gouv.fr")
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume the session from its checkpoint instead of searching again")
+    parser.add_argument("--session-id", type=int, default=int(os.environ.get('AUTOMATION_SESSION_ID', '1')),
+                        help="Session id (defaults to $AUTOMATION_SESSION_ID)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Validate the configuration and exit without loading Selenium or opening a browser")
+    return parser.parse_args()
 
 def main():
     """Main entry point"""
     try:
-        # Read configuration from stdin
-        input_data = sys.stdin.read()
-        config = json.loads(input_data)
+        args = parse_args()
+        session_id = args.session_id
+        checkpoint = SessionCheckpoint.load(session_id) if args.resume else None
+        if args.resume and checkpoint is None:
+            web_line('WEB_LOG', json.dumps({'type': 'log', 'level': 'warning', 'message': f'Aucun point de reprise pour la session {session_id}'}))
+        
+        # Read configuration from stdin (a resumed session can reuse the checkpointed one)
+        input_data = sys.stdin.read() if not sys.stdin.isatty() else ''
+        if input_data.strip():
+            config = json.loads(input_data)
+        elif checkpoint is not None:
+            config = checkpoint.config
+        else:
+            raise ValueError("Configuration manquante sur l'entrée standard")
+        
+        if args.dry_run:
+            sys.exit(dry_run(session_id, config))
         
-        session_id = int(os.environ.get('AUTOMATION_SESSION_ID', '1'))
         user_config = config
         settings = config.get('settings', {})
         
         # Create and run automation
-        runner = AutomationRunner(session_id, user_config, settings)
+        runner = AutomationRunner(session_id, user_config, settings, checkpoint)
         runner.run()
         
     except Exception as e:
         error_msg = f"Erreur fatale dans le runner: {str(e)}"
-        print(f"WEB_LOG: {json.dumps({'type': 'log', 'level': 'error', 'message': error_msg})}")
+        web_line('WEB_LOG', json.dumps({'type': 'log', 'level': 'error', 'message': error_msg}))
         traceback.print_exc()
         sys.exit(1)
 
@@ -0,0 +1,106 @@
+"""
+Offer outcome cache - remembers offers that can never be applied to
+
+The same offer URLs come back across sessions and candidate profiles. Offers that
+redirect to an external site (HelloWork, Meteojob...) or have no contact are
+stored here, keyed by normalised URL, so runners can skip them without opening
+the page again. Entries expire after a TTL.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+DEFAULT_CACHE_PATH = os.path.join('cache', 'offer_outcomes.sqlite')
+DEFAULT_TTL = 7 * 24 * 3600  # one week
+
+# Query parameters that only carry tracking information
+TRACKING_PARAMS = ('utm_', 'xtor', 'fbclid', 'gclid', 'mtm_', 'at_')
+
+
+class CachedOutcome(NamedTuple):
+    status: str
+    reason: str
+    recorded_at: float
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of an offer URL: lowercase host, no fragment, no tracking params, sorted query"""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+def content_hash(title: str, company: str = '') -> str:
+    """Short hash of the offer content, used to invalidate an entry when the offer changes"""
+    digest = hashlib.sha1(f"{title.strip().lower()}|{company.strip().lower()}".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class OfferOutcomeCache:
+    """SQLite-backed outcome cache shared by every runner on the machine"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._lock, self._conn:
+            if path != ':memory:':
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS offer_outcomes ('
+                ' url_key TEXT PRIMARY KEY,'
+                ' content_hash TEXT,'
+                ' status TEXT NOT NULL,'
+                ' reason TEXT,'
+                ' recorded_at REAL NOT NULL)'
+            )
+        self.evict_expired()
+
+    def get(self, url: str, content: Optional[str] = None) -> Optional[CachedOutcome]:
+        """Return the cached outcome for an offer, or None if unknown, expired or changed"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT content_hash, status, reason, recorded_at FROM offer_outcomes WHERE url_key = ?',
+                (normalize_url(url),)
+            ).fetchone()
+        if not row:
+            return None
+        cached_hash, status, reason, recorded_at = row
+        if time.time() - recorded_at > self.ttl:
+            return None
+        if content and cached_hash and content != cached_hash:
+            return None
+        return CachedOutcome(status, reason or '', recorded_at)
+
+    def put(self, url: str, status: str, reason: str = '', content: Optional[str] = None):
+        """Record the outcome of an offer (replaces any previous entry)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO offer_outcomes (url_key, content_hash, status, reason, recorded_at)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                (normalize_url(url), content, status, reason, time.time())
+            )
+
+    def evict_expired(self) -> int:
+        """Delete entries older than the TTL, return how many were removed"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'DELETE FROM offer_outcomes WHERE recorded_at < ?', (time.time() - self.ttl,)
+            )
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
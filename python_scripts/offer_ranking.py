@@ -0,0 +1,195 @@
+"""
+Offer ranking - spends the per-session application budget on the best-matching offers
+
+The harvest comes back in the order the site listed it. Before applying, every
+offer is scored against the candidate's search preferences and the list is
+sorted by score (ties keep the harvest order):
+
+- searchKeywords: TF-IDF over an inverted index (token -> offer positions) built
+  once from the title and company of every harvested offer; title hits weigh more
+- educationLevel / contractTypes: bonus when the title names the wanted level or
+  contract, penalty when it names another level
+- searchLocation / searchRadius: distance between the offer and the nearest searched
+  city (known city coordinates), or same département as one of them from the postal code
+- offer type: company offers first, offers classified as training last
+"""
+
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from offer_record import Offer, TYPE_ENTREPRISE, TYPE_FORMATION
+
+TITLE_WEIGHT = 2.0
+COMPANY_WEIGHT = 1.0
+KEYWORD_WEIGHT = 10.0
+LEVEL_BONUS = 3.0
+LEVEL_PENALTY = 2.0
+CONTRACT_BONUS = 2.0
+LOCATION_WEIGHT = 4.0
+TYPE_SCORES = {TYPE_ENTREPRISE: 1.0, TYPE_FORMATION: -5.0}
+DEFAULT_RADIUS_KM = 30.0
+
+# Terms naming each education level in offer titles (accent-free, lowercase)
+EDUCATION_LEVELS = {
+    'cap': ('cap', 'bep'),
+    'bac': ('bac', 'bac pro', 'baccalaureat'),
+    'bts': ('bts', 'dut', 'but', 'bac+2'),
+    'licence': ('licence', 'bachelor', 'bac+3'),
+    'master': ('master', 'mba', 'ingenieur', 'bac+5'),
+}
+
+CONTRACT_TERMS = {
+    'alternance': ('alternance', 'alternant', 'alternante'),
+    'apprentissage': ('apprentissage', 'apprenti', 'apprentie'),
+    'professionnalisation': ('professionnalisation', 'contrat pro'),
+    'stage': ('stage', 'stagiaire'),
+    'cdi': ('cdi',),
+    'cdd': ('cdd',),
+}
+
+# Approximate coordinates (lat, lon) of the largest French cities
+CITY_COORDINATES = {
+    'paris': (48.857, 2.352), 'marseille': (43.296, 5.370), 'lyon': (45.764, 4.836),
+    'toulouse': (43.605, 1.444), 'nice': (43.710, 7.262), 'nantes': (47.218, -1.554),
+    'montpellier': (43.611, 3.877), 'strasbourg': (48.573, 7.752), 'bordeaux': (44.838, -0.579),
+    'lille': (50.629, 3.057), 'rennes': (48.117, -1.678), 'reims': (49.258, 4.032),
+    'toulon': (43.124, 5.928), 'saint-etienne': (45.440, 4.387), 'le havre': (49.494, 0.108),
+    'grenoble': (45.188, 5.724), 'dijon': (47.322, 5.041), 'angers': (47.478, -0.563),
+    'nimes': (43.837, 4.360), 'clermont-ferrand': (45.778, 3.087), 'aix-en-provence': (43.530, 5.447),
+    'le mans': (48.006, 0.199), 'brest': (48.390, -4.486), 'tours': (47.394, 0.685),
+    'amiens': (49.894, 2.296), 'limoges': (45.834, 1.262), 'annecy': (45.899, 6.129),
+    'perpignan': (42.699, 2.895), 'metz': (49.120, 6.176), 'besancon': (47.238, 6.024),
+    'orleans': (47.903, 1.909), 'rouen': (49.443, 1.100), 'caen': (49.183, -0.371),
+    'nancy': (48.692, 6.184), 'poitiers': (46.580, 0.340), 'pau': (43.295, -0.371),
+    'la rochelle': (46.160, -1.151), 'avignon': (43.949, 4.806), 'versailles': (48.805, 2.120),
+    'nanterre': (48.892, 2.207), 'boulogne-billancourt': (48.835, 2.241), 'saint-denis': (48.936, 2.357),
+}
+
+POSTAL_CODE = re.compile(r'\b(\d{2})\d{3}\b')
+TOKEN = re.compile(r'[a-z0-9+]+')
+
+
+def normalize(text: str) -> str:
+    """Lowercase, accent-free text"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall(normalize(text))
+
+
+def split_terms(value: Any) -> List[str]:
+    """Comma-separated config string (or list) -> normalized terms"""
+    if not value:
+        return []
+    items = value if isinstance(value, (list, tuple)) else str(value).split(',')
+    return [normalize(str(item)).strip() for item in items if str(item).strip()]
+
+
+def haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371 * math.asin(math.sqrt(h))
+
+
+def locate(text: str) -> Tuple[Optional[Tuple[float, float]], Optional[str]]:
+    """(coordinates of a known city, département from a postal code) found in a location string"""
+    normalized = normalize(text)
+    coordinates = None
+    for city, point in CITY_COORDINATES.items():
+        if re.search(r'\b%s\b' % re.escape(city), normalized):
+            coordinates = point
+            break
+    match = POSTAL_CODE.search(normalized)
+    return coordinates, match.group(1) if match else None
+
+
+def _contains_phrase(tokens: List[str], joined: str, term: str) -> bool:
+    return (' ' in term and term in joined) or term in tokens
+
+
+class InvertedIndex:
+    """token -> {offer position: weighted term frequency}, built once per harvest"""
+
+    def __init__(self, offers: List[Offer]):
+        self.size = len(offers)
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for position, offer in enumerate(offers):
+            for text, weight in ((offer.title, TITLE_WEIGHT), (offer.company, COMPANY_WEIGHT)):
+                for token in tokenize(text):
+                    postings = self.postings[token]
+                    postings[position] = postings.get(position, 0.0) + weight
+
+    def idf(self, token: str) -> float:
+        return math.log(1 + self.size / (1 + len(self.postings.get(token, ()))))
+
+    def scores(self, query_tokens: Iterable[str]) -> Dict[int, float]:
+        """Weighted TF-IDF score of every offer matching at least one query token"""
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(query_tokens):
+            idf = self.idf(token)
+            for position, frequency in self.postings.get(token, {}).items():
+                scores[position] += frequency * idf
+        return scores
+
+
+class OfferRanker:
+    """Scores offers against the search preferences of a user configuration"""
+
+    def __init__(self, user_config: Dict[str, Any]):
+        self.keywords = [token for term in split_terms(user_config.get('searchKeywords')) for token in tokenize(term)]
+        self.levels = [level for level in split_terms(user_config.get('educationLevel')) if level in EDUCATION_LEVELS]
+        self.contracts = [contract for contract in split_terms(user_config.get('contractTypes'))
+                          if contract in CONTRACT_TERMS]
+        # searchLocation lists every city of the search fan-out: each one is an origin
+        places = [locate(place) for place in split_terms(user_config.get('searchLocation') or user_config.get('location'))]
+        self.origins = [coordinates for coordinates, _ in places if coordinates]
+        self.origin_departments = {department for _, department in places if department}
+        radius = str(user_config.get('searchRadius') or '')
+        # 'france' (or no radius) means the whole country: distance does not matter
+        self.radius = float(radius) if radius.isdigit() else (None if radius == 'france' else DEFAULT_RADIUS_KM)
+
+    def location_score(self, location: str) -> float:
+        """1 at a searched city, decreasing to 0 at the search radius from the nearest one"""
+        if self.radius is None or not (self.origins or self.origin_departments):
+            return 0.0
+        coordinates, department = locate(location)
+        if self.origins and coordinates:
+            distance = min(haversine_km(origin, coordinates) for origin in self.origins)
+            return max(0.0, 1.0 - distance / max(self.radius, 1.0))
+        if self.origin_departments and department:
+            return 0.7 if department in self.origin_departments else 0.0
+        return 0.0
+
+    def title_score(self, title: str) -> float:
+        tokens = tokenize(title)
+        joined = ' '.join(tokens)
+        score = 0.0
+        named_levels = {level for level, terms in EDUCATION_LEVELS.items()
+                        if any(_contains_phrase(tokens, joined, term) for term in terms)}
+        if self.levels and named_levels:
+            score += LEVEL_BONUS if named_levels & set(self.levels) else -LEVEL_PENALTY
+        if any(_contains_phrase(tokens, joined, term) for contract in self.contracts for term in CONTRACT_TERMS[contract]):
+            score += CONTRACT_BONUS
+        return score
+
+    def score_all(self, offers: List[Offer]) -> List[float]:
+        keyword_scores = InvertedIndex(offers).scores(self.keywords) if self.keywords else {}
+        best = max(keyword_scores.values(), default=0.0) or 1.0
+        return [
+            KEYWORD_WEIGHT * keyword_scores.get(position, 0.0) / best
+            + self.title_score(offer.title)
+            + LOCATION_WEIGHT * self.location_score(offer.location)
+            + TYPE_SCORES.get(offer.offer_type, 0.0)
+            for position, offer in enumerate(offers)
+        ]
+
+    def rank(self, offers: List[Offer]) -> List[Offer]:
+        """Offers sorted by decreasing score; equal scores keep the harvest order"""
+        scores = self.score_all(offers)
+        order = sorted(range(len(offers)), key=lambda position: -scores[position])
+        return [offers[position] for position in order]
@@ -0,0 +1,299 @@
+"""
+Batched persistence of applications, logs and screenshot metadata
+
+The runner reports everything to the web interface as WEB_LOG/WEB_EVENT lines;
+when a database is configured (setting `databaseUrl` or $AUTOMATION_DATABASE_URL)
+the same records are also written to the `applications`, `automation_logs` and
+`screenshots` tables of shared/schema.ts.
+
+Records are only appended to an in-memory buffer by the automation thread. A
+background thread writes the buffer in one transaction when it holds
+`flush_size` records or every `flush_interval` seconds, so a burst of log lines
+costs one batched insert instead of one insert per line.
+
+Session totals (`automation_sessions`) are coalesced instead: only the latest
+totals of each session are kept and upserted at most every `session_interval`
+seconds, plus once when the session ends.
+
+Backends: SQLite (a file path or sqlite:///path, tables created on first use)
+and PostgreSQL (postgres://..., through a psycopg2 connection pool; the tables
+are managed by the web application's migrations). A backend is shared by every
+session of the worker process that uses the same URL, so sessions share one
+small pool instead of opening their own connections.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_SESSION_INTERVAL = 5.0
+# Records kept while the database is unreachable, per table; the oldest are dropped beyond that
+MAX_PENDING = 10000
+
+# Columns written for each table (snake_case names from shared/schema.ts)
+TABLE_COLUMNS = {
+    'applications': ('session_id', 'job_title', 'company', 'location', 'status', 'error_message',
+                     'applied_at', 'screenshot_path', 'log_path'),
+    'automation_logs': ('session_id', 'level', 'message', 'timestamp', 'metadata'),
+    'screenshots': ('session_id', 'application_id', 'file_path', 'description', 'captured_at'),
+}
+
+# Running totals of a session, upserted by id
+SESSION_COLUMNS = ('id', 'status', 'total_applications', 'successful_applications', 'failed_applications',
+                   'ended_at')
+
+SQLITE_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS automation_sessions ('
+    ' id INTEGER PRIMARY KEY, status TEXT NOT NULL, started_at TEXT DEFAULT CURRENT_TIMESTAMP,'
+    ' ended_at TEXT, total_applications INTEGER DEFAULT 0, successful_applications INTEGER DEFAULT 0,'
+    ' failed_applications INTEGER DEFAULT 0, user_config_id INTEGER, settings TEXT)',
+    'CREATE TABLE IF NOT EXISTS applications ('
+    ' id INTEGER PRIMARY KEY AUTOINCREMENT, session_id INTEGER, job_title TEXT NOT NULL,'
+    ' company TEXT NOT NULL, location TEXT NOT NULL, status TEXT NOT NULL, error_message TEXT,'
+    ' applied_at TEXT, screenshot_path TEXT, log_path TEXT)',
+    'CREATE TABLE IF NOT EXISTS automation_logs ('
+    ' id INTEGER PRIMARY KEY AUTOINCREMENT, session_id INTEGER, level TEXT NOT NULL,'
+    ' message TEXT NOT NULL, timestamp TEXT, metadata TEXT)',
+    'CREATE TABLE IF NOT EXISTS screenshots ('
+    ' id INTEGER PRIMARY KEY AUTOINCREMENT, session_id INTEGER, application_id INTEGER,'
+    ' file_path TEXT NOT NULL, description TEXT, captured_at TEXT)',
+)
+
+
+def insert_sql(table: str, placeholder: str) -> str:
+    columns = TABLE_COLUMNS[table]
+    return (f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join([placeholder] * len(columns))})")
+
+
+def upsert_session_sql(placeholder: str) -> str:
+    """INSERT ... ON CONFLICT DO UPDATE, understood by PostgreSQL and SQLite >= 3.24"""
+    updates = ', '.join(f'{column} = EXCLUDED.{column}' for column in SESSION_COLUMNS[1:-1])
+    return (f"INSERT INTO automation_sessions ({', '.join(SESSION_COLUMNS)}) "
+            f"VALUES ({', '.join([placeholder] * len(SESSION_COLUMNS))}) "
+            f"ON CONFLICT (id) DO UPDATE SET {updates}, "
+            f"ended_at = COALESCE(EXCLUDED.ended_at, automation_sessions.ended_at)")
+
+
+def _column_value(value: Any) -> Any:
+    """JSON columns are sent as text, everything else as is"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+class SQLiteBackend:
+    """Local SQLite database, also used as a stand-in for PostgreSQL in tests"""
+
+    placeholder = '?'
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._lock, self._conn:
+            if path != ':memory:':
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            for statement in SQLITE_SCHEMA:
+                self._conn.execute(statement)
+
+    def write(self, batches: Dict[str, List[tuple]], sessions: List[tuple] = ()):
+        """Upsert the session totals and insert every batch in a single transaction"""
+        with self._lock, self._conn:
+            if sessions:
+                self._conn.executemany(upsert_session_sql(self.placeholder), sessions)
+            for table, rows in batches.items():
+                self._conn.executemany(insert_sql(table, self.placeholder), rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class PostgresBackend:
+    """PostgreSQL through a small psycopg2 connection pool"""
+
+    placeholder = '%s'
+
+    def __init__(self, dsn: str, min_connections: int = 1, max_connections: int = 4):
+        # Optional dependency: only needed when a PostgreSQL URL is configured
+        import psycopg2.pool
+        import psycopg2.extras
+        self._execute_batch = psycopg2.extras.execute_batch
+        self.pool = psycopg2.pool.ThreadedConnectionPool(min_connections, max_connections, dsn)
+
+    def write(self, batches: Dict[str, List[tuple]], sessions: List[tuple] = ()):
+        """Upsert the session totals and insert every batch in a single transaction on a pooled connection"""
+        conn = self.pool.getconn()
+        try:
+            with conn, conn.cursor() as cursor:
+                # Sessions first: the other tables reference automation_sessions.id
+                if sessions:
+                    self._execute_batch(cursor, upsert_session_sql(self.placeholder), sessions)
+                for table, rows in batches.items():
+                    self._execute_batch(cursor, insert_sql(table, self.placeholder), rows)
+        finally:
+            self.pool.putconn(conn)
+
+    def close(self):
+        self.pool.closeall()
+
+
+def create_backend(url: str):
+    """SQLite for a path or sqlite:///path, PostgreSQL for postgres:// and postgresql:// URLs"""
+    if url.startswith(('postgres://', 'postgresql://')):
+        return PostgresBackend(url)
+    if url.startswith('sqlite:///'):
+        url = url[len('sqlite:///'):]
+    return SQLiteBackend(url)
+
+
+# Backends shared by the sessions of this process: url -> [backend, users]
+_shared_backends: Dict[str, list] = {}
+_shared_lock = threading.Lock()
+
+
+def acquire_backend(url: str):
+    """Backend for a URL, created on first use and shared by later callers"""
+    with _shared_lock:
+        entry = _shared_backends.get(url)
+        if entry is None:
+            entry = _shared_backends[url] = [create_backend(url), 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def release_backend(backend):
+    """Drop one user of a shared backend, closing it with the last one (unshared backends are closed)"""
+    with _shared_lock:
+        for url, entry in _shared_backends.items():
+            if entry[0] is backend:
+                entry[1] -= 1
+                if entry[1] > 0:
+                    return
+                del _shared_backends[url]
+                break
+    backend.close()
+
+
+class RecordStore:
+    """Buffers records per table and writes them in batched transactions from a background thread"""
+
+    def __init__(self, backend, flush_size: int = DEFAULT_FLUSH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, session_interval: float = DEFAULT_SESSION_INTERVAL):
+        self.backend = backend
+        self.flush_size = max(1, flush_size)
+        self.flush_interval = flush_interval
+        self.session_interval = session_interval
+        self._pending: Dict[str, List[tuple]] = {table: [] for table in TABLE_COLUMNS}
+        self._count = 0
+        self._sessions: Dict[int, tuple] = {}
+        self._last_session_write = 0.0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='record-store', daemon=True)
+        self._thread.start()
+
+    def add(self, table: str, record: Dict[str, Any]):
+        """Queue a record (dict keyed by column name); never touches the database"""
+        row = tuple(_column_value(record.get(column)) for column in TABLE_COLUMNS[table])
+        with self._lock:
+            rows = self._pending[table]
+            rows.append(row)
+            if len(rows) > MAX_PENDING:
+                del rows[0]
+            else:
+                self._count += 1
+            full = self._count >= self.flush_size
+        if full:
+            self._wake.set()
+
+    def add_log(self, record: Dict[str, Any]):
+        self.add('automation_logs', record)
+
+    def add_application(self, record: Dict[str, Any]):
+        self.add('applications', record)
+
+    def add_screenshot(self, record: Dict[str, Any]):
+        self.add('screenshots', record)
+
+    def update_session(self, session_id: int, stats: Dict[str, int], status: str = 'running',
+                       ended_at: Optional[str] = None):
+        """Record the latest totals of a session; only the last call before a write is upserted"""
+        row = dict(stats, id=session_id, status=status, ended_at=ended_at)
+        with self._lock:
+            self._sessions[session_id] = tuple(row.get(column, 0) if column.endswith('applications')
+                                               else row.get(column) for column in SESSION_COLUMNS)
+
+    def flush(self, force: bool = False) -> int:
+        """
+        Write everything buffered so far (session totals only if `session_interval`
+        has elapsed, or `force`), return the number of records written
+        """
+        with self._write_lock:
+            now = time.monotonic()
+            with self._lock:
+                batches = {table: rows for table, rows in self._pending.items() if rows}
+                self._pending = {table: [] for table in TABLE_COLUMNS}
+                self._count = 0
+                sessions = {}
+                if force or now - self._last_session_write >= self.session_interval:
+                    sessions, self._sessions = self._sessions, {}
+            if not batches and not sessions:
+                return 0
+            try:
+                self.backend.write(batches, list(sessions.values()))
+                if sessions:
+                    self._last_session_write = now
+            except Exception as e:
+                logger.warning("Écriture en base impossible, nouvel essai au prochain cycle: %s", e)
+                with self._lock:
+                    # Totals recorded meanwhile are newer than the ones that failed
+                    self._sessions = {**sessions, **self._sessions}
+                    for table, rows in batches.items():
+                        pending = self._pending[table]
+                        pending[:0] = rows
+                        if len(pending) > MAX_PENDING:
+                            del pending[:len(pending) - MAX_PENDING]
+                    self._count = sum(len(rows) for rows in self._pending.values())
+                return 0
+            return sum(len(rows) for rows in batches.values()) + len(sessions)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """Stop the background thread, write the remaining records and release the backend"""
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=self.flush_interval + 5)
+        self.flush(force=True)
+        release_backend(self.backend)
+
+
+def open_store(settings: Dict[str, Any]) -> Optional[RecordStore]:
+    """Record store for the configured database, or None when persistence is not configured"""
+    url = settings.get('databaseUrl') or os.environ.get('AUTOMATION_DATABASE_URL')
+    if not url:
+        return None
+    return RecordStore(
+        acquire_backend(url),
+        flush_size=settings.get('persistenceFlushSize', DEFAULT_FLUSH_SIZE),
+        flush_interval=settings.get('persistenceFlushInterval', DEFAULT_FLUSH_INTERVAL),
+        session_interval=settings.get('sessionStatsInterval', DEFAULT_SESSION_INTERVAL),
+    )
@@ -0,0 +1,150 @@
+"""
+Application rate limiter - adaptive token bucket shared by every runner on the machine
+
+Each target domain has one bucket: a token is earned every `interval` seconds, up
+to `burst` tokens, and a real submission spends one. Offers skipped before anything
+is sent (no contact, external redirect) give their token back, so only submissions
+are paced. The interval adapts to how the site answers:
+
+- error: interval doubled
+- slow confirmation: interval x1.5
+- healthy answer: interval x0.9
+
+It always stays between the configured minimum and maximum. A bucket left unused
+for IDLE_RESET seconds goes back to the base interval.
+
+The buckets live in a small SQLite table updated inside an immediate transaction,
+so concurrent runner workers hitting the same domain share both the tokens and the
+learned interval. A reservation may take the bucket below zero: concurrent callers
+queue up behind each other instead of all waking at once.
+
+Every submission of a runner goes through AutomationRunner.process_application and
+so through the limiter: the harvest runs run_scraper with postuler=False. Only the
+scraper's standalone command line still applies inline, outside the limiter.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_LIMITER_PATH = os.path.join('cache', 'rate_limits.sqlite')
+DEFAULT_INTERVAL = 30.0
+DEFAULT_BURST = 1
+SLOW_CONFIRMATION = 10.0
+IDLE_RESET = 3600.0
+
+ERROR_BACKOFF = 2.0
+SLOW_BACKOFF = 1.5
+HEALTHY_SPEEDUP = 0.9
+
+
+class BucketState(NamedTuple):
+    tokens: float
+    interval: float
+
+
+def rate_domain(url: str) -> str:
+    """Bucket key of an offer URL: its host, without a leading www."""
+    host = urlsplit(url or '').netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class RateLimiter:
+    """Adaptive token bucket per domain, persisted in SQLite"""
+
+    def __init__(self, path: str = DEFAULT_LIMITER_PATH, interval: float = DEFAULT_INTERVAL,
+                 burst: int = DEFAULT_BURST, min_interval: Optional[float] = None,
+                 max_interval: Optional[float] = None, slow_confirmation: float = SLOW_CONFIRMATION):
+        self.path = path
+        self.base_interval = float(interval)
+        self.burst = max(1, int(burst))
+        self.min_interval = float(min_interval if min_interval is not None else interval / 3)
+        self.max_interval = float(max_interval if max_interval is not None else max(interval, 1.0) * 10)
+        self.slow_confirmation = slow_confirmation
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10, isolation_level=None)
+        with self._lock:
+            if path != ':memory:':
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS rate_buckets ('
+                ' domain TEXT PRIMARY KEY,'
+                ' tokens REAL NOT NULL,'
+                ' interval REAL NOT NULL,'
+                ' updated_at REAL NOT NULL)'
+            )
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> 'RateLimiter':
+        return cls(
+            settings.get('rateLimitPath', DEFAULT_LIMITER_PATH),
+            interval=settings.get('delayBetweenApplications', DEFAULT_INTERVAL),
+            burst=settings.get('rateLimitBurst', DEFAULT_BURST),
+            min_interval=settings.get('minApplicationInterval'),
+            max_interval=settings.get('maxApplicationInterval'),
+            slow_confirmation=settings.get('slowConfirmationSeconds', SLOW_CONFIRMATION),
+        )
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def _update(self, domain: str, change) -> BucketState:
+        """Refill the bucket, apply change(state) -> state and store it, in one immediate transaction"""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                now = time.time()
+                row = self._conn.execute(
+                    'SELECT tokens, interval, updated_at FROM rate_buckets WHERE domain = ?', (domain,)
+                ).fetchone()
+                if row is None or now - row[2] > IDLE_RESET:
+                    state = BucketState(float(self.burst), self._clamp(self.base_interval))
+                else:
+                    interval = self._clamp(row[1])
+                    elapsed = max(0.0, now - row[2])
+                    state = BucketState(min(float(self.burst), row[0] + elapsed / max(interval, 1e-6)), interval)
+                state = change(state)
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO rate_buckets (domain, tokens, interval, updated_at) VALUES (?, ?, ?, ?)',
+                    (domain, state.tokens, state.interval, now)
+                )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return state
+
+    def reserve(self, domain: str) -> float:
+        """Take a token for a submission to domain, return how many seconds to wait before sending"""
+        state = self._update(domain, lambda s: s._replace(tokens=s.tokens - 1))
+        return max(0.0, -state.tokens * state.interval)
+
+    def acquire(self, domain: str) -> float:
+        """Reserve a token and sleep until it is due, return the time waited"""
+        wait = self.reserve(domain)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def refund(self, domain: str):
+        """Give back the token of an offer that was not submitted after all"""
+        self._update(domain, lambda s: s._replace(tokens=min(float(self.burst), s.tokens + 1)))
+
+    def record(self, domain: str, ok: bool, latency: float) -> float:
+        """Adapt the interval to a submission outcome, return the new interval"""
+        if not ok:
+            factor = ERROR_BACKOFF
+        elif latency > self.slow_confirmation:
+            factor = SLOW_BACKOFF
+        else:
+            factor = HEALTHY_SPEEDUP
+        return self._update(domain, lambda s: s._replace(interval=self._clamp(s.interval * factor))).interval
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,89 @@
+"""
+Retry queue - transient application failures are attempted again later instead of dropped
+
+An offer whose outcome is retryable (apply button, form or send button not found,
+CV upload failed, page timeout or stale element before the send click: anything that
+stopped before the form was sent) is scheduled again after a jittered exponential
+backoff:
+base_delay * 2^(attempt - 1), capped at max_delay, multiplied by a random factor
+in [1 - JITTER, 1 + JITTER] so that workers failing together do not retry together.
+After max_attempts failed attempts the offer is given up. Outcomes where the form may
+already have been sent (submission timeout, server error, page error after the
+click) are never retried, to avoid applying twice; they are flagged for review.
+
+The runner interleaves due retries with fresh offers rather than waiting for them,
+and only sleeps for the remaining retries once the fresh offers are exhausted. The
+queue state is a plain dict owned by the session checkpoint, so it is persisted with
+it and survives an interrupted session.
+"""
+
+import time
+import random
+from typing import Any, Dict, Optional
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 60.0
+DEFAULT_MAX_DELAY = 900.0
+JITTER = 0.5
+
+
+class RetryQueue:
+    """Retry schedule of the offers of a session: offer key -> attempts, due time, last outcome"""
+
+    def __init__(self, state: Optional[Dict[str, Dict[str, Any]]] = None, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 base_delay: float = DEFAULT_BASE_DELAY, max_delay: float = DEFAULT_MAX_DELAY):
+        self.state = state if state is not None else {}
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_settings(cls, state: Dict[str, Dict[str, Any]], settings: Dict[str, Any]) -> 'RetryQueue':
+        return cls(
+            state,
+            max_attempts=settings.get('maxApplicationAttempts', DEFAULT_MAX_ATTEMPTS),
+            base_delay=settings.get('retryBaseDelay', DEFAULT_BASE_DELAY),
+            max_delay=settings.get('retryMaxDelay', DEFAULT_MAX_DELAY),
+        )
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self.state.values() if entry.get('due_at') is not None)
+
+    def attempts(self, key: str) -> int:
+        """Failed attempts recorded for an offer"""
+        return self.state.get(key, {}).get('attempts', 0)
+
+    def is_scheduled(self, key: str) -> bool:
+        return self.state.get(key, {}).get('due_at') is not None
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * random.uniform(1 - JITTER, 1 + JITTER)
+
+    def schedule(self, key: str, outcome: str, now: Optional[float] = None) -> Optional[float]:
+        """Record a failed attempt; return the delay before the next one, or None once attempts are exhausted"""
+        attempts = self.attempts(key) + 1
+        if attempts >= self.max_attempts:
+            self.state.pop(key, None)
+            return None
+        delay = self.backoff(attempts)
+        self.state[key] = {'attempts': attempts, 'due_at': (now or time.time()) + delay, 'outcome': outcome}
+        return delay
+
+    def pop_due(self, now: Optional[float] = None) -> Optional[str]:
+        """Key of the most overdue offer, taken off the schedule (its attempt count is kept), or None"""
+        now = now or time.time()
+        due = [(entry['due_at'], key) for key, entry in self.state.items()
+               if entry.get('due_at') is not None and entry['due_at'] <= now]
+        if not due:
+            return None
+        key = min(due)[1]
+        self.state[key]['due_at'] = None
+        return key
+
+    def next_due(self) -> Optional[float]:
+        return min((entry['due_at'] for entry in self.state.values() if entry.get('due_at') is not None), default=None)
+
+    def discard(self, key: str):
+        """Forget an offer once it has a final outcome"""
+        self.state.pop(key, None)
@@ -0,0 +1,159 @@
+"""
+Search fan-out - one search per keyword x location pair, merged into a single harvest
+
+searchKeywords and searchLocation are comma-separated lists ("développeur web, react" /
+"Paris, Lyon"), but the scraper runs a single search_query/location. The planner
+expands the cross-product into search jobs, the fan-out runs them concurrently (each
+run_scraper call drives its own browser from a ChromeProfile slot) and merges the
+offers through a dedup index keyed by offer id: the normalized offer URL, or the
+title/company hash when an offer has no link.
+
+Every job reports its yield (offers extracted, offers new to the harvest). Yields are
+kept per query in cache/search_yield.json; with minSearchYield set, a query whose last
+runs all brought fewer new offers is pruned from the plan.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from offer_cache import normalize_url, content_hash
+
+DEFAULT_CONCURRENCY = 2
+MAX_SEARCH_JOBS = 12
+DEFAULT_HISTORY_PATH = os.path.join('cache', 'search_yield.json')
+HISTORY_RUNS = 3
+
+logger = logging.getLogger(__name__)
+
+
+class SearchJob(NamedTuple):
+    query: str
+    location: str
+
+    @property
+    def key(self) -> str:
+        return f'{self.query}|{self.location}'
+
+
+class SearchYield(NamedTuple):
+    job: SearchJob
+    found: int
+    new: int
+    duration: float
+    complete: bool
+
+
+def _split(value: Any) -> List[str]:
+    """Comma-separated config string (or list) -> distinct terms, original spelling, in order"""
+    items = value if isinstance(value, (list, tuple)) else str(value or '').split(',')
+    terms: List[str] = []
+    for item in items:
+        term = str(item).strip()
+        if term and term.lower() not in (t.lower() for t in terms):
+            terms.append(term)
+    return terms
+
+
+def plan_searches(user_config: Dict[str, Any], max_jobs: int = MAX_SEARCH_JOBS) -> List[SearchJob]:
+    """Keyword x location cross-product (frontend lists, else the scraper's single search), capped at max_jobs"""
+    queries = _split(user_config.get('searchKeywords')) or _split(user_config.get('search_query'))
+    locations = _split(user_config.get('searchLocation')) or _split(user_config.get('location'))
+    jobs = [SearchJob(query, location) for query in queries for location in (locations or [''])]
+    return jobs[:max(1, int(max_jobs))]
+
+
+def offer_id(offer) -> str:
+    """Dedup key of an offer: normalized URL, else title/company hash"""
+    return normalize_url(offer.link) if offer.link else content_hash(offer.title, offer.company)
+
+
+class SearchYieldHistory:
+    """New-offer counts of the last HISTORY_RUNS runs of every search job"""
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.runs: Dict[str, List[int]] = json.load(f)
+        except (OSError, ValueError):
+            self.runs = {}
+
+    def prune(self, jobs: List[SearchJob], min_yield: int) -> List[SearchJob]:
+        """Drop the jobs whose last runs all yielded fewer than min_yield new offers (at least one job is kept)"""
+        if min_yield <= 0:
+            return jobs
+        kept = [job for job in jobs
+                if len(self.runs.get(job.key, [])) < HISTORY_RUNS or max(self.runs[job.key]) >= min_yield]
+        return kept or jobs[:1]
+
+    def record(self, yields: Iterable[SearchYield]):
+        for result in yields:
+            if result.complete:
+                self.runs[result.job.key] = (self.runs.get(result.job.key, []) + [result.new])[-HISTORY_RUNS:]
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.runs, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class SearchFanout:
+    """Runs search jobs concurrently and merges their offers, each offer kept once"""
+
+    def __init__(self, user_config: Dict[str, Any], jobs: List[SearchJob],
+                 concurrency: int = DEFAULT_CONCURRENCY, seen: Iterable[str] = ()):
+        self.user_config = user_config
+        self.jobs = jobs
+        self.concurrency = max(1, int(concurrency))
+        self.seen = set(seen)
+        self._lock = threading.Lock()
+
+    def _run_job(self, scrape: Callable, job: SearchJob, on_offer: Callable, start_index: int) -> SearchYield:
+        counts = {'found': 0, 'new': 0}
+
+        def merge(offer, index):
+            key = offer_id(offer)
+            with self._lock:
+                counts['found'] += 1
+                if key in self.seen:
+                    return
+                self.seen.add(key)
+                counts['new'] += 1
+                on_offer(offer, index, job)
+
+        user_data = dict(self.user_config, search_query=job.query, location=job.location)
+        start = time.monotonic()
+        # Harvest only: applications are made by the runner, under its budget and rate limiter
+        result = scrape(user_data, on_offer=merge, start_index=start_index, postuler=False)
+        return SearchYield(job, counts['found'], counts['new'], time.monotonic() - start, result is not None)
+
+    def run(self, scrape: Callable, on_offer: Callable, start_index: int = 0,
+            on_yield: Optional[Callable[[SearchYield], None]] = None) -> List[SearchYield]:
+        """
+        Run every job with scrape(user_data, on_offer=..., start_index=..., postuler=False)
+        (run_scraper's signature).
+        on_offer(offer, card_index, job) receives only offers new to the harvest; start_index
+        applies to a single job (resume cursor), a fan-out restarts its unfinished jobs from the top.
+        """
+        if not self.jobs:
+            return []
+        start_index = start_index if len(self.jobs) == 1 else 0
+        workers = min(self.concurrency, len(self.jobs))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='search') as executor:
+            futures = [executor.submit(self._run_job, scrape, job, on_offer, start_index) for job in self.jobs]
+            yields = []
+            for job, future in zip(self.jobs, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error("Recherche '%s' à '%s' interrompue: %s", job.query, job.location, e, exc_info=True)
+                    result = SearchYield(job, 0, 0, 0.0, False)
+                yields.append(result)
+                if on_yield:
+                    on_yield(result)
+        return yields
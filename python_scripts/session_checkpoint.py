@@ -0,0 +1,148 @@
+"""
+Session checkpoints - lets an interrupted automation session resume where it stopped
+
+The checkpoint holds the harvested offers, the harvest cursor (index of the next
+result card to extract, single search) or the searches already completed (fan-out
+over several keyword x location searches), the status of every offer, the retry schedule of
+transiently failed offers (see retry_queue.py) and the running statistics.
+It is written atomically to checkpoints/session_<id>.json, at most once every
+`interval` seconds unless a save is forced. The checkpoint keeps the session config
+(contact details, document paths) so a resume can run without it: the directory and
+the files are only readable by their owner.
+"""
+
+import os
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from offer_record import Offer
+
+DEFAULT_CHECKPOINT_DIR = 'checkpoints'
+
+# Offer statuses after which an offer is never picked up again on resume
+# ('retrying' offers failed transiently and wait in the retry queue)
+FINAL_STATUSES = ('completed', 'failed', 'ignoré')
+
+
+def checkpoint_status(outcome) -> str:
+    """Final checkpoint status of an offer after an application outcome (retries exhausted)"""
+    if outcome.skipped:
+        return 'ignoré'
+    return 'failed' if outcome.application_status == 'failed' else 'completed'
+
+
+class SessionCheckpoint:
+    def __init__(self, session_id: int, directory: str = DEFAULT_CHECKPOINT_DIR, interval: float = 5.0):
+        self.session_id = session_id
+        self.directory = directory
+        self.interval = interval
+        self.offers: List[Offer] = []
+        self.harvest_cursor = 0
+        self.harvest_complete = False
+        self.completed_searches: List[str] = []
+        self.statuses: Dict[str, str] = {}
+        self.retries: Dict[str, Dict[str, Any]] = {}
+        self.stats: Dict[str, int] = {}
+        self.config: Dict[str, Any] = {}
+        self._last_save = 0.0
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f'session_{self.session_id}.json')
+
+    @staticmethod
+    def offer_key(offer: Offer) -> str:
+        return offer.link or offer.title
+
+    # --- Harvest ---
+
+    def record_offer(self, offer: Offer, card_index: int):
+        """Called by run_scraper for every extracted offer"""
+        self.harvest_cursor = card_index + 1
+        self.add_offer(offer)
+
+    def add_offer(self, offer: Offer):
+        """Offer merged from one of several searches (no single card cursor)"""
+        self.offers.append(offer)
+        self.statuses.setdefault(self.offer_key(offer), 'pending')
+        self.save()
+
+    def mark_search_complete(self, search_key: str):
+        if search_key not in self.completed_searches:
+            self.completed_searches.append(search_key)
+        self.save(force=True)
+
+    def mark_harvest_complete(self):
+        self.harvest_complete = True
+        self.save(force=True)
+
+    # --- Applications ---
+
+    def set_status(self, offer: Offer, status: str, stats: Optional[Dict[str, int]] = None):
+        """
+        Record the status of a processed offer. Written immediately, not throttled: a lost
+        'completed' status would make --resume apply to the offer a second time, and a
+        KeyboardInterrupt or SIGTERM skips the runner's final save.
+        """
+        self.statuses[self.offer_key(offer)] = status
+        if stats is not None:
+            self.stats = dict(stats)
+        self.save(force=True)
+
+    def pending(self) -> List[Offer]:
+        """Offers that still need to be processed, in harvest order"""
+        return [offer for offer in self.offers
+                if self.statuses.get(self.offer_key(offer), 'pending') not in FINAL_STATUSES]
+
+    # --- Persistence ---
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'session_id': self.session_id,
+            'saved_at': time.time(),
+            'harvest_cursor': self.harvest_cursor,
+            'harvest_complete': self.harvest_complete,
+            'completed_searches': self.completed_searches,
+            'offers': [offer.to_dict() for offer in self.offers],
+            'statuses': self.statuses,
+            'retries': self.retries,
+            'stats': self.stats,
+            'config': self.config,
+        }
+
+    def save(self, force: bool = False):
+        """Write the checkpoint atomically (throttled to one write per interval)"""
+        now = time.time()
+        if not force and now - self._last_save < self.interval:
+            return
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._last_save = now
+
+    @classmethod
+    def load(cls, session_id: int, directory: str = DEFAULT_CHECKPOINT_DIR) -> Optional['SessionCheckpoint']:
+        """Load the checkpoint of a session, or None if there is none"""
+        checkpoint = cls(session_id, directory)
+        if not os.path.exists(checkpoint.path):
+            return None
+        with open(checkpoint.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        checkpoint.harvest_cursor = data.get('harvest_cursor', 0)
+        checkpoint.harvest_complete = data.get('harvest_complete', False)
+        checkpoint.completed_searches = data.get('completed_searches', [])
+        checkpoint.offers = [Offer.from_dict(offer) for offer in data.get('offers', [])]
+        checkpoint.statuses = data.get('statuses', {})
+        checkpoint.retries = data.get('retries', {})
+        checkpoint.stats = data.get('stats', {})
+        checkpoint.config = data.get('config', {})
+        return checkpoint
+
+    def discard(self):
+        """Remove the checkpoint once the session has finished normally"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,182 @@
+"""
+Session log files - size/time rotation, gzip segments, retention budget and a seek index
+
+The active segment of a session is logs/automation_<id>.log. It is rolled over
+when it exceeds `max_bytes` or is older than `max_age` seconds (a session resumed
+the next day starts a new segment). Rolled segments are gzipped to
+logs/automation_<id>.<seq>.log.gz with a monotonically increasing sequence
+number, so their names never change once written.
+
+Every rolled segment is recorded in logs/automation_<id>.index.json with its
+first/last record timestamps and sizes: the session viewer can pick the
+segments covering a time range without opening or decompressing the others.
+After each rollover the oldest segments of all sessions are deleted until the
+compressed total fits the retention budget.
+
+Rollover runs in the logging listener thread (see log_pipeline), never on the
+automation thread.
+"""
+
+import os
+import re
+import glob
+import gzip
+import json
+import time
+import shutil
+import logging
+import logging.handlers
+from typing import Any, Dict, List, Optional
+
+DEFAULT_LOG_DIR = 'logs'
+MAX_SEGMENT_BYTES = 5 * 1024 * 1024     # active segment size before rollover
+MAX_SEGMENT_AGE = 24 * 3600             # active segment age before rollover
+RETENTION_BYTES = 200 * 1024 * 1024     # compressed segments kept across all sessions
+RETENTION_AGE = 30 * 24 * 3600          # compressed segments older than this are deleted
+
+SEGMENT_PATTERN = re.compile(r'automation_(?P<session>\d+)\.(?P<seq>\d+)\.log\.gz$')
+
+
+def active_log_path(session_id: int, directory: str = DEFAULT_LOG_DIR) -> str:
+    return os.path.join(directory, f'automation_{session_id}.log')
+
+
+def index_path(session_id: int, directory: str = DEFAULT_LOG_DIR) -> str:
+    return os.path.join(directory, f'automation_{session_id}.index.json')
+
+
+def load_index(session_id: int, directory: str = DEFAULT_LOG_DIR) -> List[Dict[str, Any]]:
+    """Segments of a session, oldest first (entries whose file was deleted by retention are dropped)"""
+    try:
+        with open(index_path(session_id, directory), 'r', encoding='utf-8') as f:
+            segments = json.load(f).get('segments', [])
+    except (OSError, ValueError):
+        return []
+    return [s for s in segments if os.path.exists(os.path.join(directory, s['file']))]
+
+
+def segments_for(session_id: int, start: Optional[float] = None, end: Optional[float] = None,
+                 directory: str = DEFAULT_LOG_DIR) -> List[str]:
+    """
+    Paths of the log segments of a session overlapping [start, end] (epoch seconds),
+    oldest first, the active segment last if it exists
+    """
+    paths = [os.path.join(directory, s['file']) for s in load_index(session_id, directory)
+             if (start is None or s['last_record'] >= start) and (end is None or s['first_record'] <= end)]
+    active = active_log_path(session_id, directory)
+    if os.path.exists(active) and (end is None or os.path.getmtime(active) >= (start or 0)):
+        paths.append(active)
+    return paths
+
+
+def open_segment(path: str):
+    """Open a segment for reading, compressed or not"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+class SessionLogHandler(logging.handlers.BaseRotatingHandler):
+    """File handler for one session's log, rotated by size and age into indexed gzip segments"""
+
+    def __init__(self, session_id: int, directory: str = DEFAULT_LOG_DIR, max_bytes: int = MAX_SEGMENT_BYTES,
+                 max_age: float = MAX_SEGMENT_AGE, retention_bytes: int = RETENTION_BYTES,
+                 retention_age: float = RETENTION_AGE):
+        os.makedirs(directory, exist_ok=True)
+        self.session_id = session_id
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.retention_bytes = retention_bytes
+        self.retention_age = retention_age
+        super().__init__(active_log_path(session_id, directory), 'a', encoding='utf-8', delay=False)
+        self._segment_start = self._first_record_time()
+        self._last_record = None
+
+    def _first_record_time(self) -> float:
+        """Creation time of the active segment (mtime of a resumed file is a lower bound on its age)"""
+        try:
+            stat = os.stat(self.baseFilename)
+        except OSError:
+            return time.time()
+        if stat.st_size == 0:
+            return time.time()
+        return min(getattr(stat, 'st_birthtime', stat.st_mtime), stat.st_mtime)
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        if self.max_bytes and self.stream.tell() >= self.max_bytes:
+            return True
+        return bool(self.max_age) and self.stream.tell() > 0 and record.created - self._segment_start >= self.max_age
+
+    def emit(self, record: logging.LogRecord):
+        super().emit(record)
+        self._last_record = record.created
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self._compress_active()
+        self._apply_retention()
+        self.stream = self._open()
+        self._segment_start = time.time()
+
+    # --- Segments ---
+
+    def _next_sequence(self, segments: List[Dict[str, Any]]) -> int:
+        pattern = os.path.join(self.directory, f'automation_{self.session_id}.*.log.gz')
+        sequences = [int(m.group('seq')) for m in map(SEGMENT_PATTERN.search, glob.glob(pattern)) if m]
+        sequences += [s['seq'] for s in segments]
+        return max(sequences, default=0) + 1
+
+    def _compress_active(self):
+        if not os.path.exists(self.baseFilename) or os.path.getsize(self.baseFilename) == 0:
+            return
+        segments = load_index(self.session_id, self.directory)
+        seq = self._next_sequence(segments)
+        name = f'automation_{self.session_id}.{seq:04d}.log.gz'
+        target = os.path.join(self.directory, name)
+        raw_bytes = os.path.getsize(self.baseFilename)
+        last_record = self._last_record or os.path.getmtime(self.baseFilename)
+        with open(self.baseFilename, 'rb') as src, gzip.open(f'{target}.tmp', 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(f'{target}.tmp', target)
+        os.remove(self.baseFilename)
+        segments.append({
+            'file': name,
+            'seq': seq,
+            'first_record': self._segment_start,
+            'last_record': last_record,
+            'bytes': raw_bytes,
+            'compressed_bytes': os.path.getsize(target),
+        })
+        self._write_index(segments)
+
+    def _write_index(self, segments: List[Dict[str, Any]]):
+        path = index_path(self.session_id, self.directory)
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'session_id': self.session_id, 'segments': segments}, f)
+        os.replace(f'{path}.tmp', path)
+
+    def _apply_retention(self):
+        """Delete the oldest compressed segments (all sessions) beyond the age and size budgets"""
+        files = []
+        for path in glob.glob(os.path.join(self.directory, 'automation_*.log.gz')):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        now = time.time()
+        for mtime, size, path in files:
+            if total <= self.retention_bytes and now - mtime <= self.retention_age:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,152 @@
+"""
+Supervised WebDriver - detects dead browser sessions and relaunches them
+
+A crashed chromedriver (or a WebDriverException in the middle of an application)
+used to leave the runner with a broken driver for the rest of the session. The
+supervisor probes the session with a cheap `window_handles` heartbeat, relaunches
+the browser through the same factory, restores the cookie jar and the last
+main-window page and retries the in-flight call within a bounded budget, unless
+the call may already have had an effect that must not be repeated (see `call`).
+Snapshots are taken between applications, which run in the main document, so
+no iframe context has to be restored.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+
+class DriverCrashError(WebDriverException):
+    """Raised when the browser died and the in-flight call cannot be retried"""
+
+    def __init__(self, msg: str, result: Any = None):
+        super().__init__(msg)
+        # What the call returned before the session was found dead (None if it raised)
+        self.result = result
+
+
+class SupervisedDriver:
+    def __init__(self, factory: Callable[[], Any], max_restarts: int = 3, max_retries: int = 1,
+                 on_restart: Optional[Callable[[Any], None]] = None):
+        self._factory = factory
+        self.max_restarts = max_restarts
+        self.max_retries = max_retries
+        self.on_restart = on_restart
+        self.driver = None
+        self.restarts = 0
+        self._cookies: List[Dict[str, Any]] = []
+        self._last_url: Optional[str] = None
+
+    def start(self):
+        self.driver = self._factory()
+        if self.driver is None:
+            raise DriverCrashError("Impossible de créer le navigateur")
+        return self.driver
+
+    def is_alive(self) -> bool:
+        """Heartbeat: any command round-trip fails once the browser or chromedriver is gone"""
+        if self.driver is None:
+            return False
+        try:
+            return bool(self.driver.window_handles)
+        except Exception:
+            return False
+
+    def snapshot(self):
+        """Remember cookies and the current main-window URL so a relaunched browser can be re-hydrated"""
+        if not self.is_alive():
+            return
+        try:
+            self._cookies = self.driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+        except Exception:
+            try:
+                self._cookies = self.driver.get_cookies()
+            except WebDriverException as e:
+                logger.debug("Lecture des cookies impossible: %s", e)
+        try:
+            self._last_url = self.driver.current_url
+        except WebDriverException as e:
+            logger.debug("Lecture de l'URL courante impossible: %s", e)
+
+    def _restore(self):
+        driver = self.driver
+        if self._cookies:
+            try:
+                driver.execute_cdp_cmd('Network.setCookies', {'cookies': self._cookies})
+            except Exception:
+                # Without CDP, cookies can only be added for the domain currently loaded
+                if self._last_url:
+                    driver.get(self._last_url)
+                for cookie in self._cookies:
+                    try:
+                        driver.add_cookie({k: v for k, v in cookie.items() if k != 'sameSite'})
+                    except WebDriverException:
+                        continue
+        if self._last_url and self._last_url.startswith('http'):
+            driver.get(self._last_url)
+
+    def restart(self):
+        """Relaunch the browser and re-hydrate it from the last snapshot"""
+        if self.restarts >= self.max_restarts:
+            raise DriverCrashError(f"Navigateur relancé {self.restarts} fois, abandon")
+        self.restarts += 1
+        logger.warning("Session navigateur perdue, relance (%s/%s)...", self.restarts, self.max_restarts)
+        try:
+            if self.driver is not None:
+                self.driver.quit()
+        except Exception:
+            pass
+        self.start()
+        try:
+            self._restore()
+        except WebDriverException as e:
+            logger.warning("Restauration de la session incomplète: %s", e)
+        if self.on_restart:
+            self.on_restart(self.driver)
+        return self.driver
+
+    def call(self, fn: Callable[[bool], Any], retry_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Run `fn(is_retry)`; if the browser died during the call, relaunch it and retry.
+
+        Application helpers swallow most exceptions, so a dead session is detected with
+        the heartbeat after the call as well as from a raised WebDriverException.
+
+        With `retry_if`, the call is only retried when `retry_if(result)` holds for what it
+        returned (an application that may have been sent must not be sent again); a call
+        that raised is then never retried. Otherwise the browser is relaunched for the
+        next calls and DriverCrashError carries the result.
+        """
+        attempt = 0
+        while True:
+            result = None
+            try:
+                result = fn(attempt > 0)
+                if self.is_alive():
+                    return result
+                error: Optional[BaseException] = None
+                retryable = retry_if is None or retry_if(result)
+            except WebDriverException as e:
+                if self.is_alive():
+                    raise
+                error = e
+                retryable = retry_if is None
+            if not retryable or attempt >= self.max_retries:
+                # Keep the session usable for the next offers before giving up on this one
+                self.restart()
+                if error:
+                    raise DriverCrashError(str(error), result) from error
+                raise DriverCrashError("Le navigateur ne répond plus", result)
+            attempt += 1
+            self.restart()
+
+    def quit(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None